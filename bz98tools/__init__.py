@@ -35,6 +35,7 @@ import mathutils
 import struct
 import textwrap
 
+from . import geo_bounds as bz_geo_bounds
 from . import validation as bz_validation
 
 if bpy is not None:
@@ -219,6 +220,8 @@ EXPORT_PRESET_PROPERTY_NAMES = {
         "ogre_nowrite",
         "ogre_skip_unchanged",
         "ogre_profile_export",
+        "ogre_dds_format",
+        "ogre_dds_mipmaps",
         "ogre_dest_dir",
     ),
     "VDF": (
@@ -236,6 +239,9 @@ EXPORT_PRESET_PROPERTY_NAMES = {
         "ogre_nowrite",
         "ogre_skip_unchanged",
         "ogre_profile_export",
+        "ogre_dds_format",
+        "ogre_dds_mipmaps",
+        "ogre_texture_atlas",
         "ogre_dest_dir",
         "ogre_headlights",
         "ogre_person_mode",
@@ -267,6 +273,9 @@ EXPORT_PRESET_PROPERTY_NAMES = {
         "ogre_nowrite",
         "ogre_skip_unchanged",
         "ogre_profile_export",
+        "ogre_dds_format",
+        "ogre_dds_mipmaps",
+        "ogre_texture_atlas",
         "ogre_dest_dir",
     ),
 }
@@ -289,6 +298,8 @@ BUILTIN_EXPORT_PRESETS = {
                 "ogre_nowrite": False,
                 "ogre_skip_unchanged": True,
                 "ogre_profile_export": False,
+                "ogre_dds_format": "RGBA",
+                "ogre_dds_mipmaps": False,
                 "ogre_dest_dir": "",
             },
         ),
@@ -308,6 +319,8 @@ BUILTIN_EXPORT_PRESETS = {
                 "ogre_nowrite": False,
                 "ogre_skip_unchanged": True,
                 "ogre_profile_export": False,
+                "ogre_dds_format": "RGBA",
+                "ogre_dds_mipmaps": False,
                 "ogre_dest_dir": "",
             },
         ),
@@ -331,6 +344,9 @@ BUILTIN_EXPORT_PRESETS = {
                 "ogre_nowrite": False,
                 "ogre_skip_unchanged": True,
                 "ogre_profile_export": False,
+                "ogre_dds_format": "RGBA",
+                "ogre_dds_mipmaps": False,
+                "ogre_texture_atlas": False,
                 "ogre_dest_dir": "",
                 "ogre_headlights": False,
                 "ogre_person_mode": "AUTO",
@@ -379,6 +395,9 @@ BUILTIN_EXPORT_PRESETS = {
                 "ogre_nowrite": False,
                 "ogre_skip_unchanged": True,
                 "ogre_profile_export": False,
+                "ogre_dds_format": "RGBA",
+                "ogre_dds_mipmaps": False,
+                "ogre_texture_atlas": False,
                 "ogre_dest_dir": "",
                 "ogre_headlights": False,
                 "ogre_person_mode": "AUTO",
@@ -429,6 +448,9 @@ BUILTIN_EXPORT_PRESETS = {
                 "ogre_nowrite": False,
                 "ogre_skip_unchanged": True,
                 "ogre_profile_export": False,
+                "ogre_dds_format": "RGBA",
+                "ogre_dds_mipmaps": False,
+                "ogre_texture_atlas": False,
                 "ogre_dest_dir": "",
             },
         ),
@@ -450,6 +472,9 @@ BUILTIN_EXPORT_PRESETS = {
                 "ogre_nowrite": False,
                 "ogre_skip_unchanged": True,
                 "ogre_profile_export": False,
+                "ogre_dds_format": "RGBA",
+                "ogre_dds_mipmaps": False,
+                "ogre_texture_atlas": False,
                 "ogre_dest_dir": "",
             },
         ),
@@ -1850,6 +1875,10 @@ def _draw_shared_autoport_options(layout, operator):
     layout.prop(operator, "ogre_name")
     layout.prop(operator, "ogre_suffix")
     layout.prop(operator, "ogre_flat_colors")
+    layout.prop(operator, "ogre_dds_format")
+    layout.prop(operator, "ogre_dds_mipmaps")
+    if hasattr(operator, "ogre_texture_atlas"):
+        layout.prop(operator, "ogre_texture_atlas")
     layout.prop(operator, "ogre_normal_mode")
     layout.prop(operator, "ogre_bounds_mult")
     layout.prop(operator, "ogre_act_path")
@@ -1905,10 +1934,10 @@ def _derive_legacy_texture_name(name):
     return derived[:8]
 
 
-def _get_material_image_name(material):
+def _get_material_image(material):
     node_tree = getattr(material, "node_tree", None)
     if node_tree is None:
-        return ""
+        return None
 
     image_nodes = [
         node
@@ -1917,15 +1946,20 @@ def _get_material_image_name(material):
         and getattr(node, "image", None) is not None
     ]
     if not image_nodes:
-        return ""
+        return None
 
     active_node = next(
         (node for node in image_nodes if getattr(node, "select", False)), None
     )
     if active_node is None:
         active_node = image_nodes[0]
+    return active_node.image
+
 
-    image = active_node.image
+def _get_material_image_name(material):
+    image = _get_material_image(material)
+    if image is None:
+        return ""
     return _derive_legacy_texture_name(
         getattr(image, "name", "") or getattr(image, "filepath", "")
     )
@@ -3559,6 +3593,91 @@ class BZ98TOOLS_OT_fill_material_texture_from_image(bpy.types.Operator):
         return {"FINISHED"}
 
 
+class BZ98TOOLS_OT_export_material_map(bpy.types.Operator, ExportHelper):
+    bl_idname = "bz.export_material_map"
+    bl_label = "Save Image as .map"
+    bl_description = (
+        "Encode the material's linked image texture as a legacy Battlezone .map"
+    )
+    filename_ext = ".map"
+    filter_glob: Any = StringProperty(
+        default="*.map",
+        options={"HIDDEN"},
+    )
+
+    pixel_format: Any = EnumProperty(
+        name="Pixel Format",
+        items=[
+            ("XRGB8888", "XRGB8888", "32-bit color, no alpha"),
+            ("ARGB8888", "ARGB8888", "32-bit color with alpha"),
+            ("RGB565", "RGB565", "16-bit color, no alpha"),
+            ("ARGB4444", "ARGB4444", "16-bit color with 4-bit alpha"),
+            ("INDEXED", "Indexed", "8-bit, nearest colors of an ACT palette"),
+        ],
+        default="XRGB8888",
+    )
+
+    act_path: Any = StringProperty(
+        name="ACT Palette",
+        description="Palette for Indexed output. Leave blank to use the ACT next to the .map, or the built-in moon palette.",
+        default="",
+    )
+
+    def invoke(self, context, event):
+        material = context.material
+        if material is not None and not self.filepath:
+            resolved_name = _get_material_texture_preview(material)[3]
+            if resolved_name:
+                blend_dir = os.path.dirname(bpy.data.filepath)
+                self.filepath = os.path.join(blend_dir, resolved_name + ".map")
+        return ExportHelper.invoke(self, context, event)
+
+    def execute(self, context):
+        import numpy as np
+        from . import bzact_palettes, bzmap_codec
+        from .bzmap import BZMapFormat
+        from .bzmap_serializer import BZMapSerializer
+
+        material = context.material
+        image = _get_material_image(material) if material is not None else None
+        if image is None:
+            self.report(
+                {"ERROR"}, "No linked image texture was found on this material."
+            )
+            return {"CANCELLED"}
+
+        width, height = image.size
+        channels = image.channels
+        if not width or not height or channels not in (1, 3, 4):
+            self.report({"ERROR"}, f"Image '{image.name}' has no usable pixel data.")
+            return {"CANCELLED"}
+
+        pixels = np.empty(width * height * channels, dtype=np.float32)
+        image.pixels.foreach_get(pixels)
+        rgba = bzmap_codec.rgba_from_blender_pixels(pixels, width, height, channels)
+
+        pixel_format = getattr(BZMapFormat, self.pixel_format)
+        palette = None
+        if self.pixel_format == "INDEXED":
+            palette = bzact_palettes.resolve_palette(
+                self.act_path.strip() or None, os.path.dirname(self.filepath)
+            )
+
+        try:
+            bzmap = bzmap_codec.encode_bzmap(rgba, pixel_format, palette)
+            with open(self.filepath, "wb") as stream:
+                BZMapSerializer().serialize(stream, bzmap)
+        except (OSError, ValueError) as e:
+            self.report({"ERROR"}, f"Failed to write '{self.filepath}': {e}")
+            return {"CANCELLED"}
+
+        self.report(
+            {"INFO"},
+            f"Saved {width}x{height} {self.pixel_format} .map to '{self.filepath}'.",
+        )
+        return {"FINISHED"}
+
+
 class BattlezoneMaterialProperties(bpy.types.Panel):
     bl_idname = "MATERIAL_PT_BZ_GEO"
     bl_label = "Battlezone Material"
@@ -3585,6 +3704,10 @@ class BattlezoneMaterialProperties(bpy.types.Panel):
         image_row.enabled = bool(image_name)
         image_row.operator("bz.fill_material_texture_from_image", text="Use Image Name")
 
+        export_row = box.row()
+        export_row.enabled = bool(image_name)
+        export_row.operator("bz.export_material_map", text="Save Image as .map")
+
         preview_box = layout.box()
         preview_box.label(text="Export Preview")
         preview_box.label(text=f"Resolved Name: {resolved_name or '(none)'}")
@@ -4371,64 +4494,7 @@ class OPGenerateCollision(bpy.types.Operator):
     def execute(self, context):
         # Get the active object.
         obj = context.view_layer.objects.active
-        # Get ready...
-        minx, miny, minz, maxx, maxy, maxz, maxoverall = [0.0] * 7
-        for vert in obj.data.vertices:
-            if vert.co.x < minx:
-                minx = vert.co.x
-            if vert.co.x > maxx:
-                maxx = vert.co.x
-            if vert.co.y < minz:
-                minz = vert.co.y
-            if vert.co.y > maxz:
-                maxz = vert.co.y
-            if vert.co.z < miny:
-                miny = vert.co.z
-            if vert.co.z > maxy:
-                maxy = vert.co.z
-            # Get maximum vertice distance to generate sphere radius.
-            for value in vert.co:
-                if abs(value) > maxoverall:
-                    maxoverall = abs(value)
-
-        obj.GEOPropertyGroup.SphereRadius = maxoverall
-
-        obj.GEOPropertyGroup.GeoCenterX = (minx + maxx) / 2
-        obj.GEOPropertyGroup.GeoCenterY = (miny + maxy) / 2
-        obj.GEOPropertyGroup.GeoCenterZ = (minz + maxz) / 2
-
-        if abs(minx - obj.GEOPropertyGroup.GeoCenterX) >= abs(
-            maxx - obj.GEOPropertyGroup.GeoCenterX
-        ):
-            obj.GEOPropertyGroup.BoxHalfHeightX = abs(
-                minx - obj.GEOPropertyGroup.GeoCenterX
-            )
-        else:
-            obj.GEOPropertyGroup.BoxHalfHeightX = abs(
-                maxx - obj.GEOPropertyGroup.GeoCenterX
-            )
-
-        if abs(miny - obj.GEOPropertyGroup.GeoCenterY) >= abs(
-            maxy - obj.GEOPropertyGroup.GeoCenterY
-        ):
-            obj.GEOPropertyGroup.BoxHalfHeightY = abs(
-                miny - obj.GEOPropertyGroup.GeoCenterY
-            )
-        else:
-            obj.GEOPropertyGroup.BoxHalfHeightY = abs(
-                maxy - obj.GEOPropertyGroup.GeoCenterY
-            )
-
-        if abs(minz - obj.GEOPropertyGroup.GeoCenterZ) >= abs(
-            maxz - obj.GEOPropertyGroup.GeoCenterZ
-        ):
-            obj.GEOPropertyGroup.BoxHalfHeightZ = abs(
-                minz - obj.GEOPropertyGroup.GeoCenterZ
-            )
-        else:
-            obj.GEOPropertyGroup.BoxHalfHeightZ = abs(
-                maxz - obj.GEOPropertyGroup.GeoCenterZ
-            )
+        bz_geo_bounds.apply_collision_bounds(obj)
         return {"FINISHED"}
 
 
@@ -5102,6 +5168,7 @@ def _draw_legacy_import_options(layout, operator):
         texture_box.enabled = bool(operator.ImportMapTextures)
         texture_box.prop(operator, "MapTextureDirectory")
         texture_box.prop(operator, "MapTextureZFS")
+        texture_box.prop(operator, "PackMapTextures")
         _draw_wrapped_label(
             texture_box,
             "Paste paths here. Blender cannot open a second folder/file picker while the import file browser is already open. Texture lookup checks the import folder first, then this folder, then extracts missing .map files from the selected ZFS.",
@@ -5145,6 +5212,12 @@ class ImportGEO(bpy.types.Operator, ImportHelper):
         default="",
     )
 
+    PackMapTextures: Any = BoolProperty(
+        name="Pack textures into .blend",
+        description="Embed loaded .map textures in the .blend file instead of leaving them as generated images or external PNGs.",
+        default=False,
+    )
+
     def draw(self, context):
         _draw_legacy_import_options(self.layout, self)
 
@@ -5205,6 +5278,12 @@ class ImportVDF(bpy.types.Operator, ImportHelper):
         default="",
     )
 
+    PackMapTextures: Any = BoolProperty(
+        name="Pack textures into .blend",
+        description="Embed loaded .map textures in the .blend file instead of leaving them as generated images or external PNGs.",
+        default=False,
+    )
+
     def draw(self, context):
         _draw_legacy_import_options(self.layout, self)
 
@@ -5264,6 +5343,12 @@ class ImportSDF(bpy.types.Operator, ImportHelper):
         default="",
     )
 
+    PackMapTextures: Any = BoolProperty(
+        name="Pack textures into .blend",
+        description="Embed loaded .map textures in the .blend file instead of leaving them as generated images or external PNGs.",
+        default=False,
+    )
+
     def draw(self, context):
         _draw_legacy_import_options(self.layout, self)
 
@@ -5387,6 +5472,24 @@ class ExportGEO(bpy.types.Operator, ExportHelper):
         default=False,
     )
 
+    ogre_dds_format: Any = EnumProperty(
+        name="DDS Format",
+        description="Porter --ddsformat. Encoding used for ported .dds textures.",
+        items=[
+            ("RGBA", "Uncompressed", "32-bit A8R8G8B8, largest files"),
+            ("BC1", "BC1 / DXT1", "4 bits per pixel, no alpha"),
+            ("BC3", "BC3 / DXT5", "8 bits per pixel with alpha"),
+            ("AUTO", "Auto", "BC1 for opaque textures, BC3 when alpha is used"),
+        ],
+        default="RGBA",
+    )
+
+    ogre_dds_mipmaps: Any = BoolProperty(
+        name="DDS Mipmaps",
+        description="Porter --mipmaps. Write a box-filtered mip chain into ported .dds textures.",
+        default=False,
+    )
+
     ogre_dest_dir: Any = StringProperty(
         name="Output Folder",
         description="Porter --dest. Destination directory for Redux files; leave blank to use export folder.",
@@ -5434,6 +5537,8 @@ class ExportGEO(bpy.types.Operator, ExportHelper):
                 "ogre_nowrite",
                 "ogre_skip_unchanged",
                 "ogre_profile_export",
+                "ogre_dds_format",
+                "ogre_dds_mipmaps",
                 "ogre_dest_dir",
             )
         )
@@ -5453,6 +5558,8 @@ class ExportGEO(bpy.types.Operator, ExportHelper):
                 "nowrite": self.ogre_nowrite,
                 "skip_unchanged": self.ogre_skip_unchanged,
                 "profile_export": self.ogre_profile_export,
+                "dds_format": self.ogre_dds_format,
+                "dds_mipmaps": self.ogre_dds_mipmaps,
                 "dest_dir": self.ogre_dest_dir.strip() or None,
             }
             ogre_autoport.auto_port_bz98_to_ogre(self.filepath, opts)
@@ -5600,6 +5707,30 @@ class ExportVDF(bpy.types.Operator, ExportHelper):
         default=False,
     )
 
+    ogre_dds_format: Any = EnumProperty(
+        name="DDS Format",
+        description="Porter --ddsformat. Encoding used for ported .dds textures.",
+        items=[
+            ("RGBA", "Uncompressed", "32-bit A8R8G8B8, largest files"),
+            ("BC1", "BC1 / DXT1", "4 bits per pixel, no alpha"),
+            ("BC3", "BC3 / DXT5", "8 bits per pixel with alpha"),
+            ("AUTO", "Auto", "BC1 for opaque textures, BC3 when alpha is used"),
+        ],
+        default="RGBA",
+    )
+
+    ogre_dds_mipmaps: Any = BoolProperty(
+        name="DDS Mipmaps",
+        description="Porter --mipmaps. Write a box-filtered mip chain into ported .dds textures.",
+        default=False,
+    )
+
+    ogre_texture_atlas: Any = BoolProperty(
+        name="Texture Atlas",
+        description="Porter --atlas. Pack non-tiling textures into one atlas and merge their submeshes to cut draw calls.",
+        default=False,
+    )
+
     ogre_dest_dir: Any = StringProperty(
         name="Output Folder",
         description="Porter --dest. Destination directory for Redux files; leave blank to use export folder.",
@@ -5760,6 +5891,9 @@ class ExportVDF(bpy.types.Operator, ExportHelper):
                 "ogre_nowrite",
                 "ogre_skip_unchanged",
                 "ogre_profile_export",
+                "ogre_dds_format",
+                "ogre_dds_mipmaps",
+                "ogre_texture_atlas",
                 "ogre_dest_dir",
                 "ogre_headlights",
                 "ogre_person_mode",
@@ -5794,6 +5928,9 @@ class ExportVDF(bpy.types.Operator, ExportHelper):
                 "nowrite": self.ogre_nowrite,
                 "skip_unchanged": self.ogre_skip_unchanged,
                 "profile_export": self.ogre_profile_export,
+                "dds_format": self.ogre_dds_format,
+                "dds_mipmaps": self.ogre_dds_mipmaps,
+                "texture_atlas": self.ogre_texture_atlas,
                 "dest_dir": self.ogre_dest_dir.strip() or None,
                 # VDF-only
                 "headlights": self.ogre_headlights,
@@ -5972,6 +6109,30 @@ class ExportSDF(bpy.types.Operator, ExportHelper):
         default=False,
     )
 
+    ogre_dds_format: Any = EnumProperty(
+        name="DDS Format",
+        description="Porter --ddsformat. Encoding used for ported .dds textures.",
+        items=[
+            ("RGBA", "Uncompressed", "32-bit A8R8G8B8, largest files"),
+            ("BC1", "BC1 / DXT1", "4 bits per pixel, no alpha"),
+            ("BC3", "BC3 / DXT5", "8 bits per pixel with alpha"),
+            ("AUTO", "Auto", "BC1 for opaque textures, BC3 when alpha is used"),
+        ],
+        default="RGBA",
+    )
+
+    ogre_dds_mipmaps: Any = BoolProperty(
+        name="DDS Mipmaps",
+        description="Porter --mipmaps. Write a box-filtered mip chain into ported .dds textures.",
+        default=False,
+    )
+
+    ogre_texture_atlas: Any = BoolProperty(
+        name="Texture Atlas",
+        description="Porter --atlas. Pack non-tiling textures into one atlas and merge their submeshes to cut draw calls.",
+        default=False,
+    )
+
     ogre_dest_dir: Any = StringProperty(
         name="Output Folder",
         description="Porter --dest. Destination directory for Redux files; leave blank to use export folder.",
@@ -6028,6 +6189,9 @@ class ExportSDF(bpy.types.Operator, ExportHelper):
                 "ogre_nowrite",
                 "ogre_skip_unchanged",
                 "ogre_profile_export",
+                "ogre_dds_format",
+                "ogre_dds_mipmaps",
+                "ogre_texture_atlas",
                 "ogre_dest_dir",
             )
         )
@@ -6047,6 +6211,9 @@ class ExportSDF(bpy.types.Operator, ExportHelper):
                 "nowrite": self.ogre_nowrite,
                 "skip_unchanged": self.ogre_skip_unchanged,
                 "profile_export": self.ogre_profile_export,
+                "dds_format": self.ogre_dds_format,
+                "dds_mipmaps": self.ogre_dds_mipmaps,
+                "texture_atlas": self.ogre_texture_atlas,
                 "dest_dir": self.ogre_dest_dir.strip() or None,
             }
             ogre_autoport.auto_port_bz98_to_ogre(self.filepath, opts)
@@ -6497,50 +6664,19 @@ def find_zfs_dependencies(reader, filename, extracted_files, temp_dir):
 
     ext = os.path.splitext(filename)[1].lower()
 
-    if ext == ".vdf":
-        from . import vdf_classes
+    if ext in (".vdf", ".sdf"):
+        from . import bwd2_index
 
+        # Every LOD band of the VGEO/SGEO slot table, read from the chunk index.
         try:
-            with open(path, "rb") as f:
-                content = f.read()
-                pos = 20  # Skip VDFHeader
-                vdfc = vdf_classes.VDFCHeader()
-                pos = vdfc.Read(content, pos)
-                pos += 8  # Skip EXIT
-                vgeo = vdf_classes.VGEOHeader()
-                pos = vgeo.Read(content, pos)
-                for _ in range(vgeo.geocount * 28):
-                    geo = vdf_classes.GEOData()
-                    geo.Read(content, pos)
-                    pos += 100
-                    if geo.name.lower() != "null":
-                        find_zfs_dependencies(
-                            reader, geo.name + ".geo", extracted_files, temp_dir
-                        )
-        except Exception as exc:
-            print(f"[BZ ZFS] Failed to scan VDF dependencies for '{filename}': {exc}")
-
-    elif ext == ".sdf":
-        from . import sdf_classes
-
-        try:
-            with open(path, "rb") as f:
-                content = f.read()
-                pos = 20  # Skip SDFHeader
-                sdfc = sdf_classes.SDFCHeader()
-                pos = sdfc.Read(content, pos)
-                sgeo = sdf_classes.SGEOHeader()
-                pos = sgeo.Read(content, pos)
-                for _ in range(sgeo.geocount):
-                    geo = sdf_classes.GEOData()
-                    geo.Read(content, pos)
-                    pos += 120
-                    if geo.name.lower() != "null":
-                        find_zfs_dependencies(
-                            reader, geo.name + ".geo", extracted_files, temp_dir
-                        )
+            index = bwd2_index.BWD2Index.from_file(path)
+            for geo_name in index.referenced_geos():
+                find_zfs_dependencies(
+                    reader, geo_name + ".geo", extracted_files, temp_dir
+                )
         except Exception as exc:
-            print(f"[BZ ZFS] Failed to scan SDF dependencies for '{filename}': {exc}")
+            kind = ext[1:].upper()
+            print(f"[BZ ZFS] Failed to scan {kind} dependencies for '{filename}': {exc}")
 
     elif ext == ".geo":
         # Scan for textures
@@ -6975,6 +7111,7 @@ GUIClasses = [
     BZ98TOOLS_PT_geo_face_data,
     BZ98TOOLS_OT_fill_material_texture_name,
     BZ98TOOLS_OT_fill_material_texture_from_image,
+    BZ98TOOLS_OT_export_material_map,
     BattlezoneMaterialProperties,
     OPCreateNewElement,
     OPDeleteElement,
@@ -0,0 +1,353 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+Keyframe arrays for VDF/SDF animation.
+
+On import, ANIM keys are converted to Blender values in NumPy and written
+straight into F-curves: keyframe_points.add() allocates a whole track and
+foreach_set("co") fills it, instead of one keyframe_insert per key. On
+export, F-curve keys are read with foreach_get("co"), merged per channel
+and converted to ANIM keyframe records in the same way.
+"""
+
+from collections import namedtuple
+
+import bpy
+import numpy as np
+
+from . import bwd2_index
+
+# Axis order of each Euler rotation mode and whether it is an odd
+# permutation of XYZ (Blender's rotOrders table).
+EULER_ORDERS = {
+    "XYZ": ((0, 1, 2), False),
+    "XZY": ((0, 2, 1), True),
+    "YXZ": ((1, 0, 2), True),
+    "YZX": ((1, 2, 0), False),
+    "ZXY": ((2, 0, 1), False),
+    "ZYX": ((2, 1, 0), True),
+}
+
+# F-curve group keyframe_insert uses for object transforms.
+TRANSFORM_GROUP = "Object Transforms"
+
+_FLT_EPSILON = np.finfo(np.float32).eps
+
+
+def quaternions_to_matrices(quaternions):
+    """
+    (N, 4) w, x, y, z quaternions to (N, 3, 3) rotation matrices.
+
+    Quaternions are normalized first. Matrices use Blender's column-major
+    indexing, m[..., column, row], like quat_to_mat3.
+    """
+    q = np.asarray(quaternions, dtype=np.float64).reshape(-1, 4)
+    length = np.linalg.norm(q, axis=1, keepdims=True)
+    q = np.divide(
+        q, length, out=np.tile([1.0, 0.0, 0.0, 0.0], (len(q), 1)), where=length > 0
+    )
+    q = q * np.sqrt(2.0)
+    w, x, y, z = q.T
+
+    m = np.empty((len(q), 3, 3))
+    m[:, 0, 0] = 1.0 - y * y - z * z
+    m[:, 0, 1] = w * z + x * y
+    m[:, 0, 2] = -w * y + x * z
+    m[:, 1, 0] = -w * z + x * y
+    m[:, 1, 1] = 1.0 - x * x - z * z
+    m[:, 1, 2] = w * x + y * z
+    m[:, 2, 0] = w * y + x * z
+    m[:, 2, 1] = -w * x + y * z
+    m[:, 2, 2] = 1.0 - x * x - y * y
+    return m
+
+
+def matrices_to_euler(matrices, order="XYZ"):
+    """
+    (N, 3, 3) column-major rotation matrices to (N, 3) Euler angles.
+
+    Follows mathutils: of the two equivalent solutions the one with the
+    smaller sum of absolute angles is kept.
+    """
+    (i, j, k), parity = EULER_ORDERS[order]
+    m = np.asarray(matrices, dtype=np.float64).reshape(-1, 3, 3)
+    cy = np.hypot(m[:, i, i], m[:, i, j])
+    regular = cy > 16.0 * _FLT_EPSILON
+
+    first = np.empty((len(m), 3))
+    second = np.empty((len(m), 3))
+    first[:, i] = np.where(
+        regular,
+        np.arctan2(m[:, j, k], m[:, k, k]),
+        np.arctan2(-m[:, k, j], m[:, j, j]),
+    )
+    first[:, j] = np.arctan2(-m[:, i, k], cy)
+    first[:, k] = np.where(regular, np.arctan2(m[:, i, j], m[:, i, i]), 0.0)
+    second[:, i] = np.arctan2(-m[:, j, k], -m[:, k, k])
+    second[:, j] = np.arctan2(-m[:, i, k], -cy)
+    second[:, k] = np.arctan2(-m[:, i, j], -m[:, i, i])
+    second[~regular] = first[~regular]
+
+    if parity:
+        first = -first
+        second = -second
+    use_second = np.abs(first).sum(axis=1) > np.abs(second).sum(axis=1)
+    return np.where(use_second[:, None], second, first)
+
+
+def quaternions_to_euler(quaternions, order="XYZ"):
+    """(N, 4) w, x, y, z quaternions to (N, 3) Euler angles in order."""
+    return matrices_to_euler(quaternions_to_matrices(quaternions), order)
+
+
+def euler_to_quaternions(euler, order="XYZ"):
+    """(N, 3) Euler angles in order to (N, 4) w, x, y, z quaternions."""
+    (i, j, k), parity = EULER_ORDERS[order]
+    e = np.asarray(euler, dtype=np.float64).reshape(-1, 3)
+    ti = e[:, i] * 0.5
+    tj = e[:, j] * (-0.5 if parity else 0.5)
+    th = e[:, k] * 0.5
+    ci, cj, ch = np.cos(ti), np.cos(tj), np.cos(th)
+    si, sj, sh = np.sin(ti), np.sin(tj), np.sin(th)
+    cc, cs, sc, ss = ci * ch, ci * sh, si * ch, si * sh
+
+    q = np.empty((len(e), 4))
+    q[:, 0] = cj * cc + sj * ss
+    q[:, 1 + i] = cj * sc - sj * cs
+    q[:, 1 + j] = cj * ss + sj * cc
+    q[:, 1 + k] = cj * cs - sj * sc
+    if parity:
+        q[:, 1 + j] = -q[:, 1 + j]
+    return q
+
+
+def unique_frames(frames, values):
+    """
+    Sort keys by frame, keeping the last value given for each frame.
+
+    This is what repeated keyframe_insert calls on one frame end up with.
+    """
+    frames = np.asarray(frames, dtype=np.float64).reshape(-1)
+    values = np.asarray(values, dtype=np.float64).reshape(len(frames), -1)
+    frames, last = np.unique(frames[::-1], return_index=True)
+    return frames, values[::-1][last]
+
+
+def _ensure_action(obj):
+    obj.animation_data_create()
+    if obj.animation_data.action is None:
+        obj.animation_data.action = bpy.data.actions.new(f"{obj.name}Action")
+    return obj.animation_data.action
+
+
+def _ensure_fcurve(action, obj, data_path, index, group_name):
+    # Blender 4.4+ keeps F-curves in the channelbag of the object's slot.
+    if hasattr(action, "fcurve_ensure_for_datablock"):
+        return action.fcurve_ensure_for_datablock(
+            obj, data_path, index=index, group_name=group_name
+        )
+    fcurve = action.fcurves.find(data_path, index=index)
+    if fcurve is None:
+        fcurve = action.fcurves.new(data_path, index=index, action_group=group_name)
+    return fcurve
+
+
+def insert_keyframes(obj, data_path, frames, values, group_name=TRANSFORM_GROUP):
+    """
+    Key every component of obj.<data_path> at once.
+
+    values is (N, components); column c goes to the F-curve with array
+    index c. Keys already on a curve are kept unless a new key lands on
+    the same frame. New keys get the same defaults keyframe_insert uses
+    (Bezier, auto-clamped handles), with handles computed by update().
+    """
+    frames, values = unique_frames(frames, values)
+    if not len(frames):
+        return
+    action = _ensure_action(obj)
+    for index in range(values.shape[1]):
+        fcurve = _ensure_fcurve(action, obj, data_path, index, group_name)
+        points = fcurve.keyframe_points
+        co = np.empty((len(points), 2), dtype=np.float32)
+        points.foreach_get("co", co.ravel())
+        keys = np.column_stack((frames, values[:, index])).astype(np.float32)
+        co, extra = merge_keys(co, keys)
+        points.add(len(extra))
+        points.foreach_set("co", np.concatenate((co, extra)).ravel())
+        fcurve.update()
+
+
+def merge_keys(existing, keys):
+    """
+    Overlay (N, 2) frame/value keys on an F-curve's existing co array.
+
+    Returns the existing keys with values replaced where a new key shares
+    their frame, and the new keys that need points of their own.
+    """
+    existing = existing.copy()
+    if not len(existing):
+        return existing, keys
+    order = np.argsort(existing[:, 0], kind="stable")
+    slot = np.searchsorted(existing[order, 0], keys[:, 0])
+    target = order[np.minimum(slot, len(order) - 1)]
+    hit = existing[target, 0] == keys[:, 0]
+    existing[target[hit], 1] = keys[hit, 1]
+    return existing, keys[~hit]
+
+
+def _keys(records, start, count):
+    start = int(start)
+    return records[start : start + int(count)]
+
+
+def key_orientation(obj, orientation, rotations, scales, positions):
+    """
+    Key obj from one ANIM orientation record and the ANIM keyframe lists.
+
+    The arrays are bwd2_index structured views. Rotations become XYZ Euler
+    keys; scale and position keys are swapped from GEO to Blender axes.
+    Returns the last keyed frame, or 0 when there are no keys.
+    """
+    end_frame = 0
+
+    keys = _keys(
+        rotations, orientation["rotation_start"], orientation["rotation_count"]
+    )
+    if len(keys):
+        euler = quaternions_to_euler(keys["value"][:, [0, 1, 3, 2]], "XYZ")
+        obj.rotation_mode = "XYZ"
+        insert_keyframes(obj, "rotation_euler", keys["frame"], euler)
+        end_frame = max(end_frame, int(keys["frame"].max()))
+
+    keys = _keys(
+        positions, orientation["position_start"], orientation["position_count"]
+    )
+    if len(keys):
+        insert_keyframes(obj, "location", keys["frame"], keys["value"][:, [0, 2, 1]])
+        end_frame = max(end_frame, int(keys["frame"].max()))
+
+    keys = _keys(scales, orientation["scale_start"], orientation["scale_count"])
+    if len(keys):
+        insert_keyframes(obj, "scale", keys["frame"], keys["value"][:, [0, 2, 1]])
+        end_frame = max(end_frame, int(keys["frame"].max()))
+
+    return end_frame
+
+
+# ANIM keyframe records of one object, as bwd2_index structured arrays in
+# GEO axes: rotations (ROTATION_KEY_DTYPE), scales and positions
+# (VECTOR_KEY_DTYPE).
+AnimKeys = namedtuple("AnimKeys", "rotations scales positions")
+
+
+def action_fcurves(action):
+    """All F-curves of an action, legacy or layered (Blender 4.4+)."""
+    fcurves = getattr(action, "fcurves", None)
+    if fcurves is not None:
+        yield from fcurves
+        return
+
+    for layer in getattr(action, "layers", []):
+        for strip in getattr(layer, "strips", []):
+            for channelbag in getattr(strip, "channelbags", []):
+                yield from getattr(channelbag, "fcurves", [])
+
+
+def fcurve_co(fcurve):
+    """Keyframe (frame, value) pairs of an F-curve as an (N, 2) array."""
+    points = fcurve.keyframe_points
+    co = np.empty(len(points) * 2, dtype=np.float32)
+    points.foreach_get("co", co)
+    return co.reshape(-1, 2)
+
+
+def merge_channels(tracks, default):
+    """
+    Merge per-component keys onto the union of their whole frames.
+
+    tracks is a list of (array_index, co) pairs in F-curve order. Frames
+    are truncated to integers; a component without a key on a frame keeps
+    its default, and of several keys landing on one frame the last wins.
+    Returns (frames, values) with values shaped (frames, len(default)).
+    """
+    default = np.asarray(default, dtype=np.float64)
+    tracks = [
+        (index, np.trunc(co[:, 0]).astype(np.int32), co[:, 1])
+        for index, co in tracks
+        if 0 <= index < len(default) and len(co)
+    ]
+    if not tracks:
+        return np.empty(0, dtype=np.int32), np.empty((0, len(default)))
+
+    frames = np.unique(np.concatenate([track[1] for track in tracks]))
+    values = np.tile(default, (len(frames), 1))
+    for index, track_frames, track_values in tracks:
+        track_frames, track_values = unique_frames(track_frames, track_values)
+        values[np.searchsorted(frames, track_frames), index] = track_values[:, 0]
+    return frames, values
+
+
+def battlezone_rotations(euler):
+    """
+    Blender XYZ Euler rotations to ANIM rotation quaternions.
+
+    Battlezone applies the same angles in YZX order with the Y and Z axes
+    swapped, as the GEO matrices do.
+    """
+    euler = np.asarray(euler, dtype=np.float64).reshape(-1, 3)
+    return euler_to_quaternions(euler[:, [0, 2, 1]], "YZX")
+
+
+def _records(dtype, frames, values):
+    records = np.zeros(len(frames), dtype=dtype)
+    records["frame"] = frames
+    records["value"] = values
+    return records
+
+
+def collect_anim_keys(obj):
+    """
+    AnimKeys for one exported object from its action's F-curves.
+
+    Rotation comes from the rotation_euler curves, or from the
+    rotation_quaternion curves when the object is in quaternion mode or
+    has no Euler keys. Missing components default to zero, the identity
+    quaternion and the object's current scale. Positions of parented
+    objects include the translation of the parent inverse matrix.
+    """
+    tracks = {}
+    anim = getattr(obj, "animation_data", None)
+    if anim is not None and anim.action is not None:
+        for fcurve in action_fcurves(anim.action):
+            tracks.setdefault(fcurve.data_path, []).append(
+                (fcurve.array_index, fcurve_co(fcurve))
+            )
+
+    prefer_quat = getattr(obj, "rotation_mode", "XYZ") == "QUATERNION"
+    frames, euler = merge_channels(
+        [] if prefer_quat else tracks.get("rotation_euler", []), (0.0, 0.0, 0.0)
+    )
+    if not len(frames):
+        frames, quaternions = merge_channels(
+            tracks.get("rotation_quaternion", []), (1.0, 0.0, 0.0, 0.0)
+        )
+        euler = quaternions_to_euler(quaternions, "XYZ")
+    rotations = _records(
+        bwd2_index.ROTATION_KEY_DTYPE, frames, battlezone_rotations(euler)
+    )
+
+    frames, scale = merge_channels(tracks.get("scale", []), tuple(obj.scale))
+    scales = _records(bwd2_index.VECTOR_KEY_DTYPE, frames, scale[:, [0, 2, 1]])
+
+    frames, location = merge_channels(tracks.get("location", []), (0.0, 0.0, 0.0))
+    if obj.parent is not None:
+        location = location + tuple(obj.matrix_parent_inverse.to_translation())
+    positions = _records(bwd2_index.VECTOR_KEY_DTYPE, frames, location[:, [0, 2, 1]])
+    return AnimKeys(rotations, scales, positions)
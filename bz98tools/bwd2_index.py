@@ -0,0 +1,245 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+Chunk index for BWD2 containers (.vdf and .sdf files).
+
+One scan over the file records every chunk as (tag, offset, length); the
+GEO slot table and the ANIM lists are then exposed as NumPy structured
+arrays viewing a single memoryview of the file, so nothing is unpacked
+record by record. Shared by the VDF/SDF importers, the ZFS dependency
+scanner and the Redux porter (bzrmodelporter.bzbwd2_serializer); it has
+no bpy dependency.
+"""
+
+import struct
+from collections import namedtuple
+
+import numpy as np
+
+# One VGEO slot (100 bytes).
+VDF_GEO_DTYPE = np.dtype(
+    [
+        ("name", "S8"),
+        ("matrix", "<f4", (12,)),  # right, up, front, position
+        ("parent", "S8"),
+        ("center", "<f4", (3,)),
+        ("radius", "<f4"),
+        ("half_size", "<f4", (3,)),
+        ("type", "<i4"),
+        ("flags", "<i4"),
+    ]
+)
+
+# One SGEO slot (120 bytes): a VGEO slot plus DDR, target and time.
+SDF_GEO_DTYPE = np.dtype(
+    VDF_GEO_DTYPE.descr
+    + [
+        ("ddr", "<i4"),
+        ("target", "<f4", (3,)),
+        ("time", "<f4"),
+    ]
+)
+
+ANIM_HEADER_DTYPE = np.dtype(
+    [
+        ("tag", "S4"),
+        ("length", "<i4"),
+        ("name", "S16"),
+        ("element_count", "<i4"),
+        ("orientation_count", "<i4"),
+        ("rotation_count", "<i4"),
+        ("scale_count", "<i4"),
+        ("position_count", "<i4"),
+        ("null2", "<i4"),
+        ("unknown2", "<i4"),
+        ("reserved", "<i4", (5,)),
+    ]
+)
+
+ANIM_ELEMENT_DTYPE = np.dtype(
+    [
+        ("index", "<i4"),
+        ("geo_mask", "<i4", (32,)),
+        ("start", "<i4"),
+        ("length", "<i4"),
+        ("loop", "<i4"),
+        ("speed", "<f4"),
+    ]
+)
+
+# Per-GEO keyframe ranges (the toolkit's ANIMOrientation).
+ANIM_ORIENTATION_DTYPE = np.dtype(
+    [
+        ("name", "S8"),
+        ("flags", "<i4"),
+        ("inverse_matrix", "<f4", (12,)),
+        ("frame_matrix", "<f4", (12,)),
+        ("rotation_start", "<i4"),
+        ("rotation_count", "<i4"),
+        ("scale_start", "<i4"),
+        ("scale_count", "<i4"),
+        ("position_start", "<i4"),
+        ("position_count", "<i4"),
+    ]
+)
+
+# Rotation keys hold a quaternion, scale and position keys a vector.
+ROTATION_KEY_DTYPE = np.dtype([("frame", "<i4"), ("value", "<f4", (4,))])
+VECTOR_KEY_DTYPE = np.dtype([("frame", "<i4"), ("value", "<f4", (3,))])
+
+# GEO slot bands per file: VDF has 7 LODs x 4 representations, SDF 3 x 2.
+VDF_GEO_BANDS = 28
+SDF_GEO_BANDS = 6
+
+CHUNK_HEADER = struct.Struct("<4si")
+
+Chunk = namedtuple("Chunk", "tag offset length")
+AnimSection = namedtuple(
+    "AnimSection", "header elements orientations rotations scales positions"
+)
+
+_GEO_TABLES = {
+    b"VGEO": (VDF_GEO_DTYPE, VDF_GEO_BANDS),
+    b"SGEO": (SDF_GEO_DTYPE, SDF_GEO_BANDS),
+}
+
+# ANIM header count field and record dtype of each list, in file order.
+_ANIM_LISTS = (
+    ("element_count", ANIM_ELEMENT_DTYPE),
+    ("orientation_count", ANIM_ORIENTATION_DTYPE),
+    ("rotation_count", ROTATION_KEY_DTYPE),
+    ("scale_count", VECTOR_KEY_DTYPE),
+    ("position_count", VECTOR_KEY_DTYPE),
+)
+
+
+def _table_length(data, offset, tag):
+    """Length of a chunk whose size follows from its counts, or None."""
+    if tag in _GEO_TABLES:
+        if offset + 12 > len(data):
+            return None
+        (geo_count,) = struct.unpack_from("<i", data, offset + 8)
+        dtype, bands = _GEO_TABLES[tag]
+        return 12 + max(geo_count, 0) * bands * dtype.itemsize
+    if tag == b"ANIM":
+        if offset + ANIM_HEADER_DTYPE.itemsize > len(data):
+            return None
+        header = np.frombuffer(data, ANIM_HEADER_DTYPE, 1, offset)[0]
+        return ANIM_HEADER_DTYPE.itemsize + sum(
+            max(int(header[field]), 0) * dtype.itemsize for field, dtype in _ANIM_LISTS
+        )
+    return None
+
+
+def scan_chunks(data):
+    """
+    List the chunks of a BWD2 buffer in file order.
+
+    The size stored in each chunk header includes the header itself. GEO
+    tables and ANIM use the length implied by their counts instead, which
+    is what the game and the legacy readers rely on. The scan stops at the
+    first chunk header that does not fit the buffer.
+    """
+    chunks = []
+    offset = 0
+    end = len(data)
+    while offset + CHUNK_HEADER.size <= end:
+        tag, length = CHUNK_HEADER.unpack_from(data, offset)
+        length = _table_length(data, offset, tag) or length
+        if length < CHUNK_HEADER.size:
+            break
+        chunks.append(Chunk(tag, offset, min(length, end - offset)))
+        offset += length
+    return chunks
+
+
+def decode_name(raw):
+    """Decode a fixed-length name field as ASCII, dropping padding."""
+    return raw.decode("ascii", errors="ignore").strip("\0")
+
+
+class BWD2Index:
+    """Chunk table and structured views over one BWD2 file."""
+
+    def __init__(self, data):
+        self.data = memoryview(data).cast("B")
+        self.chunks = scan_chunks(self.data)
+
+    @classmethod
+    def from_file(cls, filepath):
+        with open(filepath, "rb") as f:
+            return cls(f.read())
+
+    def is_bwd2(self):
+        """True when the file starts with the BWD2 and REV chunks."""
+        tags = [chunk.tag for chunk in self.chunks[:2]]
+        return tags == [b"BWD2", b"REV\0"]
+
+    def find(self, tag):
+        """First chunk with the given tag (bytes or str), or None."""
+        if isinstance(tag, str):
+            tag = tag.encode("ascii")
+        for chunk in self.chunks:
+            if chunk.tag == tag:
+                return chunk
+        return None
+
+    def geo_table(self):
+        """
+        GEO slots as a (bands, geo_count) structured array.
+
+        Uses VDF_GEO_DTYPE for VGEO and SDF_GEO_DTYPE for SGEO. Returns None
+        when neither chunk is present; a truncated table keeps only the
+        bands that are complete.
+        """
+        for tag, (dtype, bands) in _GEO_TABLES.items():
+            chunk = self.find(tag)
+            if chunk is None or chunk.length < 12:
+                continue
+            (geo_count,) = struct.unpack_from("<i", self.data, chunk.offset + 8)
+            geo_count = max(geo_count, 0)
+            available = (chunk.length - 12) // dtype.itemsize
+            if geo_count:
+                bands = min(bands, available // geo_count)
+            table = np.frombuffer(
+                self.data, dtype, bands * geo_count, chunk.offset + 12
+            )
+            return table.reshape(bands, geo_count)
+        return None
+
+    def anim(self):
+        """AnimSection of structured views, or None without a full ANIM."""
+        chunk = self.find(b"ANIM")
+        if chunk is None or chunk.length < ANIM_HEADER_DTYPE.itemsize:
+            return None
+        header = np.frombuffer(self.data, ANIM_HEADER_DTYPE, 1, chunk.offset)[0]
+        offset = chunk.offset + ANIM_HEADER_DTYPE.itemsize
+        lists = []
+        for field, dtype in _ANIM_LISTS:
+            count = max(int(header[field]), 0)
+            if offset + count * dtype.itemsize > chunk.offset + chunk.length:
+                return None
+            lists.append(np.frombuffer(self.data, dtype, count, offset))
+            offset += count * dtype.itemsize
+        return AnimSection(header, *lists)
+
+    def referenced_geos(self):
+        """Names of all non-NULL GEO slots, first occurrence order."""
+        table = self.geo_table()
+        if table is None:
+            return []
+        raw_names = dict.fromkeys(table["name"].ravel().tolist())
+        names = dict.fromkeys(decode_name(raw) for raw in raw_names)
+        return [name for name in names if name and not name.lower().startswith("null")]
+
+
+def null_slots(table):
+    """Boolean mask of GEO slots whose name starts with NULL (any case)."""
+    return np.char.startswith(np.char.lower(table["name"]), b"null")
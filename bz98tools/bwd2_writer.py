@@ -0,0 +1,74 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+Single-buffer writer for BWD2 containers (.vdf and .sdf files).
+
+The exporters compute every section size first, then pack the sections
+in file order into one preallocated buffer: header sections through the
+Pack methods of vdf_classes/sdf_classes, the GEO table and the ANIM
+keyframe lists as bwd2_index structured arrays viewing the buffer. The
+finished buffer is written to a temporary file and renamed over the
+target, so a failed export never leaves a half-written file behind.
+"""
+
+import os
+
+import numpy as np
+
+
+def write_atomic(filepath, data):
+    """Write data to filepath through a temporary file and a rename.
+
+    Missing parent folders are created. Shared with map_convert, which
+    writes converted textures the same way.
+    """
+    out_dir = os.path.dirname(filepath)
+    if out_dir:
+        os.makedirs(out_dir, exist_ok=True)
+    tmp_path = filepath + ".tmp"
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, filepath)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+
+
+class BWD2Writer:
+    """A BWD2 file of a known size, filled section by section."""
+
+    def __init__(self, size):
+        self.buffer = bytearray(size)
+        self.position = 0
+
+    def pack(self, *sections):
+        """Pack toolkit sections (anything with Pack) in order."""
+        for section in sections:
+            self.position = section.Pack(self.buffer, self.position)
+
+    def records(self, dtype, shape):
+        """Structured array over the next records of the buffer, to fill."""
+        view = np.ndarray(shape, dtype, self.buffer, self.position)
+        self.position += view.nbytes
+        return view
+
+    def write_records(self, records):
+        """Copy a structured array into the buffer as is."""
+        self.records(records.dtype, records.shape)[...] = records
+
+    def save(self, filepath):
+        if self.position != len(self.buffer):
+            raise ValueError(
+                f"BWD2 buffer holds {len(self.buffer)} bytes but "
+                f"{self.position} were packed"
+            )
+        write_atomic(filepath, self.buffer)
@@ -0,0 +1,477 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+ACT palette service shared by the GEO importer, the Redux porter and the
+batch .map converter. Kept free of bpy so worker processes can use it.
+"""
+
+import os
+
+import numpy as np
+
+# Use built-in ACT palette by name (must exist in BUILTIN_ACT_PALETTES)
+BZ_FORCE_ACT_NAME = "moon.act"
+
+
+BUILTIN_ACT_PALETTES = {
+    "moon.act": [
+        (0, 0, 0),
+        (17, 16, 16),
+        (26, 24, 24),
+        (31, 26, 25),
+        (36, 35, 31),
+        (50, 42, 36),
+        (52, 49, 48),
+        (60, 56, 56),
+        (68, 64, 64),
+        (77, 72, 72),
+        (85, 80, 80),
+        (84, 79, 76),
+        (112, 108, 104),
+        (116, 129, 125),
+        (133, 138, 133),
+        (178, 174, 174),
+        (191, 188, 188),
+        (204, 201, 201),
+        (217, 215, 215),
+        (229, 228, 228),
+        (255, 255, 255),
+        (20, 3, 2),
+        (40, 6, 3),
+        (59, 10, 5),
+        (79, 13, 6),
+        (99, 16, 8),
+        (107, 0, 8),
+        (148, 8, 0),
+        (140, 33, 8),
+        (148, 16, 0),
+        (156, 24, 0),
+        (173, 57, 0),
+        (189, 82, 8),
+        (206, 99, 16),
+        (200, 94, 11),
+        (214, 101, 0),
+        (214, 132, 33),
+        (222, 123, 24),
+        (231, 140, 33),
+        (231, 156, 41),
+        (239, 173, 57),
+        (222, 156, 49),
+        (222, 165, 57),
+        (222, 165, 74),
+        (231, 173, 99),
+        (239, 189, 90),
+        (247, 198, 82),
+        (239, 206, 115),
+        (249, 249, 149),
+        (235, 230, 97),
+        (183, 180, 81),
+        (169, 133, 50),
+        (131, 124, 45),
+        (123, 99, 39),
+        (149, 101, 17),
+        (87, 59, 2),
+        (80, 67, 28),
+        (78, 48, 3),
+        (53, 40, 12),
+        (36, 24, 5),
+        (171, 72, 69),
+        (169, 168, 158),
+        (153, 150, 139),
+        (249, 249, 195),
+        (223, 216, 188),
+        (200, 189, 151),
+        (194, 186, 139),
+        (186, 172, 145),
+        (167, 164, 145),
+        (160, 151, 127),
+        (175, 168, 134),
+        (160, 145, 106),
+        (157, 145, 109),
+        (136, 130, 107),
+        (132, 125, 80),
+        (116, 104, 81),
+        (96, 94, 83),
+        (84, 73, 55),
+        (115, 72, 1),
+        (106, 81, 30),
+        (109, 118, 109),
+        (93, 106, 102),
+        (79, 96, 90),
+        (68, 91, 86),
+        (63, 76, 73),
+        (62, 63, 57),
+        (48, 70, 67),
+        (46, 61, 56),
+        (37, 59, 54),
+        (34, 50, 45),
+        (31, 42, 41),
+        (24, 36, 32),
+        (19, 23, 21),
+        (16, 14, 14),
+        (15, 10, 6),
+        (7, 11, 9),
+        (181, 191, 204),
+        (150, 156, 172),
+        (139, 149, 164),
+        (134, 143, 156),
+        (125, 134, 150),
+        (120, 130, 143),
+        (115, 124, 139),
+        (112, 129, 150),
+        (111, 120, 135),
+        (107, 116, 131),
+        (106, 124, 145),
+        (101, 117, 141),
+        (100, 111, 128),
+        (100, 108, 123),
+        (96, 108, 123),
+        (96, 104, 120),
+        (95, 112, 135),
+        (92, 104, 119),
+        (92, 100, 116),
+        (91, 108, 131),
+        (88, 100, 115),
+        (88, 96, 112),
+        (85, 104, 127),
+        (84, 96, 111),
+        (84, 92, 108),
+        (83, 100, 123),
+        (80, 96, 119),
+        (80, 92, 108),
+        (80, 88, 104),
+        (76, 96, 119),
+        (76, 92, 116),
+        (76, 92, 110),
+        (76, 84, 100),
+        (75, 88, 103),
+        (74, 88, 108),
+        (72, 92, 115),
+        (72, 88, 112),
+        (72, 84, 104),
+        (72, 84, 99),
+        (72, 80, 95),
+        (68, 88, 112),
+        (68, 84, 108),
+        (68, 80, 100),
+        (68, 76, 92),
+        (67, 84, 102),
+        (67, 80, 95),
+        (64, 84, 108),
+        (64, 80, 104),
+        (64, 76, 96),
+        (64, 72, 87),
+        (63, 80, 100),
+        (63, 76, 91),
+        (60, 80, 104),
+        (60, 76, 104),
+        (60, 76, 100),
+        (60, 72, 92),
+        (60, 68, 83),
+        (59, 76, 96),
+        (59, 72, 87),
+        (56, 76, 100),
+        (56, 72, 100),
+        (56, 72, 96),
+        (56, 64, 79),
+        (55, 72, 92),
+        (55, 68, 83),
+        (53, 68, 88),
+        (52, 72, 96),
+        (52, 68, 96),
+        (52, 68, 92),
+        (52, 64, 88),
+        (52, 60, 75),
+        (51, 64, 79),
+        (49, 64, 84),
+        (48, 68, 92),
+        (48, 64, 92),
+        (48, 60, 84),
+        (47, 64, 88),
+        (47, 60, 75),
+        (47, 56, 72),
+        (46, 56, 68),
+        (45, 60, 88),
+        (45, 60, 80),
+        (44, 56, 79),
+        (44, 52, 68),
+        (44, 51, 64),
+        (43, 60, 84),
+        (40, 56, 80),
+        (40, 56, 76),
+        (40, 52, 76),
+        (40, 48, 64),
+        (40, 48, 60),
+        (40, 44, 60),
+        (36, 52, 72),
+        (36, 51, 76),
+        (36, 48, 72),
+        (36, 40, 56),
+        (35, 44, 60),
+        (33, 41, 56),
+        (31, 38, 53),
+        (28, 36, 49),
+        (26, 33, 45),
+        (24, 30, 41),
+        (22, 27, 38),
+        (20, 24, 34),
+        (17, 22, 30),
+        (15, 19, 26),
+        (13, 16, 23),
+        (11, 13, 19),
+        (9, 10, 15),
+        (6, 8, 11),
+        (4, 5, 8),
+        (2, 2, 4),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 0, 0),
+        (0, 255, 255),
+        (0, 127, 127),
+        (0, 63, 63),
+        (78, 194, 242),
+        (14, 153, 240),
+        (7, 109, 222),
+        (12, 149, 203),
+        (6, 102, 171),
+        (6, 93, 136),
+        (3, 56, 124),
+        (26, 35, 80),
+        (0, 127, 255),
+        (0, 99, 199),
+        (0, 70, 141),
+        (0, 34, 69),
+        (0, 21, 42),
+        (0, 255, 0),
+        (0, 127, 0),
+        (0, 63, 0),
+        (0, 31, 0),
+        (0, 15, 0),
+        (255, 0, 0),
+        (127, 0, 0),
+        (63, 0, 0),
+        (31, 0, 0),
+        (15, 0, 0),
+        (255, 255, 0),
+        (164, 164, 0),
+        (127, 127, 0),
+        (80, 80, 0),
+        (64, 64, 0),
+        (255, 0, 255),
+    ],
+}
+
+
+ACT_BYTE_SIZE = 256 * 3
+
+
+class ActPalette:
+    """
+    A 256-colour ACT palette with lookup tables precomputed for decoding.
+
+    rgb is (256, 3) uint8, rgba8 is (256, 4) uint8 with opaque alpha and
+    rgba_float is the same table as float32 in 0..1. The arrays are read-only
+    because instances are shared through the palette cache. np.asarray(palette)
+    and palette[i] behave like the plain (256, 3) array.
+    """
+
+    __slots__ = ("name", "rgb", "rgba8", "rgba_float")
+
+    def __init__(self, rgb, name=""):
+        rgb = np.array(rgb, dtype=np.uint8).reshape(256, 3)
+        rgba8 = np.empty((256, 4), dtype=np.uint8)
+        rgba8[:, :3] = rgb
+        rgba8[:, 3] = 255
+        rgba_float = rgba8.astype(np.float32)
+        rgba_float *= np.float32(1.0 / 255.0)
+        for table in (rgb, rgba8, rgba_float):
+            table.flags.writeable = False
+        self.name = name
+        self.rgb = rgb
+        self.rgba8 = rgba8
+        self.rgba_float = rgba_float
+
+    def __len__(self):
+        return 256
+
+    def __getitem__(self, index):
+        return self.rgb[index]
+
+    def __array__(self, dtype=None, copy=None):
+        if dtype is None or np.dtype(dtype) == self.rgb.dtype:
+            return self.rgb.copy() if copy else self.rgb
+        return self.rgb.astype(dtype)
+
+    @classmethod
+    def from_bytes(cls, data, name=""):
+        if len(data) < ACT_BYTE_SIZE:
+            raise ValueError(
+                f"ACT palette needs {ACT_BYTE_SIZE} bytes, got {len(data)}"
+            )
+        return cls(np.frombuffer(data, dtype=np.uint8, count=ACT_BYTE_SIZE), name)
+
+
+# Loaded palettes: resolved path -> (mtime_ns, size, ActPalette)
+_act_file_cache = {}
+# Built-in palettes by name
+_builtin_cache = {}
+# Palette search results: resolved directory ->
+# (((walked directory, mtime_ns), ...), ACT path or None)
+_act_search_cache = {}
+
+
+def load_act_palette(path):
+    """
+    Load a .act file, reusing the cached palette while its mtime and size
+    are unchanged. Returns an ActPalette or None.
+    """
+    path = os.path.realpath(os.fspath(path))
+    try:
+        stat = os.stat(path)
+    except OSError as e:
+        print(f"[BZ ACT] Failed to read palette file '{path}': {e}")
+        return None
+
+    cached = _act_file_cache.get(path)
+    if cached is not None and cached[:2] == (stat.st_mtime_ns, stat.st_size):
+        return cached[2]
+
+    # Battlezone .act files are exactly 256 * 3 bytes (RGB, no alpha).
+    if stat.st_size != ACT_BYTE_SIZE:
+        print(
+            f"[BZ ACT] Unexpected palette size {stat.st_size} (expected 768 bytes) in '{path}'."
+        )
+        return None
+
+    try:
+        with open(path, "rb") as f:
+            palette = ActPalette.from_bytes(f.read(), os.path.basename(path))
+    except (OSError, ValueError) as e:
+        print(f"[BZ ACT] Failed to read palette file '{path}': {e}")
+        return None
+
+    _act_file_cache[path] = (stat.st_mtime_ns, stat.st_size, palette)
+    return palette
+
+
+def builtin_palette(name):
+    """Return the built-in palette baked into the add-on, or None."""
+    palette = _builtin_cache.get(name)
+    if palette is None and name in BUILTIN_ACT_PALETTES:
+        palette = ActPalette(BUILTIN_ACT_PALETTES[name], name)
+        _builtin_cache[name] = palette
+    return palette
+
+
+def _find_act_file(start_dir):
+    """
+    Very simple search for any .act file under start_dir.
+    Only used if we don't have a forced/built-in palette name.
+    """
+    start_dir = os.path.realpath(os.fspath(start_dir))
+    cached = _act_search_cache.get(start_dir)
+    if cached is not None and _walked_dirs_unchanged(cached[0]):
+        return cached[1]
+
+    walked = []
+    found = None
+    for root, dirs, files in os.walk(start_dir):
+        try:
+            walked.append((root, os.stat(root).st_mtime_ns))
+        except OSError:
+            continue
+        for fname in files:
+            if fname.lower().endswith(".act"):
+                found = os.path.join(root, fname)
+                break
+        if found:
+            break
+    if not walked:
+        return None
+    _act_search_cache[start_dir] = (tuple(walked), found)
+    return found
+
+
+def _walked_dirs_unchanged(walked):
+    # Adding, removing or renaming an entry bumps its directory's mtime, so
+    # matching mtimes for every directory the search visited means the walk
+    # would reach the same result.
+    for root, mtime_ns in walked:
+        try:
+            if os.stat(root).st_mtime_ns != mtime_ns:
+                return False
+        except OSError:
+            return False
+    return True
+
+
+def get_palette_for_dir(start_dir):
+    """
+    Get the ActPalette to use for indexed maps in the given directory.
+
+    Preference order:
+      1) Forced built-in palette name (BZ_FORCE_ACT_NAME) if present.
+      2) Forced built-in name + ACT file in addon 'data' folder (optional).
+      3) Any .act under start_dir (use built-in data if we have it, or load file).
+    """
+    # 1) Forced built-in palette by name
+    if BZ_FORCE_ACT_NAME:
+        name = BZ_FORCE_ACT_NAME
+        palette = builtin_palette(name)
+        if palette is not None:
+            return palette
+
+        # Optional: if you *also* ship a binary .act in addon/data, you can still load it:
+        forced_path = os.path.join(os.path.dirname(__file__), "data", name)
+        if os.path.exists(forced_path):
+            palette = load_act_palette(forced_path)
+            if palette is not None:
+                return palette
+
+    # 2) No forced name or it failed: look for any .act near the map
+    act_path = _find_act_file(start_dir)
+    if not act_path:
+        print(f"[BZ ACT] No .act palette found near '{start_dir}'.")
+        return None
+
+    # If we have built-in data for this filename, use it instead of reading from disk
+    palette = builtin_palette(os.path.basename(act_path))
+    if palette is not None:
+        return palette
+
+    # Otherwise, load from the .act file on disk
+    return load_act_palette(act_path)
+
+
+def resolve_palette(act_path=None, map_dir=None):
+    """
+    Palette for decoding INDEXED maps: an explicit .act path (CLI / config /
+    porter settings) wins, otherwise the directory lookup used on import.
+    """
+    if act_path:
+        palette = load_act_palette(act_path)
+        if palette is not None:
+            return palette
+    if map_dir:
+        return get_palette_for_dir(map_dir)
+    return None
@@ -7,7 +7,7 @@ from typing import Any
 # under the terms of the GNU General Public License v3.0.
 # See the LICENSE file or <https://www.gnu.org/licenses/>.
 
-import struct
+import numpy as np
 
 
 class BZActSerializer:
@@ -15,9 +15,10 @@ class BZActSerializer:
         self.endian = "little"
 
     def deserialize(self, stream):
-        f = "<3B" if self.endian == "little" else ">3B"
-        return [list(struct.unpack(f, stream.read(3))) for i in range(256)]
+        data = stream.read(256 * 3)
+        if len(data) < 256 * 3:
+            raise EOFError()
+        return np.frombuffer(data, dtype=np.uint8).reshape(256, 3).tolist()
 
     def serialize(self, stream, palatte):
-        for i in range(256):
-            stream.write(struct.unpack_from(f, palatte[i]))
+        stream.write(np.asarray(palatte, dtype=np.uint8).reshape(256, 3).tobytes())
@@ -0,0 +1,595 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+NumPy pixel decoding and encoding for Battlezone .map textures, plus the
+small PNG encoder / decoder used for texture caches and porter input.
+
+Shared by the Blender importer (float32 pixels for Image.pixels) and the
+Redux porter (RGBA8 bytes for PNG/DDS output). Every decoder returns a
+top-down (height, width, 4) array and ignores any row padding past
+width * bpp bytes.
+"""
+
+import struct
+import time
+import zlib
+
+import numpy as np
+
+from .bzmap import BZMap, BZMapFormat
+
+# 16-bit formats are decoded with a 65536-entry lookup table per format,
+# built on first use.
+_rgba8_lut_cache = {}
+_float_lut_cache = {}
+
+# (shift, bit count) for R, G, B, A; a bit count of 0 means "always opaque".
+_PACKED16_LAYOUT = {
+    BZMapFormat.ARGB4444: ((8, 4), (4, 4), (0, 4), (12, 4)),
+    BZMapFormat.RGB565: ((11, 5), (5, 6), (0, 5), (0, 0)),
+}
+
+FORMAT_NAMES = {
+    BZMapFormat.INDEXED: "INDEXED",
+    BZMapFormat.ARGB4444: "ARGB4444",
+    BZMapFormat.RGB565: "RGB565",
+    BZMapFormat.ARGB8888: "ARGB8888",
+    BZMapFormat.XRGB8888: "XRGB8888",
+}
+
+
+def _packed16_channels(pixel_format):
+    """Return (channels, maxima) for every 16-bit value of pixel_format."""
+    values = np.arange(65536, dtype=np.uint32)
+    channels = np.empty((65536, 4), dtype=np.uint32)
+    maxima = np.empty(4, dtype=np.uint32)
+    for channel, (shift, bits) in enumerate(_PACKED16_LAYOUT[pixel_format]):
+        if bits:
+            maxima[channel] = (1 << bits) - 1
+            channels[:, channel] = (values >> shift) & maxima[channel]
+        else:
+            maxima[channel] = 1
+            channels[:, channel] = 1
+    return channels, maxima
+
+
+def packed16_lut(pixel_format, as_float=False):
+    """Lookup table mapping a packed 16-bit pixel to RGBA8 or float RGBA."""
+    cache = _float_lut_cache if as_float else _rgba8_lut_cache
+    lut = cache.get(pixel_format)
+    if lut is None:
+        channels, maxima = _packed16_channels(pixel_format)
+        if as_float:
+            lut = (channels / maxima).astype(np.float32)
+        else:
+            lut = (channels * 255 // maxima).astype(np.uint8)
+        cache[pixel_format] = lut
+    return lut
+
+
+def palette_lut(palette, as_float=False):
+    """
+    Expand a 256-entry RGB palette to an RGBA table (alpha opaque).
+
+    ActPalette instances supply their precomputed tables. A missing or short
+    palette falls back to a grayscale ramp so indexed maps still show
+    something recognisable.
+    """
+    table = getattr(palette, "rgba_float" if as_float else "rgba8", None)
+    if table is not None:
+        return table
+    table = np.empty((256, 4), dtype=np.uint8)
+    table[:, 3] = 255
+    if palette is not None and len(palette) >= 256:
+        table[:, :3] = np.asarray(palette, dtype=np.uint8).reshape(-1, 3)[:256]
+    else:
+        table[:, :3] = np.arange(256, dtype=np.uint8)[:, None]
+    if as_float:
+        return table.astype(np.float32) / 255.0
+    return table
+
+
+def _gather(lut, indices):
+    """lut[indices] with each RGBA entry moved as one 4- or 16-byte item."""
+    item = np.dtype((np.void, lut.dtype.itemsize * 4))
+    flat = np.ascontiguousarray(lut).view(item).reshape(-1)
+    return flat[indices].view(lut.dtype).reshape(indices.shape + (4,))
+
+
+def pixel_rows(buffer, pixel_format, width, height, row_bytes=None):
+    """
+    View the raw pixel bytes as (height, width * bpp), dropping row padding.
+    """
+    bpp = BZMapFormat.bpp[pixel_format]
+    if row_bytes is None:
+        row_bytes = width * bpp
+    if row_bytes < width * bpp:
+        raise ValueError(
+            f"Row size {row_bytes} is smaller than {width} pixels of {bpp} bytes"
+        )
+    data = np.frombuffer(buffer, dtype=np.uint8)
+    if data.size < row_bytes * height:
+        raise ValueError(
+            f"Pixel buffer too small: {data.size} bytes, expected {row_bytes * height}"
+        )
+    return data[: row_bytes * height].reshape(height, row_bytes)[:, : width * bpp]
+
+
+def decode_pixels(
+    buffer, pixel_format, width, height, row_bytes=None, palette=None, as_float=False
+):
+    """
+    Decode a .map pixel buffer to a top-down (height, width, 4) RGBA array.
+
+    Returns uint8 by default, or float32 in 0..1 when as_float is set.
+    palette is only used for INDEXED maps (256 x RGB, 0..255).
+    """
+    if pixel_format not in FORMAT_NAMES:
+        raise ValueError(f"Unknown BZMapFormat {pixel_format}")
+
+    rows = pixel_rows(buffer, pixel_format, width, height, row_bytes)
+
+    if pixel_format == BZMapFormat.INDEXED:
+        return _gather(palette_lut(palette, as_float), rows)
+
+    if pixel_format in _PACKED16_LAYOUT:
+        packed = np.ascontiguousarray(rows).view("<u2")
+        return _gather(packed16_lut(pixel_format, as_float), packed)
+
+    # ARGB8888 / XRGB8888 are stored as BGRA bytes.
+    bgra = rows.reshape(height, width, 4)
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    rgba[..., 0] = bgra[..., 2]
+    rgba[..., 1] = bgra[..., 1]
+    rgba[..., 2] = bgra[..., 0]
+    if pixel_format == BZMapFormat.XRGB8888:
+        rgba[..., 3] = 255
+    else:
+        rgba[..., 3] = bgra[..., 3]
+    if as_float:
+        rgba = rgba.astype(np.float32)
+        rgba *= np.float32(1.0 / 255.0)
+    return rgba
+
+
+def decode_bzmap(bzmap, palette=None, as_float=False):
+    """Decode a BZMap instance; see decode_pixels."""
+    buffer = bzmap.get_buffer()
+    if buffer is None:
+        raise ValueError("BZMap has no pixel buffer")
+    width, height = bzmap.get_size()
+    return decode_pixels(
+        buffer,
+        bzmap.pixel_format,
+        width,
+        height,
+        bzmap.row_byte_size,
+        palette=palette,
+        as_float=as_float,
+    )
+
+
+def _quantize(channel, bits):
+    """Round 0..255 values to the nearest of 2**bits evenly spaced levels."""
+    top = (1 << bits) - 1
+    return (channel.astype(np.uint32) * top + 127) // 255
+
+
+def nearest_palette_indices(rgb, palette):
+    """
+    Map (..., 3) uint8 colours to the index of the closest palette entry.
+
+    Distances are computed once per distinct colour, so photographic
+    textures cost about as much as flat ones of the same colour count.
+    """
+    table = palette_lut(palette)[:, :3].astype(np.float64)
+    rgb = np.asarray(rgb, dtype=np.uint8)
+    packed = (
+        rgb[..., 0].astype(np.uint32) << 16
+        | rgb[..., 1].astype(np.uint32) << 8
+        | rgb[..., 2]
+    )
+    colors, inverse = np.unique(packed.ravel(), return_inverse=True)
+    unique_rgb = np.stack(
+        ((colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF), axis=1
+    ).astype(np.float64)
+
+    # |c - p|^2 = |c|^2 - 2 c.p + |p|^2; |c|^2 does not change the argmin.
+    table_norm = (table**2).sum(axis=1)
+    indices = np.empty(len(colors), dtype=np.uint8)
+    for start in range(0, len(colors), 65536):
+        chunk = unique_rgb[start : start + 65536]
+        dist = table_norm - 2.0 * (chunk @ table.T)
+        indices[start : start + 65536] = dist.argmin(axis=1)
+    return indices[inverse].reshape(packed.shape)
+
+
+def median_cut_palette(images, count=256):
+    """
+    Build a count-colour RGB palette (count x 3 uint8) with median cut.
+
+    images is an iterable of (..., 3 or 4) uint8 arrays; all of them share
+    the palette. The box with the widest channel range, weighted by pixel
+    count, is split at its median until there are count boxes. Unused
+    entries are black.
+    """
+    packed = []
+    for image in images:
+        rgb = np.asarray(image, dtype=np.uint8)[..., :3].reshape(-1, 3)
+        packed.append(
+            rgb[:, 0].astype(np.uint32) << 16
+            | rgb[:, 1].astype(np.uint32) << 8
+            | rgb[:, 2]
+        )
+    colors, weights = np.unique(np.concatenate(packed), return_counts=True)
+    rgb = np.stack(
+        ((colors >> 16) & 0xFF, (colors >> 8) & 0xFF, colors & 0xFF), axis=1
+    ).astype(np.int32)
+
+    def stats(box):
+        # (split priority, axis); single colours cannot be split.
+        if len(box) < 2:
+            return 0, 0
+        ranges = rgb[box].max(axis=0) - rgb[box].min(axis=0)
+        return int(ranges.max()) * int(weights[box].sum()), int(ranges.argmax())
+
+    boxes = [np.arange(len(colors))]
+    box_stats = [stats(boxes[0])]
+    while len(boxes) < count:
+        i = max(range(len(boxes)), key=lambda j: box_stats[j][0])
+        score, axis = box_stats[i]
+        if score == 0:
+            break
+        box = boxes.pop(i)
+        box_stats.pop(i)
+        box = box[np.argsort(rgb[box, axis], kind="stable")]
+        cumulative = np.cumsum(weights[box])
+        split = int(np.searchsorted(cumulative, cumulative[-1] / 2.0)) + 1
+        split = min(max(split, 1), len(box) - 1)
+        for half in (box[:split], box[split:]):
+            boxes.append(half)
+            box_stats.append(stats(half))
+
+    palette = np.zeros((count, 3), dtype=np.uint8)
+    for i, box in enumerate(boxes):
+        mean = (rgb[box] * weights[box, None]).sum(axis=0) / weights[box].sum()
+        palette[i] = np.clip(np.rint(mean), 0, 255)
+    return palette
+
+
+def encode_pixels(rgba, pixel_format, palette=None):
+    """
+    Encode a top-down (height, width, 4) uint8 RGBA array as .map pixels.
+
+    Returns tightly packed rows (no padding). INDEXED output maps every
+    pixel to the nearest colour of palette (256 x RGB) and drops alpha.
+    """
+    if pixel_format not in FORMAT_NAMES:
+        raise ValueError(f"Unknown BZMapFormat {pixel_format}")
+    rgba = np.asarray(rgba, dtype=np.uint8)
+    if rgba.ndim != 3 or rgba.shape[2] != 4:
+        raise ValueError(f"Expected (height, width, 4) RGBA pixels, got {rgba.shape}")
+
+    if pixel_format == BZMapFormat.INDEXED:
+        if palette is None:
+            raise ValueError("INDEXED output needs an ACT palette")
+        return nearest_palette_indices(rgba[..., :3], palette).tobytes()
+
+    if pixel_format in _PACKED16_LAYOUT:
+        packed = np.zeros(rgba.shape[:2], dtype=np.uint32)
+        for channel, (shift, bits) in enumerate(_PACKED16_LAYOUT[pixel_format]):
+            if bits:
+                packed |= _quantize(rgba[..., channel], bits) << shift
+        return packed.astype("<u2").tobytes()
+
+    bgra = rgba[..., [2, 1, 0, 3]]
+    if pixel_format == BZMapFormat.XRGB8888:
+        bgra[..., 3] = 255
+    return np.ascontiguousarray(bgra).tobytes()
+
+
+def encode_bzmap(rgba, pixel_format, palette=None):
+    """Build a BZMap from a top-down RGBA8 array; see encode_pixels."""
+    rgba = np.asarray(rgba, dtype=np.uint8)
+    height, width = rgba.shape[:2]
+    bzmap = BZMap()
+    bzmap.pixel_format = pixel_format
+    bzmap.set_size(width, height)
+    bzmap.set_buffer(encode_pixels(rgba, pixel_format, palette))
+    return bzmap
+
+
+def blender_pixels(rgba):
+    """
+    Flatten a top-down RGBA array into the bottom-up float32 layout that
+    bpy Image.pixels.foreach_set expects.
+    """
+    if rgba.dtype != np.float32:
+        rgba = rgba.astype(np.float32) / 255.0
+    return np.ascontiguousarray(rgba[::-1]).ravel()
+
+
+def rgba_from_blender_pixels(pixels, width, height, channels=4):
+    """
+    Inverse of blender_pixels: turn bottom-up float Image.pixels data into
+    a top-down (height, width, 4) uint8 array. One-channel images become
+    gray; missing alpha is opaque.
+    """
+    pixels = np.asarray(pixels, dtype=np.float32).reshape(height, width, channels)
+    values = np.clip(pixels[::-1] * 255.0 + 0.5, 0, 255).astype(np.uint8)
+    if channels == 4:
+        return values
+    rgba = np.full((height, width, 4), 255, dtype=np.uint8)
+    if channels == 1:
+        rgba[..., :3] = values
+    else:
+        rgba[..., :channels] = values[..., :4]
+    return rgba
+
+
+def _png_chunk(tag, payload):
+    return (
+        struct.pack(">I", len(payload))
+        + tag
+        + payload
+        + struct.pack(">I", zlib.crc32(tag + payload) & 0xFFFFFFFF)
+    )
+
+
+def encode_png(pixels, compress_level=1):
+    """
+    Encode a top-down (height, width, 3 or 4) uint8 array as PNG bytes.
+
+    Every scanline uses filter type 0; the filter bytes are inserted as an
+    extra leading column so the whole image is built in one array. Level 1
+    is the default because cache PNGs are written far more often than they
+    are shipped.
+    """
+    pixels = np.asarray(pixels, dtype=np.uint8)
+    height, width, channels = pixels.shape
+    if channels not in (3, 4):
+        raise ValueError(f"Expected RGB or RGBA pixels, got {channels} channels")
+
+    scanlines = np.zeros((height, width * channels + 1), dtype=np.uint8)
+    scanlines[:, 1:] = pixels.reshape(height, width * channels)
+
+    color_type = 6 if channels == 4 else 2
+    ihdr = struct.pack(">IIBBBBB", width, height, 8, color_type, 0, 0, 0)
+    return b"".join(
+        (
+            b"\x89PNG\r\n\x1a\n",
+            _png_chunk(b"IHDR", ihdr),
+            _png_chunk(b"IDAT", zlib.compress(scanlines.tobytes(), compress_level)),
+            _png_chunk(b"IEND", b""),
+        )
+    )
+
+
+_PNG_SIGNATURE = b"\x89PNG\r\n\x1a\n"
+
+# Samples per pixel for each 8-bit PNG colour type.
+_PNG_CHANNELS = {0: 1, 2: 3, 3: 1, 4: 2, 6: 4}
+
+
+def _read_png_chunks(data):
+    """Return (IHDR fields, PLTE, tRNS, concatenated IDAT) from PNG bytes."""
+    if data[:8] != _PNG_SIGNATURE:
+        raise ValueError("Not a PNG file")
+    header = None
+    plte = None
+    trns = None
+    idat = []
+    offset = 8
+    while offset + 8 <= len(data):
+        length, tag = struct.unpack_from(">I4s", data, offset)
+        payload = data[offset + 8 : offset + 8 + length]
+        if len(payload) != length:
+            raise ValueError("Truncated PNG chunk")
+        offset += 12 + length
+        if tag == b"IHDR":
+            header = struct.unpack(">IIBBBBB", payload)
+        elif tag == b"PLTE":
+            plte = payload
+        elif tag == b"tRNS":
+            trns = payload
+        elif tag == b"IDAT":
+            idat.append(payload)
+        elif tag == b"IEND":
+            break
+    if header is None or not idat:
+        raise ValueError("PNG is missing IHDR or IDAT")
+    return header, plte, trns, b"".join(idat)
+
+
+def _paeth(a, b, c):
+    bc = b - c
+    ac = a - c
+    pa = np.abs(bc)
+    pb = np.abs(ac)
+    pc = np.abs(ac + bc)
+    return np.where((pa <= pb) & (pa <= pc), a, np.where(pb <= pc, b, c))
+
+
+def _predict(kind, a, b, c):
+    if kind == 1:
+        return a
+    if kind == 2:
+        return b
+    if kind == 3:
+        return (a + b) >> 1
+    if kind == 4:
+        return _paeth(a, b, c)
+    return 0
+
+
+def _unfilter_wavefront(raw, filters, prior):
+    """
+    Undo any mix of PNG filters on raw (rows, width, bpp) int16 samples.
+
+    Average and Paeth depend on the left, upper and upper-left pixels, so
+    the rows are skewed (row i shifted right by i) and reconstructed one
+    anti-diagonal at a time; every step is vectorized over all rows.
+    """
+    rows, width, bpp = raw.shape
+    skew = np.zeros((width + rows + 1, rows + 1, bpp), dtype=np.int16)
+    skew[np.arange(width), 0] = prior
+    row_index = np.arange(1, rows + 1)
+    skew[row_index[:, None] + np.arange(width), row_index[:, None]] = raw
+    # Encoders often use one filter (usually Paeth) for the whole image.
+    uniform = int(filters[0]) if (filters == filters[0]).all() else None
+    filters = np.concatenate(([0], filters)).astype(np.int16)[:, None]
+
+    for t in range(1, width + rows):
+        lo = max(1, t - width + 1)
+        hi = min(rows, t) + 1
+        a = skew[t - 1, lo:hi]
+        b = skew[t - 1, lo - 1 : hi - 1]
+        c = skew[t - 2, lo - 1 : hi - 1] if t >= 2 else np.zeros_like(b)
+        if uniform is not None:
+            predicted = _predict(uniform, a, b, c)
+        else:
+            f = filters[lo:hi]
+            predicted = np.select(
+                [f == kind for kind in (1, 2, 3, 4)],
+                [_predict(kind, a, b, c) for kind in (1, 2, 3, 4)],
+                0,
+            )
+        skew[t, lo:hi] = (skew[t, lo:hi] + predicted) & 0xFF
+
+    return skew[row_index[:, None] + np.arange(width), row_index[:, None]]
+
+
+def _unfilter(scanlines, width, bpp):
+    """Reconstruct (height, width * bpp) uint8 samples from PNG scanlines."""
+    height = scanlines.shape[0]
+    filters = scanlines[:, 0]
+    if (filters > 4).any():
+        raise ValueError("Invalid PNG filter type")
+    rows = scanlines[:, 1:]
+    out = np.empty((height, width * bpp), dtype=np.uint8)
+    previous = np.zeros(width * bpp, dtype=np.uint8)
+
+    # None / Sub / Up rows only need the row above, so decode them row by
+    # row until the first Average or Paeth row.
+    slow = np.flatnonzero(filters >= 3)
+    fast_rows = slow[0] if slow.size else height
+    for y in range(fast_rows):
+        row = rows[y]
+        if filters[y] == 1:
+            row = np.cumsum(row.reshape(width, bpp), axis=0, dtype=np.uint8).ravel()
+        elif filters[y] == 2:
+            row = row + previous
+        out[y] = row
+        previous = out[y]
+
+    if fast_rows < height:
+        out[fast_rows:] = _unfilter_wavefront(
+            rows[fast_rows:].reshape(-1, width, bpp).astype(np.int16),
+            filters[fast_rows:],
+            previous.reshape(width, bpp),
+        ).reshape(height - fast_rows, width * bpp)
+    return out
+
+
+def decode_png(data):
+    """
+    Decode PNG bytes to a top-down (height, width, 4) uint8 RGBA array.
+
+    Handles non-interlaced 8-bit grayscale, RGB, palette, gray+alpha and
+    RGBA images, including tRNS transparency. Raises ValueError for
+    anything else so callers can fall back to another loader.
+    """
+    header, plte, trns, idat = _read_png_chunks(data)
+    width, height, bit_depth, color_type, _, _, interlace = header
+    if bit_depth != 8 or color_type not in _PNG_CHANNELS:
+        raise ValueError(
+            f"Unsupported PNG: bit depth {bit_depth}, colour type {color_type}"
+        )
+    if interlace:
+        raise ValueError("Interlaced PNGs are not supported")
+
+    bpp = _PNG_CHANNELS[color_type]
+    try:
+        inflated = zlib.decompress(idat)
+    except zlib.error as exc:
+        raise ValueError(f"Corrupt PNG image data: {exc}") from exc
+    stride = width * bpp + 1
+    if len(inflated) < stride * height:
+        raise ValueError("PNG image data is truncated")
+    scanlines = np.frombuffer(inflated, dtype=np.uint8)[: stride * height]
+    samples = _unfilter(scanlines.reshape(height, stride), width, bpp)
+    samples = samples.reshape(height, width, bpp)
+
+    if color_type == 3:
+        if plte is None:
+            raise ValueError("Palette PNG has no PLTE chunk")
+        table = np.full((256, 4), 255, dtype=np.uint8)
+        table[:, :3] = 0
+        entries = np.frombuffer(plte, dtype=np.uint8)[: 256 * 3].reshape(-1, 3)
+        table[: len(entries), :3] = entries
+        if trns:
+            alpha = np.frombuffer(trns, dtype=np.uint8)[:256]
+            table[: len(alpha), 3] = alpha
+        return _gather(table, samples[:, :, 0])
+
+    if color_type == 6:
+        return np.ascontiguousarray(samples)
+
+    rgba = np.empty((height, width, 4), dtype=np.uint8)
+    if color_type == 2:
+        rgba[:, :, :3] = samples
+    else:
+        rgba[:, :, :3] = samples[:, :, :1]
+    if color_type == 4:
+        rgba[:, :, 3] = samples[:, :, 1]
+    else:
+        rgba[:, :, 3] = 255
+        # tRNS on gray / RGB images names one fully transparent colour.
+        if trns and len(trns) >= 2 * bpp:
+            key = np.frombuffer(trns, dtype=">u2")[:bpp].astype(np.uint8)
+            rgba[(samples == key).all(axis=2), 3] = 0
+    return rgba
+
+
+def has_alpha(pixel_format):
+    return pixel_format in (BZMapFormat.ARGB4444, BZMapFormat.ARGB8888)
+
+
+def benchmark_decoders(width=1024, height=1024, repeat=5, seed=0):
+    """
+    Time decode_pixels for every format on random data.
+
+    Returns {format name: {"rgba8": Mpx/s, "float": Mpx/s}}.
+    """
+    rng = np.random.default_rng(seed)
+    palette = rng.integers(0, 256, size=(256, 3), dtype=np.uint8)
+    results = {}
+    for pixel_format, name in FORMAT_NAMES.items():
+        row_bytes = width * BZMapFormat.bpp[pixel_format]
+        buffer = rng.integers(0, 256, size=row_bytes * height, dtype=np.uint8)
+        buffer = buffer.tobytes()
+
+        # Warm the lookup tables so they are not part of the timing.
+        decode_pixels(buffer, pixel_format, width, height, row_bytes, palette)
+        decode_pixels(buffer, pixel_format, width, height, row_bytes, palette, True)
+
+        timings = {}
+        for label, as_float in (("rgba8", False), ("float", True)):
+            best = None
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                decode_pixels(
+                    buffer, pixel_format, width, height, row_bytes, palette, as_float
+                )
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            timings[label] = (width * height) / max(best, 1e-9) / 1e6
+        results[name] = timings
+    return results
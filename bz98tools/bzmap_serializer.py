@@ -28,10 +28,10 @@ class BZMapSerializer:
         return int.from_bytes(b, self.endian)
 
     def serialize(self, stream, bzmap):
-        self.write_ushort(bzmap.row_byte_size)
-        self.write_ushort(bzmap.pixel_format)
-        self.write_ushort(bzmap.height)
-        self.write_ushort(bzmap._unknown)
+        self.write_ushort(stream, bzmap.row_byte_size)
+        self.write_ushort(stream, bzmap.pixel_format)
+        self.write_ushort(stream, bzmap.height)
+        self.write_ushort(stream, bzmap._unknown)
         stream.write(bzmap.buffer[: bzmap.get_byte_count()])
 
     def write_ushort(self, stream, val):
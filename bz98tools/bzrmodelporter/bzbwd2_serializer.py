@@ -21,6 +21,10 @@ from typing import Any
 # 1.5 will display "Bad BWD revision for file %s"
 
 import itertools
+
+import numpy as np
+
+from .. import bwd2_index
 from .bzbwd2 import (
     VDF,
     SDF,
@@ -41,12 +45,28 @@ from .baseserializer import (
     FLOAT_SIZE,
     AbruptEOFError,
 )
+from .spacial import (
+    Vector3,
+    Quaternion,
+    Transform,
+)
 
 CHUNK_HEADER_SIZE = 4 + UINT_SIZE
 
 START_OF_STREAM = 0
 CURRENT_STREAM_POSITION = 1
 
+UINT_MASK = 0xFFFFFFFF
+
+
+def _decode_string(raw):
+    return raw.partition(b"\0")[0].decode("latin-1")
+
+
+def _rows(records):
+    """Structured records as tuples of Python values, sub-arrays as lists."""
+    return zip(*(records[name].tolist() for name in records.dtype.names))
+
 
 class BWD2BaseSerializer(BZBaseSerializer):
     def __init__(self, stream, endian="little"):
@@ -71,6 +91,43 @@ class BWD2BaseSerializer(BZBaseSerializer):
             self.current_chunk_addr + self.current_chunk_size, START_OF_STREAM
         )
 
+    def read_records(self, dtype, count):
+        """Read count fixed-size records as one structured array."""
+        return np.frombuffer(self.read_raw(count * dtype.itemsize), dtype, count)
+
+    def create_geo_objects(self, bwd2, geo_class, geo_count, records):
+        """Create bwd2's GEO objects from SDF_GEO_DTYPE slot records."""
+        slots = itertools.product(
+            range(geo_class.LOD.COUNT), range(geo_class.REP.COUNT), range(geo_count)
+        )
+        for (lod, rep, index), record in zip(slots, _rows(records)):
+            (
+                name,
+                transform,
+                parent,
+                center_pos,
+                radius,
+                half_size,
+                class_id,
+                object_flags,
+                ddr,
+                target,
+                time,
+            ) = record
+            geo_object = bwd2.create_geo_object(
+                lod, rep, index, _decode_string(name), _decode_string(parent)
+            )
+            geo_object.transform = Transform.from_array_rufp_xyz(transform)
+            geo_object.center_pos = Vector3.from_array_ruf(center_pos)
+            geo_object.radius = radius
+            geo_object.half_size = Vector3.from_array_ruf(half_size)
+            geo_object.class_id = class_id & UINT_MASK
+            geo_object.object_flags = object_flags & UINT_MASK
+            geo_object.ddr = ddr & UINT_MASK  # ddr, unknown type (what is this?)
+            # When the object is a spinner, this is the angular velocity divided by 2*pi
+            geo_object.target = Vector3.from_array_ruf(target)
+            geo_object.time = time  # Purpose unknown. Maybe an I76 holdover?
+
     # -#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#
     # -# Read Methods
 
@@ -90,44 +147,51 @@ class BWD2BaseSerializer(BZBaseSerializer):
         anim_obj._entity = self.read_uint()
 
         # List of animations
-        for i in range(animation_count):
-            index = self.read_uint()
-            animation = anim_obj.create_animation(index)
-            animation.mesh_index_list[:] = self.read_uint_array(32)
-            animation.start = self.read_uint()
-            animation.length = self.read_sint()
-            animation.loop = self.read_uint()
-            animation.speed = self.read_float()
+        elements = self.read_records(bwd2_index.ANIM_ELEMENT_DTYPE, animation_count)
+        for index, mesh_mask, start, length, loop, speed in _rows(elements):
+            animation = anim_obj.create_animation(index & UINT_MASK)
+            animation.mesh_index_list[:] = [value & UINT_MASK for value in mesh_mask]
+            animation.start = start & UINT_MASK
+            animation.length = length
+            animation.loop = loop & UINT_MASK
+            animation.speed = speed
 
         # List of animation meshes
-        for i in range(mesh_count):
-            name = self.read_string(8)
-            anim_mesh = anim_obj.create_animation_mesh(name)
-            anim_mesh.flags = self.read_uint()
-            anim_mesh.inverse_transform = self.read_transform()
-            anim_mesh.frame_transform = self.read_transform()
-            anim_mesh.orientation_start = self.read_uint()
-            anim_mesh.orientation_length = self.read_uint()
-            anim_mesh.scale_start = self.read_uint()
-            anim_mesh.scale_length = self.read_uint()
-            anim_mesh.position_start = self.read_uint()
-            anim_mesh.position_length = self.read_uint()
+        meshes = self.read_records(bwd2_index.ANIM_ORIENTATION_DTYPE, mesh_count)
+        for record in _rows(meshes):
+            anim_mesh = anim_obj.create_animation_mesh(_decode_string(record[0]))
+            anim_mesh.flags = record[1] & UINT_MASK
+            anim_mesh.inverse_transform = Transform.from_array_rufp_xyz(record[2])
+            anim_mesh.frame_transform = Transform.from_array_rufp_xyz(record[3])
+            (
+                anim_mesh.orientation_start,
+                anim_mesh.orientation_length,
+                anim_mesh.scale_start,
+                anim_mesh.scale_length,
+                anim_mesh.position_start,
+                anim_mesh.position_length,
+            ) = [value & UINT_MASK for value in record[4:]]
 
         # Lists of keyframes
-        for i in range(orientation_keyframe_count):
-            frame = self.read_uint()
-            orientation = self.read_quaternion()
-            anim_obj.create_orientation_keyframe(frame, orientation)
+        keys = self.read_records(
+            bwd2_index.ROTATION_KEY_DTYPE, orientation_keyframe_count
+        )
+        for frame, orientation in _rows(keys):
+            anim_obj.create_orientation_keyframe(
+                frame & UINT_MASK, Quaternion.from_array_sruf_right(orientation)
+            )
 
-        for i in range(scale_keyframe_count):
-            frame = self.read_uint()
-            scale = self.read_vector3()
-            anim_obj.create_scale_keyframe(frame, scale)
+        keys = self.read_records(bwd2_index.VECTOR_KEY_DTYPE, scale_keyframe_count)
+        for frame, scale in _rows(keys):
+            anim_obj.create_scale_keyframe(
+                frame & UINT_MASK, Vector3.from_array_ruf(scale)
+            )
 
-        for i in range(position_keyframe_count):
-            frame = self.read_uint()
-            position = self.read_vector3()
-            anim_obj.create_position_keyframe(frame, position)
+        keys = self.read_records(bwd2_index.VECTOR_KEY_DTYPE, position_keyframe_count)
+        for frame, position in _rows(keys):
+            anim_obj.create_position_keyframe(
+                frame & UINT_MASK, Vector3.from_array_ruf(position)
+            )
 
         # Chunk validation
         end_addr = self.stream.tell()
@@ -349,34 +413,18 @@ class VDFSerializer(BWD2BaseSerializer):
 
     def read_vgeo(self, vdf):
         geo_count = self.read_uint()
-
-        for lod, rep, index in itertools.product(
-            range(VGEO.LOD.COUNT), range(VGEO.REP.COUNT), range(geo_count)
-        ):
-            name = self.read_string(8)
-            transform = self.read_transform()
-            parent = self.read_string(8)
-
-            geo_object = vdf.create_geo_object(lod, rep, index, name, parent)
-            geo_object.transform = transform
-
-            geo_object.center_pos = self.read_vector3()
-            geo_object.radius = self.read_float()
-            geo_object.half_size = self.read_vector3()
-            geo_object.class_id = self.read_uint()
-            geo_object.object_flags = self.read_uint()
-
-            # # # # # # # # # # # # # # # #
-            geo_object.ddr = self.read_uint()  # ddr, unknown type (what is this?)
-            geo_object.target = (
-                self.read_vector3()
-            )  # When the object is a spinner, this is the angular velocity divided by 2*pi
-            geo_object.time = (
-                self.read_float()
-            )  # Purpose unknown. Maybe an I76 holdover?
-            self.stream.seek(
-                -20, CURRENT_STREAM_POSITION
-            )  # UINT_SIZE + VECTOR3_SIZE + FLOAT_SIZE = 4 + 12 + 4 = 20
+        count = VGEO.LOD.COUNT * VGEO.REP.COUNT * geo_count
+        stride = bwd2_index.VDF_GEO_DTYPE.itemsize
+        data = self.read_raw(count * stride)
+        if count:
+            # Slots are viewed with the SGEO layout at the VGEO stride, so ddr,
+            # target and time come from the 20 bytes after each slot; peek past
+            # the table for the last one.
+            extra = bwd2_index.SDF_GEO_DTYPE.itemsize - stride
+            data += self.read_raw(extra)
+            self.stream.seek(-extra, CURRENT_STREAM_POSITION)
+        records = np.ndarray(count, bwd2_index.SDF_GEO_DTYPE, data, strides=(stride,))
+        self.create_geo_objects(vdf, VGEO, geo_count, records)
 
     def read_vchk(self, vdf):
         pass  # Unknown
@@ -692,29 +740,9 @@ class SDFSerializer(BWD2BaseSerializer):
 
     def read_sgeo(self, sdf):
         geo_count = self.read_uint()
-
-        for lod, rep, index in itertools.product(
-            range(SGEO.LOD.COUNT), range(SGEO.REP.COUNT), range(geo_count)
-        ):
-            name = self.read_string(8)
-            transform = self.read_transform()
-            parent = self.read_string(8)
-
-            geo_object = sdf.create_geo_object(lod, rep, index, name, parent)
-            geo_object.transform = transform
-
-            geo_object.center_pos = self.read_vector3()
-            geo_object.radius = self.read_float()
-            geo_object.half_size = self.read_vector3()
-            geo_object.class_id = self.read_uint()
-            geo_object.object_flags = self.read_uint()
-            geo_object.ddr = self.read_uint()  # ddr, unknown type (what is this?)
-            geo_object.target = (
-                self.read_vector3()
-            )  # When the object is a spinner, this is the angular velocity divided by 2*pi
-            geo_object.time = (
-                self.read_float()
-            )  # Purpose unknown. Maybe an I76 holdover?
+        count = SGEO.LOD.COUNT * SGEO.REP.COUNT * geo_count
+        records = self.read_records(bwd2_index.SDF_GEO_DTYPE, count)
+        self.create_geo_objects(sdf, SGEO, geo_count, records)
 
     # -#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#
     # -# Write Methods
@@ -70,6 +70,7 @@ class Geo:
         self.vertex_normal_buffer = np.empty(0, dtype="<3f")
         self.face_list = []
         self.face_map = {}
+        self.arrays = None  # geo_arrays.GeoArrays, set when read from a file
 
     def create_face(self, index):
         face = Face(index)
@@ -7,13 +7,24 @@ from typing import Any
 # under the terms of the GNU General Public License v3.0.
 # See the LICENSE file or <https://www.gnu.org/licenses/>.
 
+from .. import geo_arrays
 from .bzgeo import (
     Geo,
     GEO_TAG,
 )
+from .baseserializer import AbruptEOFError
 from .bz_baseserializer import (
     BZBaseSerializer,
 )
+from .spacial import (
+    Color3,
+    UV,
+    Vector3,
+)
+
+
+def _decode_texture_name(raw):
+    return raw.partition(b"\0")[0].decode("latin-1")
 
 
 class GeoSerializer(BZBaseSerializer):
@@ -48,32 +59,71 @@ class GeoSerializer(BZBaseSerializer):
         geo._checksum = self.read_sint()
 
     def read_face_list(self, geo, poly_count):
-        for i in range(poly_count):
-            index = self.read_sint()
-            vertex_count = self.read_sint()
-            face = geo.create_face(index)
-            face.color = self.read_color()
-            self.read_surface_plane(face.plane)
-            face.poly_area = self.read_float()
-            face.shade_type = self.read_ubyte()
-            face.texture_type = self.read_ubyte()
-            face.xluscent_type = self.read_ubyte()
-            face.texture_name = self.read_string(13)
-            face.parent_face_index = self.read_sint()
-            face.tree_branch = self.read_uint()
-            self.read_wireframe(face, vertex_count)  # List of FaceNode objects
-
-    def read_surface_plane(self, plane):
-        plane.surface_normal = self.read_vector3()
-        plane.distance = self.read_float()
-
-    def read_wireframe(self, face, vertex_count):
-        for i in range(vertex_count):
-            face_node = face.create_face_node(
-                vertex_index=self.read_sint(),
-                vertex_normal_index=self.read_sint(),
-                uv=self.read_uv(),
+        # The face table is variable-length, so it is parsed into flat arrays
+        # in one pass (see geo_arrays) and the Face objects built from those.
+        start = self.stream.tell() if self.stream.seekable() else None
+        data = self.stream.read()
+        try:
+            faces, nodes, node_offsets, end = geo_arrays.parse_face_table(
+                data, poly_count
             )
+        except ValueError as e:
+            raise AbruptEOFError(str(e)) from e
+        if start is not None and end < len(data):
+            self.stream.seek(start + end)
+
+        arrays = geo_arrays.GeoArrays()
+        arrays.tag = geo._tag
+        arrays.checksum = geo._checksum
+        arrays.name = geo.name.encode("latin-1", errors="ignore")
+        arrays.flags = geo.flags
+        arrays.positions = geo.vertex_pos_buffer
+        arrays.normals = geo.vertex_normal_buffer
+        arrays.faces = faces
+        arrays.nodes = nodes
+        arrays.node_offsets = node_offsets
+        arrays.size = end
+        geo.arrays = arrays
+
+        self.build_face_list(geo, arrays)
+
+    def build_face_list(self, geo, arrays):
+        faces = arrays.faces
+        columns = zip(
+            faces["index"].tolist(),
+            faces["color"].tolist(),
+            faces["plane"].tolist(),
+            faces["poly_area"].tolist(),
+            faces["shade_type"].tolist(),
+            faces["texture_type"].tolist(),
+            faces["xluscent_type"].tolist(),
+            geo_arrays.decode_names(faces["texture_name"], _decode_texture_name),
+            faces["parent"].tolist(),
+            faces["tree_branch"].tolist(),
+        )
+        vertex_indices = arrays.nodes["vertex_index"].tolist()
+        normal_indices = arrays.nodes["normal_index"].tolist()
+        uvs = arrays.nodes["uv"].tolist()
+        node_offsets = arrays.node_offsets.tolist()
+
+        for i, row in enumerate(columns):
+            face = geo.create_face(row[0])
+            face.color = Color3(*row[1])
+            face.plane.surface_normal = Vector3.from_array_ruf(row[2])
+            face.plane.distance = row[2][3]
+            face.poly_area = row[3]
+            face.shade_type = row[4]
+            face.texture_type = row[5]
+            face.xluscent_type = row[6]
+            face.texture_name = row[7]
+            face.parent_face_index = row[8]
+            face.tree_branch = row[9]
+            for k in range(node_offsets[i], node_offsets[i + 1]):
+                face.create_face_node(
+                    vertex_index=vertex_indices[k],
+                    vertex_normal_index=normal_indices[k],
+                    uv=UV(*uvs[k]),
+                )
 
     # -#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#-#
     # -# Write Methods
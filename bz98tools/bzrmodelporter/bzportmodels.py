@@ -16,15 +16,12 @@ from collections import namedtuple
 import traceback
 import numpy as np
 import itertools
+from concurrent.futures import Future, ThreadPoolExecutor, as_completed
 from .utils import remap_range_normal
 
 from pathlib import Path
 
-# Shared palette cache: keys are ("act", act_path) or ("geo", map_dir)
-_color_palette_cache = {}
 
-
-import struct
 from pathlib import Path
 
 # Optional Pillow dependency: only needed for writing DDS textures
@@ -72,7 +69,9 @@ from ..bzmap import (
     BZMapFormat,
 )
 from ..bzmap_serializer import BZMapSerializer
-from ..bzact_serializer import BZActSerializer
+from .. import bzmap_codec
+from .. import dds_codec
+from .. import bzact_palettes
 
 from .ogremesh import (
     Mesh,
@@ -82,6 +81,7 @@ from .ogremesh import (
 from .ogremesh_serializer import MeshSerializer
 from .ogreskeleton import Skeleton
 from .ogreskeleton_serializer import SkeletonSerializer
+from . import texture_atlas
 
 INF = float("inf")
 
@@ -144,6 +144,9 @@ class InterModel:
     flat_name = None
     # flat_igeom_list = None
 
+    atlas_name = None
+    atlas_rgba = None  # Top-down RGBA8 array when textures are atlased
+
     def __init__(self, settings):
         self.settings = settings
         self.igeom_list = []
@@ -1619,26 +1622,12 @@ class InterAnimKeyframe:
         return f"<{self.frame}: {self.translation}, {self.rotation}>"
 
 
-color_palette_map = {}
-
-
 def get_color_palette(asset_resolver):
     act_path = asset_resolver.get_act_path()
     if act_path is None:
         print("No .act filepath provided")
         return None
-    if act_path not in color_palette_map:
-        try:
-            with open(act_path, "rb") as stream:
-                bzact_serializer = BZActSerializer()
-                x = bzact_serializer.deserialize(stream)
-                color_palette_map[act_path] = np.array(x, dtype="B")
-        except OSError:
-            print(f"Failed to read .act palette file {act_path}")
-            print(traceback.format_exc())
-            return None
-
-    return color_palette_map[act_path]
+    return bzact_palettes.load_act_palette(act_path)
 
 
 # Construct the DDS textures
@@ -1647,114 +1636,28 @@ def bzmap_to_pilimage(bzmap, asset_resolver):
     if not HAVE_PIL:
         return None
 
-    width, height = bzmap.get_size()
+    if bzmap.pixel_format not in bzmap_codec.FORMAT_NAMES:
+        raise UnsupportedFileTypeError(f"Unknown BZMapFormat {bzmap.pixel_format}")
 
     # asset_resolver is only used if a color palette is needed
+    color_palette = None
     if bzmap.pixel_format == BZMapFormat.INDEXED:
         color_palette = get_color_palette(asset_resolver)
         if color_palette is None:
             return None
-        ar = np.frombuffer(bzmap.get_buffer(), dtype="B")
-        ar2 = color_palette[ar]
-        ar2.shape = (height, width, 3)
-
-        return Image.fromarray(ar2, mode="RGB")
-
-    elif bzmap.pixel_format == BZMapFormat.ARGB4444:
-        ar = np.frombuffer(bzmap.get_buffer(), dtype="<H")
-        ar.shape = (height, width)
-
-        ar2 = np.zeros((height, width, 4), dtype="B")
-        ar2[:, :, 0] = np.interp(  # Red
-            np.bitwise_and(np.right_shift(ar[:][:], 8), 15),
-            (0, 15),
-            (0, 255),
-        ).astype("B")
-        ar2[:, :, 1] = np.interp(  # Green
-            np.bitwise_and(np.right_shift(ar[:][:], 4), 15),
-            (0, 15),
-            (0, 255),
-        ).astype("B")
-        ar2[:, :, 2] = np.interp(  # Blue
-            np.bitwise_and(ar[:][:], 15),
-            (0, 15),
-            (0, 255),
-        ).astype("B")
-        ar2[:, :, 3] = np.interp(  # Alpha
-            np.bitwise_and(np.right_shift(ar[:][:], 12), 15),
-            (0, 15),
-            (0, 255),
-        ).astype("B")
-
-        return Image.fromarray(ar2, mode="RGBA")
-
-    elif bzmap.pixel_format == BZMapFormat.RGB565:
-        ar = np.frombuffer(bzmap.get_buffer(), dtype="<H")
-        ar.shape = (height, width)
-        ar2 = np.zeros((height, width, 3), dtype="B")
-        ar2[:, :, 0] = np.interp(
-            np.right_shift(ar[:][:], 11), (0, 31), (0, 255)
-        ).astype("B")
-        ar2[:, :, 1] = np.interp(
-            np.bitwise_and(np.right_shift(ar[:][:], 5), 0b111111), (0, 63), (0, 255)
-        ).astype("B")
-        ar2[:, :, 2] = np.interp(
-            np.bitwise_and(ar[:][:], 0b11111), (0, 31), (0, 255)
-        ).astype("B")
-
-        return Image.fromarray(ar2, mode="RGB")
-
-    elif bzmap.pixel_format == BZMapFormat.ARGB8888:
-        ar = np.frombuffer(bzmap.get_buffer(), dtype="B")
-        ar.shape = (height, width, 4)
-        ar = ar[:, :, [2, 1, 0, 3]]
-        return Image.fromarray(ar, mode="RGBA")
-
-    elif bzmap.pixel_format == BZMapFormat.XRGB8888:
-        ar = np.frombuffer(bzmap.get_buffer(), dtype="B")
-        ar.shape = (height, width, 4)
-        ar = ar[:, :, [2, 1, 0]]
-        return Image.fromarray(ar, mode="RGB")
-    else:
-        raise UnsupportedFileTypeError(f"Unknown BZMapFormat {bzmap.pixel_format}")
-
-
-def _get_palette_from_import_geo(map_dir):
-    """
-    Ask import_geo for the palette it would use for this directory,
-    reusing its built-in ACT data and search logic.
-
-    Returns a NumPy array of shape (256, 3) or None.
-    """
-    try:
-        # bzrmodelporter is in a subpackage; '..' goes back to bz98tools
-        from .. import import_geo as _imp
-    except Exception:
-        # Running outside Blender / module unavailable
-        return None
 
-    getter = getattr(_imp, "_get_palette_for_dir", None)
-    if getter is None:
-        return None
-
-    try:
-        pal_list = getter(map_dir)
-        if not pal_list:
-            return None
-        return np.array(pal_list, dtype="B")
-    except Exception:
-        print(f"[bzrmodelporter] Failed to get palette from import_geo for {map_dir}")
-        print(traceback.format_exc())
-        return None
+    rgba = bzmap_codec.decode_bzmap(bzmap, palette=color_palette)
+    if bzmap_codec.has_alpha(bzmap.pixel_format):
+        return Image.fromarray(rgba, mode="RGBA")
+    return Image.fromarray(np.ascontiguousarray(rgba[:, :, :3]), mode="RGB")
 
 
 def _resolve_act_palette(asset_resolver, map_dir=None):
     """
     1) Try explicit ACT path from AssetResolver (CLI / config.cfg / UI).
-    2) If none, fall back to import_geo's ACT / built-in palette logic
+    2) If none, fall back to the importer's ACT / built-in palette logic
        based on the .map's directory.
     """
-    # 1) Explicit ACT path (CLI-style)
     act_path = None
     if asset_resolver is not None:
         try:
@@ -1762,38 +1665,9 @@ def _resolve_act_palette(asset_resolver, map_dir=None):
         except Exception:
             act_path = None
 
-    if act_path:
-        key = ("act", os.fspath(act_path))
-        pal = _color_palette_cache.get(key)
-        if pal is not None:
-            return pal
-
-        try:
-            from ..bzact_serializer import BZActSerializer
-
-            with open(act_path, "rb") as stream:
-                bzact_serializer = BZActSerializer()
-                pal_list = bzact_serializer.deserialize(stream)
-            pal = np.array(pal_list, dtype="B")
-            _color_palette_cache[key] = pal
-            return pal
-        except OSError:
-            print(f"[bzrmodelporter] Failed to read .act palette file {act_path}")
-            print(traceback.format_exc())
-
-    # 2) Fallback: same ACT/palette logic as import_geo (if available)
     if map_dir:
-        key = ("geo", os.fspath(map_dir))
-        pal = _color_palette_cache.get(key)
-        if pal is not None:
-            return pal
-
-        pal = _get_palette_from_import_geo(os.fspath(map_dir))
-        if pal is not None:
-            _color_palette_cache[key] = pal
-            return pal
-
-    return None
+        map_dir = os.fspath(map_dir)
+    return bzact_palettes.resolve_palette(act_path, map_dir)
 
 
 def _bzmap_to_rgba_bytes(map_source, asset_resolver, map_dir=None):
@@ -1837,101 +1711,24 @@ def _bzmap_to_rgba_bytes(map_source, asset_resolver, map_dir=None):
         return None, None, None
 
     pixel_format = bzmap.pixel_format
-    row_bytes = bzmap.row_byte_size
+    if pixel_format not in bzmap_codec.FORMAT_NAMES:
+        raise UnsupportedFileTypeError(f"Unknown BZMapFormat {pixel_format}")
 
     # INDEXED → need palette
+    color_palette = None
     if pixel_format == BZMapFormat.INDEXED:
         color_palette = _resolve_act_palette(asset_resolver, map_dir)
         if color_palette is None:
             print("[bzrmodelporter] No ACT palette available for INDEXED map.")
             return None, None, None
 
-        ar = np.frombuffer(buf, dtype="B")
-        if ar.size < width * height:
-            print(
-                f"[bzrmodelporter] Buffer too small for INDEXED map: "
-                f"{ar.size}, expected {width*height}"
-            )
-            return None, None, None
-
-        ar = ar[: width * height]
-        rgb = color_palette[ar]  # shape (N,3)
-        rgb = rgb.reshape((height, width, 3))
-
-        rgba = np.zeros((height, width, 4), dtype="B")
-        rgba[:, :, :3] = rgb
-        rgba[:, :, 3] = 255
-        return width, height, rgba.tobytes()
-
-    # ARGB4444
-    elif pixel_format == BZMapFormat.ARGB4444:
-        ar = np.frombuffer(buf, dtype="<H")
-        if ar.size < width * height:
-            return None, None, None
-        ar = ar[: width * height].reshape((height, width))
-
-        rgba = np.zeros((height, width, 4), dtype="B")
-        rgba[:, :, 0] = np.interp(
-            np.bitwise_and(np.right_shift(ar, 8), 15), (0, 15), (0, 255)
-        ).astype("B")
-        rgba[:, :, 1] = np.interp(
-            np.bitwise_and(np.right_shift(ar, 4), 15), (0, 15), (0, 255)
-        ).astype("B")
-        rgba[:, :, 2] = np.interp(
-            np.bitwise_and(ar, 15), (0, 15), (0, 255)
-        ).astype("B")
-        rgba[:, :, 3] = np.interp(
-            np.bitwise_and(np.right_shift(ar, 12), 15), (0, 15), (0, 255)
-        ).astype("B")
-
-        return width, height, rgba.tobytes()
-
-    # RGB565
-    elif pixel_format == BZMapFormat.RGB565:
-        ar = np.frombuffer(buf, dtype="<H")
-        if ar.size < width * height:
-            return None, None, None
-        ar = ar[: width * height].reshape((height, width))
-
-        rgba = np.zeros((height, width, 4), dtype="B")
-        rgba[:, :, 0] = np.interp(np.right_shift(ar, 11), (0, 31), (0, 255)).astype("B")
-        rgba[:, :, 1] = np.interp(
-            np.bitwise_and(np.right_shift(ar, 5), 0b111111), (0, 63), (0, 255)
-        ).astype("B")
-        rgba[:, :, 2] = np.interp(
-            np.bitwise_and(ar, 0b11111), (0, 31), (0, 255)
-        ).astype("B")
-        rgba[:, :, 3] = 255
-
-        return width, height, rgba.tobytes()
-
-    # ARGB8888
-    elif pixel_format == BZMapFormat.ARGB8888:
-        ar = np.frombuffer(buf, dtype="B")
-        if ar.size < width * height * 4:
-            return None, None, None
-        rgba = ar[: width * height * 4].reshape((height, width, 4))
-        # BZ layout is likely BGRA (standard Windows 32bpp) but Pillow logic says [2,1,0,3] reorder.
-        # Let's stick to the existing logic reordering BGRA -> RGBA for consistency
-        rgba = rgba[:, :, [2, 1, 0, 3]]
-        return width, height, rgba.tobytes()
-
-    # XRGB8888
-    elif pixel_format == BZMapFormat.XRGB8888:
-        ar = np.frombuffer(buf, dtype="B")
-        if ar.size < width * height * 4:
-            return None, None, None
-        xrgb = ar[: width * height * 4].reshape((height, width, 4))
-        # Reorder BGRX -> RGBA
-        rgba = np.zeros((height, width, 4), dtype="B")
-        rgba[:, :, 0] = xrgb[:, :, 2]
-        rgba[:, :, 1] = xrgb[:, :, 1]
-        rgba[:, :, 2] = xrgb[:, :, 0]
-        rgba[:, :, 3] = 255
-        return width, height, rgba.tobytes()
+    try:
+        rgba = bzmap_codec.decode_bzmap(bzmap, palette=color_palette)
+    except ValueError as exc:
+        print(f"[bzrmodelporter] Failed to decode map: {exc}")
+        return None, None, None
 
-    else:
-        raise UnsupportedFileTypeError(f"Unknown BZMapFormat {pixel_format}")
+    return width, height, rgba.tobytes()
 
 
 def _dds_uncompressed_rgba_bytes(width, height, rgba_bytes):
@@ -1940,68 +1737,14 @@ def _dds_uncompressed_rgba_bytes(width, height, rgba_bytes):
     - width, height: image size
     - rgba_bytes: len == width * height * 4, in RGBA order (R,G,B,A per pixel)
     """
-    # DDS expects A8R8G8B8: little-endian dword = 0xAARRGGBB -> bytes: BB GG RR AA
-    if len(rgba_bytes) != width * height * 4:
-        raise ValueError(
-            f"rgba_bytes has wrong size: {len(rgba_bytes)}; expected {width*height*4}"
-        )
+    return dds_codec.encode_dds(rgba_bytes, width, height)
+
 
-    # Reorder RGBA -> BGRA for A8R8G8B8 layout using numpy for performance
-    rgba_array = np.frombuffer(rgba_bytes, dtype="B").reshape((-1, 4))
-    bgra_array = rgba_array[:, [2, 1, 0, 3]]
-    bgra = bgra_array.tobytes()
-
-    def dword(x):
-        return struct.pack("<I", x)
-
-    flags = 0x00021007  # caps | height | width | pixelformat | pitch
-    pitch = width * 4
-    depth = 0
-    mipmaps = 0
-
-    # Pixel format for uncompressed A8R8G8B8
-    pf_flags = 0x00000041  # DDPF_RGB | DDPF_ALPHAPIXELS
-    pf_fourcc = 0
-    pf_bpp = 32
-    pf_rmask = 0x00FF0000
-    pf_gmask = 0x0000FF00
-    pf_bmask = 0x000000FF
-    pf_amask = 0xFF000000
-
-    caps1 = 0x00001000  # DDSCAPS_TEXTURE
-    caps2 = 0
-    caps3 = 0
-    caps4 = 0
-
-    header = bytearray()
-    header.extend(b"DDS ")
-    header.extend(dword(124))  # dwSize
-    header.extend(dword(flags))  # dwFlags
-    header.extend(dword(height))  # dwHeight
-    header.extend(dword(width))  # dwWidth
-    header.extend(dword(pitch))  # dwPitchOrLinearSize
-    header.extend(dword(depth))  # dwDepth
-    header.extend(dword(mipmaps))  # dwMipMapCount
-    header.extend(b"\0" * (11 * 4))  # dwReserved1[11]
-
-    # DDS_PIXELFORMAT
-    header.extend(dword(32))  # dwSize
-    header.extend(dword(pf_flags))  # dwFlags
-    header.extend(dword(pf_fourcc))  # dwFourCC
-    header.extend(dword(pf_bpp))  # dwRGBBitCount
-    header.extend(dword(pf_rmask))  # dwRBitMask
-    header.extend(dword(pf_gmask))  # dwGBitMask
-    header.extend(dword(pf_bmask))  # dwBBitMask
-    header.extend(dword(pf_amask))  # dwABitMask
-
-    # caps
-    header.extend(dword(caps1))
-    header.extend(dword(caps2))
-    header.extend(dword(caps3))
-    header.extend(dword(caps4))
-    header.extend(dword(0))  # dwReserved2
-
-    return bytes(header) + bytes(bgra)
+def _dds_texture_bytes(width, height, rgba_bytes, dds_format="RGBA", mipmaps=False):
+    """DDS bytes in the requested format (see dds_codec.DDS_FORMATS)."""
+    return dds_codec.encode_dds(
+        rgba_bytes, width, height, dds_format=dds_format, mipmaps=mipmaps
+    )
 
 
 def _write_dds_uncompressed_rgba(width, height, rgba_bytes, out_path):
@@ -2725,6 +2468,9 @@ def port_bwd2(target_filepath, asset_resolver, settings):
             )
     print("Read complete.")
 
+    if settings.texture_atlas_enabled():
+        atlas_textures(imodel, asset_resolver, settings.texture_atlas_max_size())
+
     # ------------------------#
     # Construct the OGRE model #
     # ------------------------#
@@ -2744,6 +2490,8 @@ def port_bwd2(target_filepath, asset_resolver, settings):
         imodel,
         asset_resolver=asset_resolver,
         suppress_write=suppress_write,
+        dds_format=settings.texture_format(),
+        mipmaps=settings.texture_mipmaps_enabled(),
     )
 
     # Write material file
@@ -2775,6 +2523,162 @@ def port_bwd2(target_filepath, asset_resolver, settings):
     print("Port complete")
 
 
+ATLAS_MAX_SIZE = 2048
+ATLAS_PADDING = 4
+
+
+def _load_texture_rgba(imodel, tex_name, asset_resolver):
+    """
+    Decode one of imodel's textures to a top-down RGBA8 array.
+
+    Uses the same sources as write_textures: existing PNG, flat-color
+    texture, then the .map. Returns None if none of them can be loaded.
+    """
+    base_name = os.path.splitext(tex_name)[0]
+    png_path = asset_resolver.get_resource_path(base_name + ".png")
+    if png_path is not None:
+        width, height, rgba_bytes = _png_to_rgba_bytes(png_path)
+        if rgba_bytes is not None:
+            return np.frombuffer(rgba_bytes, dtype=np.uint8).reshape(height, width, 4)
+
+    if imodel.flat_name == tex_name and getattr(imodel, "flat_img", None) is not None:
+        return np.asarray(imodel.flat_img.convert("RGBA"))
+
+    map_filepath = asset_resolver.get_map_path(base_name)
+    if map_filepath is None:
+        return None
+    width, height, rgba_bytes = _bzmap_to_rgba_bytes(
+        map_filepath,
+        asset_resolver,
+        map_dir=os.path.dirname(map_filepath),
+    )
+    if rgba_bytes is None:
+        return None
+    return np.frombuffer(rgba_bytes, dtype=np.uint8).reshape(height, width, 4)
+
+
+def _draw_call_count(imodel):
+    """Number of submeshes build_mesh will emit across all meshes."""
+    if not imodel.use_cockpit:
+        return sum(1 for igroup in imodel.igroup_map.values() if igroup.igeom_list)
+    return sum(
+        1
+        for igroup in imodel.igroup_map.values()
+        for type in ("primary", "cockpit")
+        if igroup.of_type(type)
+    )
+
+
+def atlas_textures(imodel, asset_resolver, max_size=ATLAS_MAX_SIZE):
+    """
+    Pack the model's textures into one atlas and merge their submeshes.
+
+    Only groups with their own material and UVs inside 0..1 take part;
+    tiled textures, stock materials (the scope) and textures that do not
+    fit in a max_size atlas keep their own submesh. Merged groups keep
+    their super material, so BZBase and BZBaseCockpit geometry end up in
+    one submesh each. The atlas is written by write_textures like any
+    other texture.
+    """
+    print("Building texture atlas")
+    candidates = []
+    candidate_groups = set()
+    for name, igroup in imodel.igroup_map.items():
+        mat_info = imodel.mat_map.get(igroup.mat_name)
+        if mat_info is None:
+            continue
+        if not all(
+            texture_atlas.uvs_in_unit_square(igeom.vertex_array["uv"])
+            for igeom in igroup.igeom_list
+        ):
+            print(f"  [skip] {mat_info.tex_name}: UVs tile outside 0..1")
+            continue
+        candidates.append(mat_info.tex_name)
+        candidate_groups.add(name)
+
+    tex_names = []
+    images = []
+    for tex_name in dict.fromkeys(candidates):
+        rgba = _load_texture_rgba(imodel, tex_name, asset_resolver)
+        if rgba is None:
+            print(f"  [skip] {tex_name}: could not load texture")
+            continue
+        tex_names.append(tex_name)
+        images.append(rgba)
+
+    if len(images) < 2:
+        print("  Fewer than two textures to pack; atlas skipped")
+        return
+
+    packed = texture_atlas.pack(
+        [(image.shape[1], image.shape[0]) for image in images],
+        max_size=max_size,
+        padding=ATLAS_PADDING,
+    )
+    if packed is None:
+        print(f"  No texture fits in a {max_size}x{max_size} atlas; atlas skipped")
+        return
+    width, height, rects = packed
+    placed = {
+        tex_name: rect for tex_name, rect in zip(tex_names, rects) if rect is not None
+    }
+    for tex_name, rect in zip(tex_names, rects):
+        if rect is None:
+            print(f"  [skip] {tex_name}: does not fit in a {max_size} atlas")
+    if len(placed) < 2:
+        print("  Fewer than two textures fit; atlas skipped")
+        return
+
+    draw_calls = _draw_call_count(imodel)
+    atlas_name = f"{imodel.name.lower()}_atlas"
+    imodel.atlas_name = atlas_name
+    imodel.atlas_rgba = texture_atlas.compose(
+        images, rects, width, height, padding=ATLAS_PADDING
+    )
+
+    # Rebuild the group map in its original order, folding atlased groups
+    # into one group per super material at the first one's position. Only
+    # candidate groups fold; a group sharing a placed texture but tiling
+    # outside 0..1 keeps its own submesh and material.
+    igroup_map = {}
+    retired = set()
+    remapped = set()
+    for name, igroup in imodel.igroup_map.items():
+        mat_info = imodel.mat_map.get(igroup.mat_name)
+        if name not in candidate_groups or mat_info.tex_name not in placed:
+            igroup_map[name] = igroup
+            continue
+
+        rect = placed[mat_info.tex_name]
+        for igeom in igroup.igeom_list:
+            if id(igeom) not in remapped:
+                remapped.add(id(igeom))
+                texture_atlas.remap_uvs(igeom.vertex_array["uv"], rect, width, height)
+
+        group_name = mat_info.super_name + "_" + atlas_name
+        merged = igroup_map.get(group_name)
+        if merged is None:
+            atlas_mat = imodel.create_material(
+                name=group_name,
+                super_name=mat_info.super_name,
+                tex_name=atlas_name,
+            )
+            merged = InterGroup(group_name, atlas_mat.name)
+            igroup_map[group_name] = merged
+        merged.igeom_list.extend(igroup.igeom_list)
+        retired.add(mat_info.name)
+
+    imodel.igroup_map = igroup_map
+    in_use = {igroup.mat_name for igroup in igroup_map.values()}
+    for mat_name in retired - in_use:
+        del imodel.mat_map[mat_name]
+
+    print(
+        f"  Packed {len(placed)} textures into {width}x{height} '{atlas_name}'; "
+        f"draw calls {draw_calls} -> {_draw_call_count(imodel)}"
+    )
+
+
 def write_material(imodel, asset_resolver, suppress_write):
     material_filename = imodel.material_filename + ".material"
     material_filepath = asset_resolver.get_output_material_path(material_filename)
@@ -2814,10 +2718,26 @@ def write_material(imodel, asset_resolver, suppress_write):
 
 def _png_to_rgba_bytes(png_path):
     """
-    Load a PNG via Blender's image API and return (width, height, rgba_bytes).
+    Load a PNG and return (width, height, rgba_bytes), rows top-down.
+
+    8-bit PNGs are decoded with the built-in NumPy decoder, so no Blender or
+    Pillow is needed. Other PNGs (16-bit, interlaced) go through Blender's
+    image API when it is available.
 
-    Returns (None, None, None) if Blender is unavailable or loading fails.
+    Returns (None, None, None) if loading fails.
     """
+    try:
+        with open(png_path, "rb") as stream:
+            rgba = bzmap_codec.decode_png(stream.read())
+    except OSError as e:
+        print(f"[bzrmodelporter] Failed to read PNG '{png_path}': {e}")
+        return None, None, None
+    except ValueError as e:
+        print(f"[bzrmodelporter] Built-in PNG decoder skipped '{png_path}': {e}")
+    else:
+        height, width = rgba.shape[:2]
+        return width, height, rgba.tobytes()
+
     try:
         import bpy
     except ImportError:
@@ -2836,26 +2756,20 @@ def _png_to_rgba_bytes(png_path):
 
     try:
         width, height = img.size
-        # img.pixels is a flat sequence of floats [R, G, B, A, R, G, B, A, ...]
-        pixels = list(img.pixels)
+        # img.pixels is a flat, bottom-up sequence of floats [R, G, B, A, ...]
         expected_len = width * height * 4
-        if len(pixels) != expected_len:
+        if len(img.pixels) != expected_len:
             print(
                 f"[bzrmodelporter] Unexpected pixel length for '{png_path}': "
-                f"{len(pixels)} (expected {expected_len})"
+                f"{len(img.pixels)} (expected {expected_len})"
             )
             return None, None, None
 
-        buf = bytearray(expected_len)
-        for i, f in enumerate(pixels):
-            v = int(f * 255.0 + 0.5)
-            if v < 0:
-                v = 0
-            elif v > 255:
-                v = 255
-            buf[i] = v
-
-        return width, height, bytes(buf)
+        pixels = np.empty(expected_len, dtype=np.float32)
+        img.pixels.foreach_get(pixels)
+        rgba = np.clip(pixels * 255.0 + 0.5, 0, 255).astype(np.uint8)
+        rgba = rgba.reshape(height, width, 4)[::-1]
+        return width, height, rgba.tobytes()
 
     finally:
         # Clean up the temporary image from the .blend
@@ -2863,102 +2777,165 @@ def _png_to_rgba_bytes(png_path):
         bpy.data.images.remove(img)
 
 
-def write_textures(imodel, asset_resolver, suppress_write):
+def _encode_map_texture(map_filepath, asset_resolver, dds_format, mipmaps):
+    """Worker: decode a .map and encode it as DDS. Returns None on failure."""
+    width, height, rgba_bytes = _bzmap_to_rgba_bytes(
+        map_filepath,
+        asset_resolver,
+        map_dir=os.path.dirname(map_filepath),
+    )
+    if width is None or rgba_bytes is None:
+        return None
+    return _dds_texture_bytes(width, height, rgba_bytes, dds_format, mipmaps)
+
+
+def _run_inline(fn, *args):
+    # Same interface as executor.submit for the single-worker path.
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def write_textures(
+    imodel,
+    asset_resolver,
+    suppress_write,
+    dds_format="RGBA",
+    mipmaps=False,
+    workers=None,
+):
+    """
+    Write one <texture>_D.dds per texture used by imodel.
+
+    dds_format selects uncompressed RGBA, BC1, BC3 or AUTO (BC1 for opaque
+    textures, BC3 otherwise); mipmaps adds a box-filtered mip chain.
+
+    Resource lookups run on the calling thread, in texture order. Decoding
+    and DDS encoding run in a thread pool of `workers` threads (None picks
+    one per CPU, 1 disables the pool). Each finished texture is written
+    back on the calling thread as soon as its encode completes, so one slow
+    texture does not hold up the rest.
+    """
     print("Writing texture files")
     if suppress_write:
         print("  [nowrite] Skipping texture export")
         return
 
-    for tex_name in imodel.get_textures():
-        if not tex_name:
-            continue
+    tex_names = [tex_name for tex_name in imodel.get_textures() if tex_name]
+    if workers is None:
+        workers = min(len(tex_names), os.cpu_count() or 1)
 
-        base_name = os.path.splitext(tex_name)[0]
-        dds_name = base_name + "_D.dds"
-        dds_path = asset_resolver.get_output_texture_path(dds_name)
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    submit = pool.submit if pool is not None else _run_inline
 
-        print(f"tex_name: {tex_name}")
-        print(f"Texture: {base_name} -> {dds_name}")
+    # future -> (tex_name, dds_path, source PNG/.map path or description)
+    pending = {}
+    try:
+        for tex_name in tex_names:
+            base_name = os.path.splitext(tex_name)[0]
+            dds_name = base_name + "_D.dds"
+            dds_path = asset_resolver.get_output_texture_path(dds_name)
 
-        if dds_path is None:
-            print(f"  [skip] Output path disabled or already exists for {dds_name}")
-            continue
+            print(f"tex_name: {tex_name}")
+            print(f"Texture: {base_name} -> {dds_name}")
 
-        # ----------------------------------------------------
-        # 1) Prefer existing PNG (no ACT / palette needed)
-        # ----------------------------------------------------
-        png_basename = base_name + ".png"
-        png_path = asset_resolver.get_resource_path(png_basename)
-        if png_path is not None:
-            print(f"  Using existing PNG '{png_path}' for '{tex_name}'")
-            width, height, rgba_bytes = _png_to_rgba_bytes(png_path)
-            if width is not None and rgba_bytes is not None:
-                asset_resolver.write_bytes_if_changed(
-                    dds_path,
-                    _dds_uncompressed_rgba_bytes(width, height, rgba_bytes),
-                    label="texture",
-                )
+            if dds_path is None:
+                print(f"  [skip] Output path disabled or already exists for {dds_name}")
                 continue
-            else:
-                print(
-                    f"  Failed to load PNG '{png_path}', "
-                    f"falling back to .map if available."
+
+            # ----------------------------------------------------
+            # 0) Texture atlas built by atlas_textures
+            # ----------------------------------------------------
+            if tex_name == imodel.atlas_name and imodel.atlas_rgba is not None:
+                future = submit(
+                    _dds_texture_bytes,
+                    imodel.atlas_rgba.shape[1],
+                    imodel.atlas_rgba.shape[0],
+                    imodel.atlas_rgba.tobytes(),
+                    dds_format,
+                    mipmaps,
                 )
+                pending[future] = (tex_name, dds_path, "texture atlas")
+                continue
 
-        # ----------------------------------------------------
-        # 2) Flat-color synthetic texture (if present)
-        # ----------------------------------------------------
-        if (
-            getattr(imodel, "flat_name", None) == tex_name
-            and getattr(imodel, "flat_img", None) is not None
-        ):
-            # imodel.flat_img should be a PIL image created earlier;
-            # only runs if Pillow is installed and flat-colors are in use.
-            img = imodel.flat_img.convert("RGBA")
-            width, height = img.size
-            rgba_bytes = img.tobytes()
-            asset_resolver.write_bytes_if_changed(
-                dds_path,
-                _dds_uncompressed_rgba_bytes(width, height, rgba_bytes),
-                label="texture",
-            )
-            continue
+            # ----------------------------------------------------
+            # 1) Prefer existing PNG (no ACT / palette needed)
+            # ----------------------------------------------------
+            png_basename = base_name + ".png"
+            png_path = asset_resolver.get_resource_path(png_basename)
+            if png_path is not None:
+                print(f"  Using existing PNG '{png_path}' for '{tex_name}'")
+                # The bpy fallback for unusual PNGs must stay on this thread.
+                width, height, rgba_bytes = _png_to_rgba_bytes(png_path)
+                if width is not None and rgba_bytes is not None:
+                    future = submit(
+                        _dds_texture_bytes,
+                        width,
+                        height,
+                        rgba_bytes,
+                        dds_format,
+                        mipmaps,
+                    )
+                    pending[future] = (tex_name, dds_path, png_path)
+                    continue
+                else:
+                    print(
+                        f"  Failed to load PNG '{png_path}', "
+                        f"falling back to .map if available."
+                    )
 
-        # ----------------------------------------------------
-        # 3) Fallback: original .map → RGBA path (needs ACT for INDEXED)
-        map_filepath = asset_resolver.get_map_path(base_name)
-        if map_filepath is None:
-            print(f"  Could not find map file for texture '{tex_name}'")
-            continue
+            # ----------------------------------------------------
+            # 2) Flat-color synthetic texture (if present)
+            # ----------------------------------------------------
+            if (
+                getattr(imodel, "flat_name", None) == tex_name
+                and getattr(imodel, "flat_img", None) is not None
+            ):
+                # imodel.flat_img should be a PIL image created earlier;
+                # only runs if Pillow is installed and flat-colors are in use.
+                img = imodel.flat_img.convert("RGBA")
+                width, height = img.size
+                rgba_bytes = img.tobytes()
+                future = submit(
+                    _dds_texture_bytes, width, height, rgba_bytes, dds_format, mipmaps
+                )
+                pending[future] = (tex_name, dds_path, "flat-color texture")
+                continue
 
-        print(f"  Loading .map: {map_filepath}")
+            # ----------------------------------------------------
+            # 3) Fallback: original .map → RGBA path (needs ACT for INDEXED)
+            map_filepath = asset_resolver.get_map_path(base_name)
+            if map_filepath is None:
+                print(f"  Could not find map file for texture '{tex_name}'")
+                continue
 
-        try:
-            width, height, rgba_bytes = _bzmap_to_rgba_bytes(
-                map_filepath,
-                asset_resolver,
-                map_dir=os.path.dirname(map_filepath),
+            print(f"  Loading .map: {map_filepath}")
+            future = submit(
+                _encode_map_texture, map_filepath, asset_resolver, dds_format, mipmaps
             )
-        except Exception as exc:
-            print(
-                f"  Failed to convert bzmap to RGBA bytes: "
-                f"{map_filepath} ({tex_name})"
-            )
-            print(f"    {exc}")
-            continue
+            pending[future] = (tex_name, dds_path, map_filepath)
 
-        if width is None or rgba_bytes is None:
-            print(
-                f"  No RGBA data for {map_filepath} ({tex_name}); "
-                f"skipping DDS write"
-            )
-            continue
+        # Write each texture as soon as its encode finishes.
+        for future in as_completed(pending):
+            tex_name, dds_path, source = pending[future]
+            try:
+                dds_bytes = future.result()
+            except Exception as exc:
+                print(f"  Failed to encode {source} ({tex_name})")
+                print(f"    {exc}")
+                continue
 
-        asset_resolver.write_bytes_if_changed(
-            dds_path,
-            _dds_uncompressed_rgba_bytes(width, height, rgba_bytes),
-            label="texture",
-        )
+            if dds_bytes is None:
+                print(f"  No RGBA data for {source} ({tex_name}); skipping DDS write")
+                continue
+
+            asset_resolver.write_bytes_if_changed(dds_path, dds_bytes, label="texture")
+    finally:
+        if pool is not None:
+            pool.shutdown()
 
 
 def port_geo(target_filepath, asset_resolver, settings):
@@ -3064,6 +3041,8 @@ def port_geo(target_filepath, asset_resolver, settings):
         imodel,
         asset_resolver=asset_resolver,
         suppress_write=suppress_write,
+        dds_format=settings.texture_format(),
+        mipmaps=settings.texture_mipmaps_enabled(),
     )
 
     # Write material file
@@ -3088,11 +3067,11 @@ def port_geo(target_filepath, asset_resolver, settings):
 
 def port_map(filepath, asset_resolver, settings):
     """
-    Standalone .map -> uncompressed DDS (A8R8G8B8) converter.
+    Standalone .map -> DDS converter.
 
-    This uses the same BZMap decoding as the main pipeline and the
-    pure-Python _bzmap_to_rgba_bytes / _write_dds_uncompressed_rgba helpers,
-    so it does not depend on Pillow.
+    This uses the same BZMap decoding as the main pipeline and the NumPy
+    dds_codec encoder, so it does not depend on Pillow. The DDS format and
+    mip chain follow the porter settings.
     """
     tex_name = filepath.stem  # name without .map
     map_filepath = asset_resolver.get_map_path(tex_name)
@@ -3132,7 +3111,13 @@ def port_map(filepath, asset_resolver, settings):
     else:
         written = asset_resolver.write_bytes_if_changed(
             output_filepath,
-            _dds_uncompressed_rgba_bytes(width, height, rgba),
+            _dds_texture_bytes(
+                width,
+                height,
+                rgba,
+                settings.texture_format(),
+                settings.texture_mipmaps_enabled(),
+            ),
             label="texture",
         )
         if written:
@@ -414,6 +414,10 @@ class SettingsController:
         boundingbox_scale_factors=None,
         nowrite=False,  # Boolean
         verbose=False,  # Boolean
+        dds_format="RGBA",  # dds_codec.DDS_FORMATS
+        mipmaps=False,  # Boolean
+        atlas=False,  # Boolean
+        atlas_size=2048,  # Max atlas width/height in pixels
     ):
         self.name = name
         self.suffix = suffix
@@ -447,6 +451,10 @@ class SettingsController:
 
         self.nowrite = nowrite
         self.verbose = verbose
+        self.dds_format = dds_format
+        self.mipmaps = mipmaps
+        self.atlas = atlas
+        self.atlas_size = atlas_size
 
     # ------------------------------------------------------------------
     # Accessors and flag helpers
@@ -516,6 +524,19 @@ class SettingsController:
     def verbose_log(self):
         return self.verbose
 
+    # Texture output
+    def texture_format(self):
+        return self.dds_format
+
+    def texture_mipmaps_enabled(self):
+        return self.mipmaps
+
+    def texture_atlas_enabled(self):
+        return self.atlas
+
+    def texture_atlas_max_size(self):
+        return self.atlas_size
+
 
 def parse_args():
     ternary_choices = ["Auto", "True", "False"]
@@ -677,6 +698,31 @@ The first line of the config file should be a filepath to an .act color palette
         metavar=("X", "Y", "Z"),
         help="Scale factors for the mesh bounds.",
     )
+    ap.add_argument(
+        "--ddsformat",
+        action="store",
+        default="RGBA",
+        type=str.upper,
+        choices=["RGBA", "BC1", "BC3", "AUTO"],
+        help="DDS texture encoding: 'RGBA' (default, uncompressed A8R8G8B8), 'BC1' (DXT1, no alpha), 'BC3' (DXT5), or 'AUTO' (BC1 for opaque textures, BC3 otherwise).",
+    )
+    ap.add_argument(
+        "--mipmaps",
+        action="store_true",
+        help="Write a box-filtered mip chain into each DDS texture.",
+    )
+    ap.add_argument(
+        "--atlas",
+        action="store_true",
+        help="Pack the model's non-tiling textures into one atlas texture and merge their submeshes to cut draw calls.",
+    )
+    ap.add_argument(
+        "--atlassize",
+        action="store",
+        type=int,
+        default=2048,
+        help="Maximum width and height of the texture atlas in pixels (default 2048).",
+    )
     ap.add_argument(
         "--act",
         action="store",
@@ -801,6 +847,10 @@ if __name__ == "__main__":
             ),
             nowrite=args.nowrite,
             verbose=args.verbose,
+            dds_format=args.ddsformat,
+            mipmaps=args.mipmaps,
+            atlas=args.atlas,
+            atlas_size=args.atlassize,
         )
         if args.scopescreen is not None:
             settings.scope.screen = ScopeScreen(
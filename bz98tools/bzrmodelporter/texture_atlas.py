@@ -0,0 +1,174 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+Texture atlas packing for the Redux porter.
+
+Packs a set of RGBA8 images into one power-of-two atlas with a skyline
+bottom-left packer, and remaps 0..1 UVs into the packed rectangles.
+Images are top-down (height, width, 4) arrays, matching the .map / PNG
+decoders, so UV v grows downwards in both the source and the atlas.
+"""
+
+from collections import namedtuple
+
+import numpy as np
+
+# Placement of one image inside the atlas, padding excluded.
+AtlasRect = namedtuple("AtlasRect", "x y width height")
+
+
+class SkylinePacker:
+    """Bottom-left skyline packer for a fixed-size bin."""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.height = height
+        # Skyline segments as [x, y, width], left to right, covering the bin.
+        self.skyline = [[0, 0, width]]
+
+    def _fit(self, index, width, height):
+        """Return the y at which a width x height rect fits at segment index."""
+        x = self.skyline[index][0]
+        if x + width > self.width:
+            return None
+        y = 0
+        remaining = width
+        while remaining > 0:
+            seg_x, seg_y, seg_width = self.skyline[index]
+            y = max(y, seg_y)
+            if y + height > self.height:
+                return None
+            remaining -= seg_width
+            index += 1
+        return y
+
+    def insert(self, width, height):
+        """Place a rect and return its (x, y), or None if it does not fit."""
+        best = None
+        for index, (x, _, _) in enumerate(self.skyline):
+            y = self._fit(index, width, height)
+            if y is not None and (best is None or (y, x) < best[:2]):
+                best = (y, x, index)
+        if best is None:
+            return None
+
+        y, x, index = best
+        self.skyline.insert(index, [x, y + height, width])
+
+        # Shrink or drop the segments now covered by the new one.
+        right = x + width
+        i = index + 1
+        while i < len(self.skyline):
+            seg = self.skyline[i]
+            if seg[0] >= right:
+                break
+            overlap = right - seg[0]
+            if overlap >= seg[2]:
+                del self.skyline[i]
+                continue
+            seg[0] += overlap
+            seg[2] -= overlap
+            break
+
+        # Merge neighbours at the same height.
+        i = 0
+        while i < len(self.skyline) - 1:
+            if self.skyline[i][1] == self.skyline[i + 1][1]:
+                self.skyline[i][2] += self.skyline[i + 1][2]
+                del self.skyline[i + 1]
+            else:
+                i += 1
+        return x, y
+
+
+def _candidate_sizes(sizes, max_size, padding):
+    """Power-of-two bins from smallest area up, wider than tall first."""
+    area = sum((w + 2 * padding) * (h + 2 * padding) for w, h in sizes)
+    widest = max(w for w, _ in sizes) + 2 * padding
+    tallest = max(h for _, h in sizes) + 2 * padding
+    powers = []
+    side = 1
+    while side <= max_size:
+        powers.append(side)
+        side *= 2
+    bins = [
+        (w, h)
+        for w in powers
+        for h in powers
+        if h <= w <= 2 * h and w * h >= area and w >= widest and h >= tallest
+    ]
+    return sorted(bins, key=lambda size: (size[0] * size[1], -size[0]))
+
+
+def _pack_into(sizes, order, width, height, padding):
+    packer = SkylinePacker(width, height)
+    rects = [None] * len(sizes)
+    for i in order:
+        w, h = sizes[i]
+        pos = packer.insert(w + 2 * padding, h + 2 * padding)
+        if pos is not None:
+            rects[i] = AtlasRect(pos[0] + padding, pos[1] + padding, w, h)
+    return rects
+
+
+def pack(sizes, max_size=2048, padding=4):
+    """
+    Pack (width, height) sizes into the smallest power-of-two atlas.
+
+    Returns (atlas_width, atlas_height, rects) where rects[i] is an AtlasRect
+    or None for images that did not fit in a max_size x max_size atlas.
+    Returns None if nothing fits.
+    """
+    if not sizes:
+        return None
+    # Tallest first keeps the skyline flat.
+    order = sorted(range(len(sizes)), key=lambda i: (-sizes[i][1], -sizes[i][0], i))
+
+    for width, height in _candidate_sizes(sizes, max_size, padding):
+        rects = _pack_into(sizes, order, width, height, padding)
+        if all(rect is not None for rect in rects):
+            return width, height, rects
+
+    rects = _pack_into(sizes, order, max_size, max_size, padding)
+    if all(rect is None for rect in rects):
+        return None
+    return max_size, max_size, rects
+
+
+def compose(images, rects, width, height, padding=4):
+    """
+    Copy images into a new (height, width, 4) uint8 atlas.
+
+    The padding around each rect repeats the image's edge texels so
+    bilinear filtering and mip levels do not bleed in neighbouring images.
+    """
+    atlas = np.zeros((height, width, 4), dtype=np.uint8)
+    for image, rect in zip(images, rects):
+        if rect is None:
+            continue
+        padded = np.pad(image, ((padding, padding), (padding, padding), (0, 0)), "edge")
+        x0 = rect.x - padding
+        y0 = rect.y - padding
+        atlas[y0 : y0 + padded.shape[0], x0 : x0 + padded.shape[1]] = padded
+    return atlas
+
+
+def uvs_in_unit_square(uv, epsilon=1e-3):
+    """True if every UV lies in 0..1, i.e. the texture is not tiled."""
+    if len(uv) == 0:
+        return True
+    return bool(uv.min() >= -epsilon and uv.max() <= 1.0 + epsilon)
+
+
+def remap_uvs(uv, rect, width, height):
+    """Map (N, 2) 0..1 UVs in place onto rect of a width x height atlas."""
+    np.clip(uv, 0.0, 1.0, out=uv)
+    uv *= (rect.width / width, rect.height / height)
+    uv += (rect.x / width, rect.y / height)
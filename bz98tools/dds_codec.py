@@ -0,0 +1,296 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+NumPy DDS encoder for Redux textures.
+
+Writes uncompressed A8R8G8B8, BC1 (DXT1) or BC3 (DXT5) surfaces, optionally
+with a box-filtered mip chain. Input is always a top-down RGBA8 image.
+BC1 ignores alpha; use BC3 (or AUTO) for textures that need it.
+"""
+
+import struct
+import time
+
+import numpy as np
+
+DDS_FORMATS = ("RGBA", "BC1", "BC3", "AUTO")
+
+_DDSD_CAPS = 0x1
+_DDSD_HEIGHT = 0x2
+_DDSD_WIDTH = 0x4
+_DDSD_PIXELFORMAT = 0x1000
+_DDSD_MIPMAPCOUNT = 0x20000
+_DDSD_LINEARSIZE = 0x80000
+
+_DDSCAPS_COMPLEX = 0x8
+_DDSCAPS_TEXTURE = 0x1000
+_DDSCAPS_MIPMAP = 0x400000
+
+_DDPF_FOURCC = 0x4
+_DDPF_RGB_ALPHA = 0x41  # DDPF_RGB | DDPF_ALPHAPIXELS
+
+_BLOCK_BYTES = {"BC1": 8, "BC3": 16}
+_FOURCC = {"BC1": b"DXT1", "BC3": b"DXT5"}
+
+
+def _as_rgba(rgba, width=None, height=None):
+    if isinstance(rgba, (bytes, bytearray, memoryview)):
+        rgba = np.frombuffer(rgba, dtype=np.uint8)
+        if rgba.size != width * height * 4:
+            raise ValueError(
+                f"rgba_bytes has wrong size: {rgba.size}; expected {width*height*4}"
+            )
+        return rgba.reshape(height, width, 4)
+    return np.asarray(rgba, dtype=np.uint8)
+
+
+def mip_chain(rgba, max_levels=None):
+    """
+    Return [level0, level1, ...] down to 1x1, each level a 2x2 box filter of
+    the previous one. Odd edges are repeated before filtering.
+    """
+    levels = [rgba]
+    current = rgba.astype(np.float32)
+    while current.shape[0] > 1 or current.shape[1] > 1:
+        if max_levels is not None and len(levels) >= max_levels:
+            break
+        height, width = current.shape[:2]
+        pad_y = height & 1 if height > 1 else 0
+        pad_x = width & 1 if width > 1 else 0
+        if pad_y or pad_x:
+            current = np.pad(current, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge")
+        height, width = current.shape[:2]
+        fy = 2 if height > 1 else 1
+        fx = 2 if width > 1 else 1
+        current = current.reshape(height // fy, fy, width // fx, fx, 4).mean(
+            axis=(1, 3)
+        )
+        levels.append(np.clip(np.rint(current), 0, 255).astype(np.uint8))
+    return levels
+
+
+def _blocks(rgba):
+    """Split an image into (block count, 16, 4) texel blocks, padded to 4x4."""
+    height, width = rgba.shape[:2]
+    pad_y = (-height) % 4
+    pad_x = (-width) % 4
+    if pad_y or pad_x:
+        rgba = np.pad(rgba, ((0, pad_y), (0, pad_x), (0, 0)), mode="edge")
+    by = rgba.shape[0] // 4
+    bx = rgba.shape[1] // 4
+    return rgba.reshape(by, 4, bx, 4, 4).swapaxes(1, 2).reshape(by * bx, 16, 4)
+
+
+def _pack565(rgb):
+    rgb = rgb.astype(np.float32)
+    r = np.rint(rgb[..., 0] * (31.0 / 255.0)).astype(np.uint16)
+    g = np.rint(rgb[..., 1] * (63.0 / 255.0)).astype(np.uint16)
+    b = np.rint(rgb[..., 2] * (31.0 / 255.0)).astype(np.uint16)
+    return (r << 11) | (g << 5) | b
+
+
+def _unpack565(packed):
+    packed = packed.astype(np.uint16)
+    r = (packed >> 11) & 31
+    g = (packed >> 5) & 63
+    b = packed & 31
+    return np.stack(
+        ((r << 3) | (r >> 2), (g << 2) | (g >> 4), (b << 3) | (b >> 2)), axis=-1
+    ).astype(np.float32)
+
+
+def _encode_bc1_colors(blocks):
+    """Return (block count, 4) uint16 BC1 colour blocks (opaque 4-colour mode)."""
+    colors = blocks[:, :, :3].astype(np.float32)
+    lo = colors.min(axis=1)
+    hi = colors.max(axis=1)
+    inset = (hi - lo) / 16.0
+    c0 = _pack565(hi - inset)
+    c1 = _pack565(lo + inset)
+
+    swap = c0 < c1
+    c0, c1 = np.where(swap, c1, c0), np.where(swap, c0, c1)
+
+    e0 = _unpack565(c0)
+    e1 = _unpack565(c1)
+    palette = np.stack(
+        (e0, e1, (2.0 * e0 + e1) / 3.0, (e0 + 2.0 * e1) / 3.0), axis=1
+    )  # (N, 4, 3)
+    dist = ((colors[:, :, None, :] - palette[:, None, :, :]) ** 2).sum(axis=-1)
+    indices = dist.argmin(axis=2).astype(np.uint32)  # (N, 16)
+    # c0 == c1 selects 3-colour mode; index 0 is exact there as well.
+    indices[c0 == c1] = 0
+
+    shifts = np.arange(16, dtype=np.uint32) * 2
+    bits = (indices << shifts).sum(axis=1, dtype=np.uint32)
+
+    out = np.empty((blocks.shape[0], 4), dtype="<u2")
+    out[:, 0] = c0
+    out[:, 1] = c1
+    out[:, 2] = bits & 0xFFFF
+    out[:, 3] = bits >> 16
+    return out
+
+
+def _encode_bc3_alpha(blocks):
+    """Return (block count, 8) uint8 BC3 alpha blocks (8-value mode)."""
+    alpha = blocks[:, :, 3].astype(np.int32)
+    a0 = alpha.max(axis=1)
+    a1 = alpha.min(axis=1)
+    span = np.maximum(a0 - a1, 1)
+
+    # Position along a1..a0 in sevenths, then map to the BC3 index order:
+    # 7 -> 0 (a0), 0 -> 1 (a1), 6..1 -> 2..7 (interpolated).
+    steps = (((alpha - a1[:, None]) * 14 + span[:, None]) // (2 * span[:, None])).clip(
+        0, 7
+    )
+    indices = np.where(steps == 7, 0, np.where(steps == 0, 1, 8 - steps))
+    indices[a0 == a1] = 0
+
+    shifts = np.arange(16, dtype=np.uint64) * 3
+    bits = (indices.astype(np.uint64) << shifts).sum(axis=1, dtype=np.uint64)
+
+    out = np.empty((blocks.shape[0], 8), dtype=np.uint8)
+    out[:, 0] = a0
+    out[:, 1] = a1
+    for byte in range(6):
+        out[:, 2 + byte] = (bits >> np.uint64(8 * byte)) & np.uint64(0xFF)
+    return out
+
+
+def encode_blocks(rgba, dds_format):
+    """Block-compress one top-down RGBA8 surface to BC1 or BC3 bytes."""
+    blocks = _blocks(rgba)
+    colors = _encode_bc1_colors(blocks).view(np.uint8).reshape(-1, 8)
+    if dds_format == "BC1":
+        return colors.tobytes()
+    alpha = _encode_bc3_alpha(blocks)
+    return np.concatenate((alpha, colors), axis=1).tobytes()
+
+
+def _bgra_bytes(rgba):
+    return np.ascontiguousarray(rgba[:, :, [2, 1, 0, 3]]).tobytes()
+
+
+def _dds_header(width, height, dds_format, mip_count):
+    def dword(x):
+        return struct.pack("<I", x)
+
+    flags = _DDSD_CAPS | _DDSD_HEIGHT | _DDSD_WIDTH | _DDSD_PIXELFORMAT
+    flags |= _DDSD_MIPMAPCOUNT
+    caps1 = _DDSCAPS_TEXTURE
+    if mip_count > 1:
+        caps1 |= _DDSCAPS_COMPLEX | _DDSCAPS_MIPMAP
+
+    if dds_format == "RGBA":
+        pitch_or_size = width * 4
+        pixel_format = (
+            dword(32)
+            + dword(_DDPF_RGB_ALPHA)
+            + dword(0)
+            + dword(32)
+            + dword(0x00FF0000)
+            + dword(0x0000FF00)
+            + dword(0x000000FF)
+            + dword(0xFF000000)
+        )
+    else:
+        flags |= _DDSD_LINEARSIZE
+        pitch_or_size = (
+            max(1, (width + 3) // 4)
+            * max(1, (height + 3) // 4)
+            * _BLOCK_BYTES[dds_format]
+        )
+        pixel_format = (
+            dword(32) + dword(_DDPF_FOURCC) + _FOURCC[dds_format] + b"\0" * 20
+        )
+
+    return b"".join(
+        (
+            b"DDS ",
+            dword(124),
+            dword(flags),
+            dword(height),
+            dword(width),
+            dword(pitch_or_size),
+            dword(0),  # dwDepth
+            dword(mip_count if mip_count > 1 else 0),
+            b"\0" * (11 * 4),  # dwReserved1[11]
+            pixel_format,
+            dword(caps1),
+            dword(0),
+            dword(0),
+            dword(0),
+            dword(0),  # dwReserved2
+        )
+    )
+
+
+def resolve_format(rgba, dds_format):
+    """Pick BC1 or BC3 for AUTO depending on whether any texel is translucent."""
+    if dds_format != "AUTO":
+        return dds_format
+    return "BC3" if (rgba[:, :, 3] != 255).any() else "BC1"
+
+
+def encode_dds(rgba, width=None, height=None, dds_format="RGBA", mipmaps=False):
+    """
+    Build a complete DDS file from an RGBA8 image.
+
+    rgba is a (height, width, 4) uint8 array or raw RGBA bytes (then width
+    and height are required). dds_format is one of DDS_FORMATS.
+    """
+    if dds_format not in DDS_FORMATS:
+        raise ValueError(f"Unknown DDS format '{dds_format}'")
+    rgba = _as_rgba(rgba, width, height)
+    height, width = rgba.shape[:2]
+    dds_format = resolve_format(rgba, dds_format)
+
+    levels = mip_chain(rgba) if mipmaps else [rgba]
+    if dds_format == "RGBA":
+        surfaces = [_bgra_bytes(level) for level in levels]
+    else:
+        surfaces = [encode_blocks(level, dds_format) for level in levels]
+    return _dds_header(width, height, dds_format, len(levels)) + b"".join(surfaces)
+
+
+def benchmark_dds(width=1024, height=1024, repeat=3, seed=0):
+    """
+    Encode a synthetic texture in every format, with and without mips.
+
+    Returns {(format, mipmaps): {"bytes": size, "seconds": best time}}.
+    """
+    rng = np.random.default_rng(seed)
+    # Smooth gradients plus noise: closer to real textures than pure noise.
+    yy, xx = np.mgrid[0:height, 0:width].astype(np.float32)
+    base = np.stack(
+        (
+            xx * (255.0 / max(width - 1, 1)),
+            yy * (255.0 / max(height - 1, 1)),
+            (xx + yy) * (127.0 / max(width + height - 2, 1)),
+            np.full_like(xx, 255.0),
+        ),
+        axis=-1,
+    )
+    base[..., :3] += rng.normal(0.0, 8.0, size=(height, width, 3))
+    rgba = np.clip(base, 0, 255).astype(np.uint8)
+
+    results = {}
+    for dds_format in ("RGBA", "BC1", "BC3"):
+        for mipmaps in (False, True):
+            best = None
+            data = b""
+            for _ in range(max(1, repeat)):
+                start = time.perf_counter()
+                data = encode_dds(rgba, dds_format=dds_format, mipmaps=mipmaps)
+                elapsed = time.perf_counter() - start
+                best = elapsed if best is None else min(best, elapsed)
+            results[(dds_format, mipmaps)] = {"bytes": len(data), "seconds": best}
+    return results
@@ -8,13 +8,13 @@ from typing import Any
 # See the LICENSE file or <https://www.gnu.org/licenses/>.
 
 import bpy
-import importlib
 import os
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
 
-from . import geo_classes
+import numpy as np
 
-# Reload it just in case something changed!
-importlib.reload(geo_classes)
+from . import geo_arrays
 
 
 def _prepare_export_object(context, obj):
@@ -38,47 +38,6 @@ def _derive_legacy_texture_name(name):
     return base_name[:8]
 
 
-def _geo_coord(co):
-    return (float(co.x), float(co.z), float(co.y))
-
-
-def _vector_sub(a, b):
-    return (a[0] - b[0], a[1] - b[1], a[2] - b[2])
-
-
-def _vector_cross(a, b):
-    return (
-        a[1] * b[2] - a[2] * b[1],
-        a[2] * b[0] - a[0] * b[2],
-        a[0] * b[1] - a[1] * b[0],
-    )
-
-
-def _vector_dot(a, b):
-    return a[0] * b[0] + a[1] * b[1] + a[2] * b[2]
-
-
-def _normalize(vec):
-    length_sq = _vector_dot(vec, vec)
-    if length_sq <= 0.0:
-        return (0.0, 0.0, 1.0)
-    length = length_sq**0.5
-    return (vec[0] / length, vec[1] / length, vec[2] / length)
-
-
-def _compute_face_plane(mesh, face):
-    if len(face.vertices) < 3:
-        center = _geo_coord(face.center)
-        return (0.0, 0.0, 1.0, center[2])
-
-    points = [_geo_coord(mesh.vertices[index].co) for index in face.vertices[:3]]
-    edge_a = _vector_sub(points[1], points[0])
-    edge_b = _vector_sub(points[2], points[0])
-    normal = _normalize(_vector_cross(edge_a, edge_b))
-    distance = _vector_dot(normal, points[0])
-    return (normal[0], normal[1], normal[2], distance)
-
-
 def _get_image_derived_texture_name(material):
     node_tree = getattr(material, "node_tree", None)
     if node_tree is None:
@@ -105,277 +64,230 @@ def _get_image_derived_texture_name(material):
     )
 
 
-def geoexport(context, filepath, obj, *, face_plane_mode="CURRENT"):
-    Vertices = []
-    Normals = []
-    Faces = []
+def _material_face_values(mat):
+    """Texture name and 0-255 colour written for faces using mat."""
+    facecolor = [1, 1, 1]
+    if mat is None:
+        return "", facecolor
+
+    # ------------------------------------------------------------------
+    # Default BZ texture name (MapTexture) from Blender material name
+    # if the Battlezone Texture Name field is blank.
+    # ------------------------------------------------------------------
+    tex_name = ""
+    if hasattr(mat, "MaterialPropertyGroup"):
+        # Current value in the Battlezone Texture Name box
+        raw = mat.MaterialPropertyGroup.MapTexture
+        tex_name = (raw or "").strip()
+
+        if not tex_name:
+            tex_name = _get_image_derived_texture_name(mat)
+        if not tex_name:
+            tex_name = _derive_legacy_texture_name(mat.name)
+
+        if tex_name:
+            # Write back so the UI box auto-fills after export
+            mat.MaterialPropertyGroup.MapTexture = tex_name
+
+    facecolor = getattr(mat, "diffuse_color", facecolor)
+    return tex_name, facecolor
+
+
+_ATTRIBUTE_DTYPES = {
+    "INT": np.int32,
+    "FLOAT": np.float32,
+    "INT8": np.int8,
+    "BOOLEAN": bool,
+}
+
+
+def _face_attribute_array(mesh, attr_name, count):
+    """Read a FACE attribute with foreach_get, or None if it is missing."""
+    attrs = getattr(mesh, "attributes", None)
+    attr = attrs.get(attr_name) if attrs is not None else None
+    if attr is None or attr.domain != "FACE" or len(attr.data) < count:
+        return None
+    dtype = _ATTRIBUTE_DTYPES.get(attr.data_type)
+    if dtype is None:
+        return None
+    values = np.empty(len(attr.data), dtype=dtype)
+    attr.data.foreach_get("value", values)
+    return values[:count]
+
+
+def _face_attribute_or_default(mesh, attr_name, count, default_value, dtype):
+    values = _face_attribute_array(mesh, attr_name, count)
+    if values is None:
+        return np.full(count, default_value, dtype=dtype)
+    return values.astype(dtype)
+
+
+def _material_slot_values(mat, material_cache):
+    """(texture name bytes, 0-255 RGB) for a slot, shared through the cache."""
+    key = None if mat is None else getattr(mat, "name_full", mat.name)
+    if material_cache is not None and key in material_cache:
+        return material_cache[key]
+    tex_name, facecolor = _material_face_values(mat)
+    # Convert Blender's 0–1 color into 0–255 RGB
+    values = (
+        bytes(tex_name, "ascii", errors="ignore"),
+        [int(c * 255) for c in facecolor[:3]],
+    )
+    if material_cache is not None:
+        material_cache[key] = values
+    return values
 
-    if obj is None:
-        raise ValueError("No object provided for GEO export.")
 
-    view_layer, previous_active = _prepare_export_object(context, obj)
-    mesh = obj.data
+def snapshot_geo(obj, *, face_plane_mode="CURRENT", material_cache=None):
+    """
+    Read obj's mesh into an unpacked GeoArrays.
 
-    try:
+    All bpy access for a GEO export happens here, so it must run on the
+    main thread. material_cache, when given, is a dict shared between calls
+    so each material's texture name and colour are resolved once.
+    """
+    mesh = obj.data
 
-        def _get_face_attr_int(attr_name, face_index, default_value=0):
-            attrs = getattr(mesh, "attributes", None)
-            if attrs is None:
-                return int(default_value)
-            attr = attrs.get(attr_name)
-            if attr is None or attr.domain != "FACE":
-                return int(default_value)
-            try:
-                return int(attr.data[face_index].value)
-            except Exception:
-                return int(default_value)
-
-        def _get_face_attr_float(attr_name, face_index, default_value=0.0):
-            attrs = getattr(mesh, "attributes", None)
-            if attrs is None:
-                return float(default_value)
-            attr = attrs.get(attr_name)
-            if attr is None or attr.domain != "FACE":
-                return float(default_value)
-            try:
-                return float(attr.data[face_index].value)
-            except Exception:
-                return float(default_value)
-
-        def _has_face_plane_attrs(face_index):
-            attrs = getattr(mesh, "attributes", None)
-            if attrs is None:
-                return False
+    vert_count = len(mesh.vertices)
+    face_count = len(mesh.polygons)
+    loop_count = len(mesh.loops)
+
+    # ------------------------------------------------------------------
+    # Failsafe: fix any invalid material indices on polygons
+    # (Sometimes Blender can end up with garbage indices like 24264.)
+    # ------------------------------------------------------------------
+    material_index = np.zeros(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("material_index", material_index)
+    mat_count = len(mesh.materials)
+    if mat_count > 0:
+        invalid = (material_index < 0) | (material_index >= mat_count)
+        if invalid.any():
+            for poly_index in np.flatnonzero(invalid).tolist():
+                print(
+                    "[BZ GEO Export] Warning: Invalid material index %s on polygon %s; resetting to 0."
+                    % (material_index[poly_index], poly_index)
+                )
+            material_index[invalid] = 0
+            mesh.polygons.foreach_set("material_index", material_index)
+
+    geo = geo_arrays.GeoArrays()
+
+    # Vertices and normals, Blender Z-up to GEO Y-up
+    co = np.empty(vert_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    normals = np.empty(vert_count * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("normal", normals)
+    geo.positions = co.reshape(-1, 3)[:, [0, 2, 1]]
+    geo.normals = -normals.reshape(-1, 3)[:, [0, 2, 1]]
+
+    face_plane_mode = (face_plane_mode or "CURRENT").upper()
+
+    loop_total = np.empty(face_count, dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_total)
+    loop_vertices = np.empty(loop_count, dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    faces = np.zeros(face_count, dtype=geo_arrays.FACE_DTYPE)
+    faces["index"] = np.arange(face_count)
+    faces["vertex_count"] = loop_total
+
+    # Texture name and colour come from each face's material; resolve
+    # them once per slot.
+    if mat_count > 0:
+        slot_names = []
+        slot_colors = []
+        for mat in mesh.materials:
+            name, color = _material_slot_values(mat, material_cache)
+            slot_names.append(name)
+            slot_colors.append(color)
+        faces["texture_name"] = np.array(slot_names, dtype="S13")[material_index]
+        faces["color"] = np.array(slot_colors, dtype=np.uint8)[material_index]
+    else:
+        faces["color"] = 255
+
+    geo_pg = getattr(obj, "GEOPropertyGroup", None)
+    default_unknown = getattr(geo_pg, "GEOFaceUnknownDefault", 0) if geo_pg else 0
+    default_parent = getattr(geo_pg, "GEOFaceParentDefault", 0) if geo_pg else 0
+    default_node = getattr(geo_pg, "GEOFaceNodeDefault", 0) if geo_pg else 0
+    default_shade = getattr(geo_pg, "GEOFaceShadeTypeDefault", 4) if geo_pg else 4
+    default_texture = getattr(geo_pg, "GEOFaceTextureTypeDefault", 0) if geo_pg else 0
+    default_xluscent = getattr(geo_pg, "GEOFaceXluscentTypeDefault", 0) if geo_pg else 0
+
+    def face_ints(attr_name, default_value):
+        return _face_attribute_or_default(
+            mesh, attr_name, face_count, default_value, np.int64
+        )
+
+    faces["poly_area"] = (
+        face_ints("bz_face_unknown_raw", default_unknown)
+        .astype(np.int32)
+        .view(np.float32)
+    )
+    faces["parent"] = face_ints("bz_face_parent", default_parent)
+    faces["tree_branch"] = face_ints("bz_face_node", default_node).astype(np.int32)
+    faces["shade_type"] = face_ints("bz_face_shade_type", default_shade) & 0xFF
+    faces["texture_type"] = face_ints("bz_face_texture_type", default_texture) & 0xFF
+    faces["xluscent_type"] = face_ints("bz_face_xluscent_type", default_xluscent) & 0xFF
+
+    planes = None
+    if face_plane_mode == "PRESERVE":
+        columns = [
+            _face_attribute_array(mesh, attr_name, face_count)
             for attr_name in (
                 "bz_face_plane_x",
                 "bz_face_plane_y",
                 "bz_face_plane_z",
                 "bz_face_plane_d",
-            ):
-                attr = attrs.get(attr_name)
-                if attr is None or attr.domain != "FACE":
-                    return False
-                if face_index >= len(attr.data):
-                    return False
-            return True
-
-        # ------------------------------------------------------------------
-        # Failsafe: fix any invalid material indices on polygons
-        # (Sometimes Blender can end up with garbage indices like 24264.)
-        # ------------------------------------------------------------------
-        mat_count = len(mesh.materials)
-        if mat_count > 0:
-            for poly in mesh.polygons:
-                # Blender usually guarantees material_index is an int, but guard anyway
-                idx = getattr(poly, "material_index", 0)
-                if idx is None or idx < 0 or idx >= mat_count:
-                    print(
-                        "[BZ GEO Export] Warning: Invalid material index %s on polygon %s; resetting to 0."
-                        % (idx, poly.index)
-                    )
-                    poly.material_index = 0
-
-        # Collect vertices and normals
-        for vertex in mesh.vertices:
-            Vertices.append(
-                geo_classes.GEOVertex([vertex.co.x, vertex.co.z, vertex.co.y])
-            )
-            Normals.append(
-                geo_classes.GEONormal(
-                    [-vertex.normal.x, -vertex.normal.z, -vertex.normal.y]
-                )
             )
+        ]
+        if all(column is not None for column in columns):
+            planes = np.stack(columns, axis=1)
+    elif face_plane_mode in {"RECOMPUTE", "DX_FIX"}:
+        planes = geo_arrays.face_planes(geo.positions, loop_vertices, loop_total)
+    if planes is None:
+        centers = np.empty(face_count * 3, dtype=np.float32)
+        mesh.polygons.foreach_get("center", centers)
+        planes = np.ones((face_count, 4), dtype=np.float32)
+        planes[:, :3] = centers.reshape(-1, 3)
+    faces["plane"] = planes
+
+    # Ensure we have a UV layer
+    if face_count > 0 and mesh.uv_layers.active is None:
+        mesh.uv_layers.new()
+
+    nodes = np.zeros(loop_count, dtype=geo_arrays.NODE_DTYPE)
+    nodes["vertex_index"] = loop_vertices
+    nodes["normal_index"] = loop_vertices
+    if face_count > 0:
+        uvs = np.empty(loop_count * 2, dtype=np.float32)
+        mesh.uv_layers.active.data.foreach_get("uv", uvs)
+        uvs = uvs.reshape(-1, 2)
+        uvs[:, 1] = 1.0 - uvs[:, 1]
+        nodes["uv"] = uvs
+
+    geo.faces = faces
+    geo.nodes = nodes
+    geo.tag = int.from_bytes(b"OEG.", "little", signed=True)
+    geo.checksum = int(getattr(geo_pg, "GEOHeaderUnknown", 69)) if geo_pg else 69
+    geo.flags = int(getattr(geo_pg, "GEOHeaderUnknown2", 0)) if geo_pg else 0
+    geo.name = bytes(obj.name, "ascii", errors="ignore")
+    return geo
+
+
+def write_geo(filepath, geo):
+    """Pack a snapshot and write it; touches no bpy data."""
+    data = geo_arrays.pack_geo(geo)
+    with open(filepath, mode="wb") as file:  # b is important -> binary
+        file.write(data)
 
-        face_plane_mode = (face_plane_mode or "CURRENT").upper()
-
-        # Collect faces
-        for face in mesh.polygons:
-            # Get the basic data about the faces.
-            facematerial = ""
-            facecolor = [1, 1, 1]
-
-            if (
-                obj.data.materials is not None
-                and len(obj.data.materials) > 0
-                and face.material_index is not None
-            ):
-                mat = obj.data.materials[face.material_index]
-
-                # ------------------------------------------------------------------
-                # Default BZ texture name (MapTexture) from Blender material name
-                # if the Battlezone Texture Name field is blank.
-                # ------------------------------------------------------------------
-                tex_name = ""
-                if hasattr(mat, "MaterialPropertyGroup"):
-                    # Current value in the Battlezone Texture Name box
-                    raw = mat.MaterialPropertyGroup.MapTexture
-                    tex_name = (raw or "").strip()
-
-                    if not tex_name:
-                        tex_name = _get_image_derived_texture_name(mat)
-                    if not tex_name:
-                        tex_name = _derive_legacy_texture_name(mat.name)
-
-                    if tex_name:
-                        # Write back so the UI box auto-fills after export
-                        mat.MaterialPropertyGroup.MapTexture = tex_name
-
-                facematerial = tex_name
-                facecolor = getattr(mat, "diffuse_color", facecolor)
-
-            # Convert Blender's 0–1 color into 0–255 RGB
-            r = int(facecolor[0] * 255)
-            g = int(facecolor[1] * 255)
-            b = int(facecolor[2] * 255)
-
-            # Create a new face object to be added in the GEO we are exporting.
-            geo_pg = getattr(obj, "GEOPropertyGroup", None)
-            default_unknown = (
-                getattr(geo_pg, "GEOFaceUnknownDefault", 0) if geo_pg else 0
-            )
-            default_parent = getattr(geo_pg, "GEOFaceParentDefault", 0) if geo_pg else 0
-            default_node = getattr(geo_pg, "GEOFaceNodeDefault", 0) if geo_pg else 0
-            default_shade = (
-                getattr(geo_pg, "GEOFaceShadeTypeDefault", 4) if geo_pg else 4
-            )
-            default_texture = (
-                getattr(geo_pg, "GEOFaceTextureTypeDefault", 0) if geo_pg else 0
-            )
-            default_xluscent = (
-                getattr(geo_pg, "GEOFaceXluscentTypeDefault", 0) if geo_pg else 0
-            )
 
-            face_unknown = _get_face_attr_int(
-                "bz_face_unknown_raw", face.index, default_unknown
-            )
-            face_parent = _get_face_attr_int(
-                "bz_face_parent", face.index, default_parent
-            )
-            face_node = _get_face_attr_int("bz_face_node", face.index, default_node)
-            shade_type = (
-                _get_face_attr_int("bz_face_shade_type", face.index, default_shade)
-                & 0xFF
-            )
-            texture_type = (
-                _get_face_attr_int("bz_face_texture_type", face.index, default_texture)
-                & 0xFF
-            )
-            xluscent_type = (
-                _get_face_attr_int(
-                    "bz_face_xluscent_type", face.index, default_xluscent
-                )
-                & 0xFF
-            )
-            string_header_bytes = bytes([shade_type, texture_type, xluscent_type])
-
-            if face_plane_mode == "PRESERVE" and _has_face_plane_attrs(face.index):
-                plane_x = _get_face_attr_float(
-                    "bz_face_plane_x", face.index, face.center.x
-                )
-                plane_y = _get_face_attr_float(
-                    "bz_face_plane_y", face.index, face.center.y
-                )
-                plane_z = _get_face_attr_float(
-                    "bz_face_plane_z", face.index, face.center.z
-                )
-                plane_d = _get_face_attr_float("bz_face_plane_d", face.index, 1.0)
-            elif face_plane_mode in {"RECOMPUTE", "DX_FIX"}:
-                plane_x, plane_y, plane_z, plane_d = _compute_face_plane(mesh, face)
-            else:
-                plane_x = face.center.x
-                plane_y = face.center.y
-                plane_z = face.center.z
-                plane_d = 1.0
-
-            NewFace = geo_classes.GEOFace(
-                [
-                    face.index,  # Index
-                    len(face.vertices),  # Vertices
-                    r,
-                    g,
-                    b,  # Color
-                    plane_x,  # x
-                    plane_y,  # y
-                    plane_z,  # z
-                    plane_d,  # d
-                    face_unknown,  # unknown/raw int
-                    string_header_bytes,  # StringHeader (shade/texture/xluscent bytes)
-                    facematerial,  # MapName (texture name)
-                    face_parent,  # Parent
-                    face_node,  # Node
-                    "",  # Extra entry (ignored by GEOFace)
-                ]
-            )
-
-            # Ensure we have a UV layer
-            if mesh.uv_layers.active is None:
-                mesh.uv_layers.new()
-
-            # Gather UVs for our face vertices.
-            uv_layer = mesh.uv_layers.active.data
-            curvert = 0
-            for loop_index in range(face.loop_start, face.loop_start + face.loop_total):
-                vert_index = face.vertices[curvert]
-                u = uv_layer[loop_index].uv[0]
-                v = 1.0 - uv_layer[loop_index].uv[1]
-
-                NewFace.VertList.append(
-                    geo_classes.PolygonVert(
-                        [
-                            vert_index,  # vertID
-                            vert_index,  # vertID2 (often same as vertID)
-                            u,
-                            v,
-                        ]
-                    )
-                )
-                curvert += 1
-
-            Faces.append(NewFace)
-
-        import os
-        import struct
+def geoexport(context, filepath, obj, *, face_plane_mode="CURRENT"):
+    if obj is None:
+        raise ValueError("No object provided for GEO export.")
 
-        with open(filepath, mode="wb") as file:  # b is important -> binary
-            geo_pg = getattr(obj, "GEOPropertyGroup", None)
-            header_unknown = (
-                int(getattr(geo_pg, "GEOHeaderUnknown", 69)) if geo_pg else 69
-            )
-            header_unknown2 = (
-                int(getattr(geo_pg, "GEOHeaderUnknown2", 0)) if geo_pg else 0
-            )
-            NewHeader = geo_classes.GEOHeader(
-                [
-                    "OEG.",
-                    header_unknown,
-                    obj.name,
-                    len(Vertices),
-                    len(Faces),
-                    header_unknown2,
-                ]
-            )
-            buffer = bytearray(36)
-            struct.pack_into("=4si16siii", buffer, 0, *NewHeader.Read())
-            file.write(buffer)
-
-            for vertex in Vertices:
-                buffer = bytearray(12)
-                struct.pack_into("=fff", buffer, 0, *vertex.Read())
-                file.write(buffer)
-
-            for normal in Normals:
-                buffer = bytearray(12)
-                struct.pack_into("=fff", buffer, 0, *normal.Read())
-                file.write(buffer)
-
-            for face in Faces:
-                buffer = bytearray(55)
-                struct.pack_into("=iiBBBffffi3s13sii", buffer, 0, *face.Read())
-                file.write(buffer)
-                for vert in face.VertList:
-                    buffer = bytearray(16)
-                    struct.pack_into("=iiff", buffer, 0, *vert.Read())
-                    file.write(buffer)
+    view_layer, previous_active = _prepare_export_object(context, obj)
+    try:
+        geo = snapshot_geo(obj, face_plane_mode=face_plane_mode)
+        write_geo(filepath, geo)
     finally:
         if (
             view_layer is not None
@@ -387,6 +299,80 @@ def geoexport(context, filepath, obj, *, face_plane_mode="CURRENT"):
     return {"FINISHED"}
 
 
+def _run_inline(fn, *args):
+    # Same interface as executor.submit for the single-worker path.
+    future = Future()
+    try:
+        future.set_result(fn(*args))
+    except Exception as exc:
+        future.set_exception(exc)
+    return future
+
+
+def _timed_write(filepath, geo):
+    start = time.perf_counter()
+    write_geo(filepath, geo)
+    return time.perf_counter() - start
+
+
+def export_geos(context, jobs, *, face_plane_mode="CURRENT", workers=None):
+    """
+    Export several GEOs, e.g. every part of a VDF or SDF.
+
+    jobs is a sequence of (filepath, obj) pairs. Every mesh is snapshotted
+    on the calling thread first, with one material cache shared by all of
+    them, then packing and file writes run in a thread pool of `workers`
+    threads (None picks one per CPU, 1 disables the pool). Prints the
+    snapshot and write time of each GEO and returns them in job order as
+    (filepath, snapshot_seconds, write_seconds).
+    """
+    jobs = [(filepath, obj) for filepath, obj in jobs if obj is not None]
+    if not jobs:
+        return []
+    if workers is None:
+        workers = min(len(jobs), os.cpu_count() or 1)
+
+    material_cache = {}
+    snapshots = []
+    view_layer, previous_active = _prepare_export_object(context, None)
+    try:
+        for filepath, obj in jobs:
+            _prepare_export_object(context, obj)
+            start = time.perf_counter()
+            geo = snapshot_geo(
+                obj, face_plane_mode=face_plane_mode, material_cache=material_cache
+            )
+            snapshots.append((filepath, geo, time.perf_counter() - start))
+    finally:
+        if view_layer is not None and previous_active is not None:
+            view_layer.objects.active = previous_active
+
+    pool = ThreadPoolExecutor(max_workers=workers) if workers > 1 else None
+    submit = pool.submit if pool is not None else _run_inline
+    try:
+        pending = [
+            (filepath, geo, seconds, submit(_timed_write, filepath, geo))
+            for filepath, geo, seconds in snapshots
+        ]
+        timings = []
+        for filepath, geo, seconds, future in pending:
+            write_seconds = future.result()
+            print(
+                "[BZ GEO Export] %s: %d faces, snapshot %.1f ms, write %.1f ms"
+                % (
+                    os.path.basename(filepath),
+                    geo.face_count,
+                    seconds * 1000,
+                    write_seconds * 1000,
+                )
+            )
+            timings.append((filepath, seconds, write_seconds))
+    finally:
+        if pool is not None:
+            pool.shutdown()
+    return timings
+
+
 def export(context, *, filepath, face_plane_mode="CURRENT"):
     view_layer = getattr(context, "view_layer", None)
     active_obj = getattr(getattr(view_layer, "objects", None), "active", None)
@@ -11,14 +11,23 @@ import bpy
 import importlib
 import math
 import mathutils
+import numpy as np
 import os
 
+from . import anim_keys
+from . import bwd2_index
+from . import bwd2_writer
 from . import vdf_classes
 from . import export_geo
+from . import geo_bounds
 
 # Reload it just in case something changed!
+importlib.reload(anim_keys)
+importlib.reload(bwd2_index)
+importlib.reload(bwd2_writer)
 importlib.reload(vdf_classes)
 importlib.reload(export_geo)
+importlib.reload(geo_bounds)
 
 
 # Fixes failures to go by battlezone naming conventions.
@@ -34,81 +43,6 @@ def fixgeoname(name, lod):
     return "".join(geofilename)
 
 
-def _iter_action_fcurves(action):
-    fcurves = getattr(action, "fcurves", None)
-    if fcurves is not None:
-        yield from fcurves
-        return
-
-    for layer in getattr(action, "layers", []):
-        for strip in getattr(layer, "strips", []):
-            for channelbag in getattr(strip, "channelbags", []):
-                yield from getattr(channelbag, "fcurves", [])
-
-
-def GenerateGEOCollisions(object):
-    # Get the active object.
-    obj = object
-    # Get ready...
-    minx, miny, minz, maxx, maxy, maxz, maxoverall = [0.0] * 7
-    for vert in obj.data.vertices:
-        if vert.co.x < minx:
-            minx = vert.co.x
-        if vert.co.x > maxx:
-            maxx = vert.co.x
-        if vert.co.y < minz:
-            minz = vert.co.y
-        if vert.co.y > maxz:
-            maxz = vert.co.y
-        if vert.co.z < miny:
-            miny = vert.co.z
-        if vert.co.z > maxy:
-            maxy = vert.co.z
-        # Get maximum vertice distance to generate sphere radius.
-        for value in vert.co:
-            if abs(value) > maxoverall:
-                maxoverall = abs(value)
-
-    obj.GEOPropertyGroup.SphereRadius = maxoverall
-
-    obj.GEOPropertyGroup.GeoCenterX = (minx + maxx) / 2
-    obj.GEOPropertyGroup.GeoCenterY = (miny + maxy) / 2
-    obj.GEOPropertyGroup.GeoCenterZ = (minz + maxz) / 2
-
-    if abs(minx - obj.GEOPropertyGroup.GeoCenterX) >= abs(
-        maxx - obj.GEOPropertyGroup.GeoCenterX
-    ):
-        obj.GEOPropertyGroup.BoxHalfHeightX = abs(
-            minx - obj.GEOPropertyGroup.GeoCenterX
-        )
-    else:
-        obj.GEOPropertyGroup.BoxHalfHeightX = abs(
-            maxx - obj.GEOPropertyGroup.GeoCenterX
-        )
-
-    if abs(miny - obj.GEOPropertyGroup.GeoCenterY) >= abs(
-        maxy - obj.GEOPropertyGroup.GeoCenterY
-    ):
-        obj.GEOPropertyGroup.BoxHalfHeightY = abs(
-            miny - obj.GEOPropertyGroup.GeoCenterY
-        )
-    else:
-        obj.GEOPropertyGroup.BoxHalfHeightY = abs(
-            maxy - obj.GEOPropertyGroup.GeoCenterY
-        )
-
-    if abs(minz - obj.GEOPropertyGroup.GeoCenterZ) >= abs(
-        maxz - obj.GEOPropertyGroup.GeoCenterZ
-    ):
-        obj.GEOPropertyGroup.BoxHalfHeightZ = abs(
-            minz - obj.GEOPropertyGroup.GeoCenterZ
-        )
-    else:
-        obj.GEOPropertyGroup.BoxHalfHeightZ = abs(
-            maxz - obj.GEOPropertyGroup.GeoCenterZ
-        )
-
-
 def _is_null_blender_object(blender_object):
     if blender_object is None:
         return True
@@ -288,6 +222,7 @@ def export(
     """
     Matrix = mathutils.Matrix
     Vector = mathutils.Vector
+    geo_jobs = []
     for object in _iter_export_objects(context):
         is_mesh_object = (
             getattr(object, "type", None) == "MESH"
@@ -434,7 +369,7 @@ def export(
                 GEO.matrix[2] = float(axis[2]) * speed
 
             if object.GEOPropertyGroup.GenerateCollision and is_mesh_object:
-                GenerateGEOCollisions(object)
+                geo_bounds.apply_collision_bounds(object)
 
             GEO.geocenter = [
                 object.GEOPropertyGroup.GeoCenterX,
@@ -453,70 +388,22 @@ def export(
             if GEO.lod == 1:
                 lodcount = lodcount + 1
             if not ExportVDFOnly and is_mesh_object and not spinner_helper:
-                # Go ahead and write the .geo.
-                export_geo.geoexport(
-                    context,
-                    os.path.dirname(filepath) + "/" + GEO.name + ".geo",
-                    object,
-                    face_plane_mode=face_plane_mode,
+                # Queue the .geo; all of them are written after this loop.
+                geo_jobs.append(
+                    (os.path.dirname(filepath) + "/" + GEO.name + ".geo", object)
                 )
             # Special class(BlenderObject) I made for putting object and geo in one nice package to keep track of both.
             BlenderObject = vdf_classes.BlenderObject(object, GEO)
             blenderobjects.update({GEO.name: BlenderObject})
 
+    # Snapshot every mesh here, then pack and write the .geo files in parallel.
+    export_geo.export_geos(context, geo_jobs, face_plane_mode=face_plane_mode)
+
     """
     Load all the keyframes for more specific handling below.
     """
     for object in blenderobjects.values():
-        blobject = object.object
-        anim = blobject.animation_data
-        # Is there animation data at all?
-        if anim is not None and anim.action is not None:
-            quat_anim = {}
-            has_euler_keys = False
-            # Prefer quaternion curves if the object is actually in quaternion mode.
-            prefer_quat = getattr(blobject, "rotation_mode", "XYZ") == "QUATERNION"
-            for curve in _iter_action_fcurves(anim.action):
-                data_path = curve.data_path
-                for akeyframe in curve.keyframe_points:
-                    keyframe = int(akeyframe.co[0])
-                    keyvalue = akeyframe.co[1]
-                    # Euler rotation curves (only if we don't explicitly prefer quats)
-                    if data_path == "rotation_euler" and not prefer_quat:
-                        has_euler_keys = True
-                        if keyframe not in object.rotanim:
-                            object.rotanim[keyframe] = [0.0, 0.0, 0.0]
-                        object.rotanim[keyframe][curve.array_index] = keyvalue
-                    # Quaternion rotation curves
-                    elif data_path == "rotation_quaternion":
-                        if keyframe not in quat_anim:
-                            # Identity quaternion (w, x, y, z)
-                            quat_anim[keyframe] = [1.0, 0.0, 0.0, 0.0]
-                        quat_anim[keyframe][curve.array_index] = keyvalue
-                    # Location curves
-                    elif data_path == "location":
-                        if keyframe not in object.posanim:
-                            object.posanim[keyframe] = [0.0, 0.0, 0.0]
-                        object.posanim[keyframe][curve.array_index] = keyvalue
-                    elif data_path == "scale":
-                        if keyframe not in object.scaleanim:
-                            object.scaleanim[keyframe] = [
-                                float(v) for v in blobject.scale
-                            ]
-                        object.scaleanim[keyframe][curve.array_index] = keyvalue
-
-            # If we have quaternion curves, convert them to Euler
-            # - always, when the object is in QUATERNION mode
-            # - otherwise, only if we didn't find usable Euler keys
-            if quat_anim and (prefer_quat or not has_euler_keys):
-                from mathutils import Quaternion
-
-                for frame, quat_vals in quat_anim.items():
-                    q = Quaternion(quat_vals)  # (w, x, y, z)
-                    # Convert to Euler in Blender's default XYZ order;
-                    # later we remap to the Battlezone YZX convention.
-                    eul = q.to_euler("XYZ")
-                    object.rotanim[frame] = [eul.x, eul.y, eul.z]
+        object.animkeys = anim_keys.collect_anim_keys(object.object)
 
     """
     Read the element data in blender and get it ready for writing later.
@@ -565,48 +452,22 @@ def export(
             0.0,
         ]
         neworientation.matrix2 = object.geo.matrix
-        pos_count = len(object.posanim)
-        scale_count = len(object.scaleanim) if use_translation2 else 0
-        neworientation.positionindex = pos_index if pos_count > 0 else 0
-        neworientation.positioncount = pos_count
-        neworientation.translation2index = trans2_index if scale_count > 0 else 0
-        neworientation.translation2count = scale_count
-        if len(object.rotanim) > 0:
-            neworientation.rotationindex = rot_index
-        else:
-            neworientation.rotationindex = 0
-        neworientation.rotationcount = len(object.rotanim)
+        keys = object.animkeys
+        scales = keys.scales if use_translation2 else keys.scales[:0]
+        neworientation.positionindex = pos_index if len(keys.positions) > 0 else 0
+        neworientation.positioncount = len(keys.positions)
+        neworientation.translation2index = trans2_index if len(scales) > 0 else 0
+        neworientation.translation2count = len(scales)
+        neworientation.rotationindex = rot_index if len(keys.rotations) > 0 else 0
+        neworientation.rotationcount = len(keys.rotations)
         ANIMOrientations.append(neworientation)
-        for key, array in object.rotanim.items():
-            newrotation = vdf_classes.ANIMRotation()
-            newrotation.frame = key
-            eul = mathutils.Euler((0.0, math.radians(45.0), 0.0), "YZX")
-            eul[:] = array[0], array[2], array[1]
-            quaternion = eul.to_quaternion()
-            newrotation.translate = quaternion[:]
-            rot_index = rot_index + 1
-            ANIMRotations.append(newrotation)
-        for key, array in object.posanim.items():
-            tx, ty, tz = array[0], array[2], array[1]
-            if object.object.parent != None:
-                # Get the parent inverse if it exists and add it on to the animation to create an accurate offset for animations.
-                ObjectInverse = object.object.matrix_parent_inverse.to_translation()
-                tx = ObjectInverse.x + array[0]
-                ty = ObjectInverse.z + array[2]
-                tz = ObjectInverse.y + array[1]
-
-            newposition = vdf_classes.ANIMPosition()
-            newposition.frame = key
-            newposition.translate = tx, ty, tz
-            pos_index = pos_index + 1
-            ANIMPositions.append(newposition)
-        if use_translation2:
-            for key, array in object.scaleanim.items():
-                newtranslation = vdf_classes.ANIMTranslation2()
-                newtranslation.frame = key
-                newtranslation.translate = array[0], array[2], array[1]
-                trans2_index = trans2_index + 1
-                ANIMTranslations.append(newtranslation)
+        # Keyframe records are already in ANIM layout; written as is below.
+        ANIMRotations.append(keys.rotations)
+        ANIMTranslations.append(scales)
+        ANIMPositions.append(keys.positions)
+        rot_index = rot_index + len(keys.rotations)
+        trans2_index = trans2_index + len(scales)
+        pos_index = pos_index + len(keys.positions)
 
     """
     Reorder objects based on parenting and lods. If they are the wrong order, everything will blow up!
@@ -658,168 +519,140 @@ def export(
     _enforce_spinner_helper_order(objects)
 
     # Ok, lets get to writing the VDF data.
-    with open(filepath, mode="wb") as file:  # b is important -> binary
-        position = 0
-
-        position = VDFHeader.Write(file, position)  # Write VDF header.
-
-        position = VDFC.Write(file, position)  # Write VDFC section.
-        position = EXIT.Write(file, position)  # End VDFC
-
-        # Write VGEO section.
-        # Set the VGEO count to the lod with the highest amount of GEOs.
-        VGEO.geocount = lodcount
-        VGEO.sectionlength = ((VGEO.geocount * 100) * 28) + VGEO.binlength
-        position = VGEO.Write(file, position)
-
-        # Write geo data. We need to also fill empty slots with empty geo stuff.
-
-        # Write LOD1
-        for object in objects[0]:
-            object.geo.Write(file, position)
-
-        # Write blanks!
-        for i in range(3):
-            for i in range(lodcount):
-                NULLGEO.Write(file, position)
-
-        # Write LOD2
-        for object in objects[1]:
-            object.geo.Write(file, position)
-
-        # Write blanks! Again...
-        for i in range(3):
-            for i in range(lodcount):
-                NULLGEO.Write(file, position)
-
-        # Write LOD3
-        for object in objects[2]:
-            object.geo.Write(file, position)
-
-        # Write EVEN MORE BLANKS! Wow! What a waste of space...
-        for i in range(19):
-            for i in range(lodcount):
-                NULLGEO.Write(file, position)
-
-        # Write ANIM header or don't...
-        if len(ANIMElements) > 0 and ExportAnimations:
-            ANIM.elementscount = len(ANIMElements)
-            ANIM.orientationscount = len(ANIMOrientations)
-            ANIM.rotationcount = len(ANIMRotations)
-            ANIM.translation2count = len(ANIMTranslations)
-            ANIM.positioncount = len(ANIMPositions)
-            if getattr(
-                context.scene.SDFVDFPropertyGroup, "UseAdvancedAnimHeader", False
-            ):
-                ANIM.null2 = int(context.scene.SDFVDFPropertyGroup.AnimNull2)
-                ANIM.unknown2 = int(context.scene.SDFVDFPropertyGroup.AnimUnknown2)
-                ANIM._reserved = [
-                    int(v) for v in context.scene.SDFVDFPropertyGroup.AnimReserved
-                ]
-            else:
-                ANIM.null2 = 0
-                ANIM.unknown2 = 0
-                ANIM._reserved = [0, 0, 0, 0, 0]
-            ANIM.sectionlength = (
-                ANIM.binlength
-                + (ANIM.elementscount * 148)
-                + (ANIM.orientationscount * 132)
-                + (ANIM.rotationcount * 20)
-                + (ANIM.translation2count * 16)
-                + (ANIM.positioncount * 16)
-            )
-            position = ANIM.Write(file, position)
-
-            # Write ANIM elements.
-            for element in ANIMElements:
-                position = element.Write(file, position)
-
-            # Write ANIM orientations.
-            for orientation in ANIMOrientations:
-                position = orientation.Write(file, position)
-
-            # Write ANIM rotations.
-            for animrotation in ANIMRotations:
-                position = animrotation.Write(file, position)
-
-            # Write ANIM translation2.
-            for animtranslation in ANIMTranslations:
-                position = animtranslation.Write(file, position)
-
-            # Write ANIM positions.
-            for animposition in ANIMPositions:
-                position = animposition.Write(file, position)
-
-            position = EXIT.Write(file, position)  # Need an extra exit for animations.
-        position = EXIT.Write(file, position)  # Need an exit for VGEO
-
-        XInMin, XInMax, YInMin, YInMax, ZInMin, ZInMax = [0.0] * 6
-        XOutMin, XOutMax, YOutMin, YOutMax, ZOutMin, ZOutMax = [0.0] * 6
-        if collisioninner != None:
-            # Set the initial values to an already existing mesh vertice.
-            XInMin = collisioninner.data.vertices[0].co.x
-            XInMax = collisioninner.data.vertices[0].co.x
-            YInMin = collisioninner.data.vertices[0].co.y
-            YInMax = collisioninner.data.vertices[0].co.y
-            ZInMin = collisioninner.data.vertices[0].co.z
-            ZInMax = collisioninner.data.vertices[0].co.z
-            for vert in collisioninner.data.vertices:
-                if vert.co.x < XInMin:
-                    XInMin = vert.co.x
-                if vert.co.x > XInMax:
-                    XInMax = vert.co.x
-                if vert.co.y < YInMin:
-                    YInMin = vert.co.y
-                if vert.co.y > YInMax:
-                    YInMax = vert.co.y
-                if vert.co.z < ZInMin:
-                    ZInMin = vert.co.z
-                if vert.co.z > ZInMax:
-                    ZInMax = vert.co.z
-        if collisionouter != None:
-            # Set the initial values to an already existing mesh vertice.
-            XOutMin = collisionouter.data.vertices[0].co.x
-            XOutMax = collisionouter.data.vertices[0].co.x
-            YOutMin = collisionouter.data.vertices[0].co.y
-            YOutMax = collisionouter.data.vertices[0].co.y
-            ZOutMin = collisionouter.data.vertices[0].co.z
-            ZOutMax = collisionouter.data.vertices[0].co.z
-            for vert in collisionouter.data.vertices:
-                if vert.co.x < XOutMin:
-                    XOutMin = vert.co.x
-                if vert.co.x > XOutMax:
-                    XOutMax = vert.co.x
-                if vert.co.y < YOutMin:
-                    YOutMin = vert.co.y
-                if vert.co.y > YOutMax:
-                    YOutMax = vert.co.y
-                if vert.co.z < ZOutMin:
-                    ZOutMin = vert.co.z
-                if vert.co.z > ZOutMax:
-                    ZOutMax = vert.co.z
-
-        COLP.data = [
-            YOutMax,
-            YInMax,
-            YInMin,
-            YOutMin,
-            XOutMax,
-            XInMax,
-            XInMin,
-            XOutMin,
-            ZOutMax,
-            ZInMax,
-            ZInMin,
-            ZOutMin,
-        ]
-        position = COLP.Write(file, position)
-        position = EXIT.Write(file, position)  # End COLP
-
-        if getattr(context.scene.SDFVDFPropertyGroup, "UseCustomSCPS", False):
-            SCPS.data = [int(v) for v in context.scene.SDFVDFPropertyGroup.SCPSData]
+    # Every section is sized first, then the whole file is packed into one
+    # buffer and written in one go.
+
+    # Set the VGEO count to the lod with the highest amount of GEOs.
+    VGEO.geocount = lodcount
+    VGEO.sectionlength = ((VGEO.geocount * 100) * 28) + VGEO.binlength
+
+    # Write ANIM header or don't...
+    WriteAnimation = len(ANIMElements) > 0 and ExportAnimations
+    if WriteAnimation:
+        ANIM.elementscount = len(ANIMElements)
+        ANIM.orientationscount = len(ANIMOrientations)
+        ANIM.rotationcount = rot_index
+        ANIM.translation2count = trans2_index
+        ANIM.positioncount = pos_index
+        if getattr(context.scene.SDFVDFPropertyGroup, "UseAdvancedAnimHeader", False):
+            ANIM.null2 = int(context.scene.SDFVDFPropertyGroup.AnimNull2)
+            ANIM.unknown2 = int(context.scene.SDFVDFPropertyGroup.AnimUnknown2)
+            ANIM._reserved = [
+                int(v) for v in context.scene.SDFVDFPropertyGroup.AnimReserved
+            ]
         else:
-            SCPS.data = [0, 0, 0]
-        position = SCPS.Write(file, position)
-        position = EXIT.Write(file, position)  # END SPCS
+            ANIM.null2 = 0
+            ANIM.unknown2 = 0
+            ANIM._reserved = [0, 0, 0, 0, 0]
+        ANIM.sectionlength = (
+            ANIM.binlength
+            + (ANIM.elementscount * 148)
+            + (ANIM.orientationscount * 132)
+            + (ANIM.rotationcount * 20)
+            + (ANIM.translation2count * 16)
+            + (ANIM.positioncount * 16)
+        )
+
+    XInMin, XInMax, YInMin, YInMax, ZInMin, ZInMax = [0.0] * 6
+    XOutMin, XOutMax, YOutMin, YOutMax, ZOutMin, ZOutMax = [0.0] * 6
+    if collisioninner != None:
+        # Set the initial values to an already existing mesh vertice.
+        XInMin = collisioninner.data.vertices[0].co.x
+        XInMax = collisioninner.data.vertices[0].co.x
+        YInMin = collisioninner.data.vertices[0].co.y
+        YInMax = collisioninner.data.vertices[0].co.y
+        ZInMin = collisioninner.data.vertices[0].co.z
+        ZInMax = collisioninner.data.vertices[0].co.z
+        for vert in collisioninner.data.vertices:
+            if vert.co.x < XInMin:
+                XInMin = vert.co.x
+            if vert.co.x > XInMax:
+                XInMax = vert.co.x
+            if vert.co.y < YInMin:
+                YInMin = vert.co.y
+            if vert.co.y > YInMax:
+                YInMax = vert.co.y
+            if vert.co.z < ZInMin:
+                ZInMin = vert.co.z
+            if vert.co.z > ZInMax:
+                ZInMax = vert.co.z
+    if collisionouter != None:
+        # Set the initial values to an already existing mesh vertice.
+        XOutMin = collisionouter.data.vertices[0].co.x
+        XOutMax = collisionouter.data.vertices[0].co.x
+        YOutMin = collisionouter.data.vertices[0].co.y
+        YOutMax = collisionouter.data.vertices[0].co.y
+        ZOutMin = collisionouter.data.vertices[0].co.z
+        ZOutMax = collisionouter.data.vertices[0].co.z
+        for vert in collisionouter.data.vertices:
+            if vert.co.x < XOutMin:
+                XOutMin = vert.co.x
+            if vert.co.x > XOutMax:
+                XOutMax = vert.co.x
+            if vert.co.y < YOutMin:
+                YOutMin = vert.co.y
+            if vert.co.y > YOutMax:
+                YOutMax = vert.co.y
+            if vert.co.z < ZOutMin:
+                ZOutMin = vert.co.z
+            if vert.co.z > ZOutMax:
+                ZOutMax = vert.co.z
+
+    COLP.data = [
+        YOutMax,
+        YInMax,
+        YInMin,
+        YOutMin,
+        XOutMax,
+        XInMax,
+        XInMin,
+        XOutMin,
+        ZOutMax,
+        ZInMax,
+        ZInMin,
+        ZOutMin,
+    ]
+    if getattr(context.scene.SDFVDFPropertyGroup, "UseCustomSCPS", False):
+        SCPS.data = [int(v) for v in context.scene.SDFVDFPropertyGroup.SCPSData]
+    else:
+        SCPS.data = [0, 0, 0]
+
+    size = (
+        VDFHeader.binlength
+        + VDFC.binlength
+        + EXIT.binlength
+        + VGEO.sectionlength
+        + (ANIM.sectionlength + EXIT.binlength if WriteAnimation else 0)
+        + EXIT.binlength
+        + COLP.binlength
+        + EXIT.binlength
+        + SCPS.binlength
+        + EXIT.binlength
+    )
+    writer = bwd2_writer.BWD2Writer(size)
+    writer.pack(VDFHeader, VDFC, EXIT)  # VDF header, VDFC and its end.
+    writer.pack(VGEO)
+
+    # Geo data: 28 bands of lodcount slots. LOD1, LOD2 and LOD3 go in bands
+    # 0, 4 and 8; every other slot is an empty NULL geo.
+    geotable = writer.records(bwd2_index.VDF_GEO_DTYPE, (28, lodcount))
+    nullrecord = np.zeros((), bwd2_index.VDF_GEO_DTYPE)
+    NULLGEO.WriteRecord(nullrecord)
+    geotable[...] = nullrecord
+    for lod, lodobjects in enumerate(objects):
+        for slot, object in enumerate(lodobjects):
+            object.geo.WriteRecord(geotable[lod * 4, slot])
+
+    if WriteAnimation:
+        writer.pack(ANIM, *ANIMElements, *ANIMOrientations)
+        # Write ANIM rotations, translation2 and positions.
+        for keys in ANIMRotations + ANIMTranslations + ANIMPositions:
+            writer.write_records(keys)
+        writer.pack(EXIT)  # Need an extra exit for animations.
+    writer.pack(EXIT)  # Need an exit for VGEO
+
+    writer.pack(COLP, EXIT)  # COLP and its end.
+    writer.pack(SCPS, EXIT)  # SPCS and its end.
+    writer.save(filepath)
 
     return {"FINISHED"}
@@ -0,0 +1,518 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+NumPy reader and writer for BZ98 .geo files.
+
+Parses a whole GEO into flat arrays instead of one object per record:
+vertex positions and normals are (N, 3) float32 arrays, the face table is
+a FACE_DTYPE structured array, and the polygon vertices of every face are
+concatenated into one NODE_DTYPE array. Face i owns
+nodes[node_offsets[i]:node_offsets[i + 1]].
+
+Also computes face planes for export and validation. Shared by the
+Blender importer and exporter (import_geo, export_geo), validation and the
+Redux porter (bzrmodelporter.bzgeo_serializer); it has no bpy dependency.
+"""
+
+import struct
+import time
+
+import numpy as np
+
+HEADER_DTYPE = np.dtype(
+    [
+        ("tag", "<i4"),
+        ("checksum", "<i4"),
+        ("name", "S16"),
+        ("vert_count", "<i4"),
+        ("face_count", "<i4"),
+        ("flags", "<i4"),
+    ]
+)
+
+# One face record, without its polygon vertices (55 bytes, unaligned).
+FACE_DTYPE = np.dtype(
+    [
+        ("index", "<i4"),
+        ("vertex_count", "<i4"),
+        ("color", "u1", (3,)),
+        ("plane", "<f4", (4,)),  # surface normal xyz, distance
+        ("poly_area", "<f4"),
+        ("shade_type", "u1"),
+        ("texture_type", "u1"),
+        ("xluscent_type", "u1"),
+        ("texture_name", "S13"),
+        ("parent", "<i4"),
+        ("tree_branch", "<u4"),
+    ]
+)
+
+# One polygon vertex (16 bytes).
+NODE_DTYPE = np.dtype(
+    [
+        ("vertex_index", "<i4"),
+        ("normal_index", "<i4"),
+        ("uv", "<f4", (2,)),
+    ]
+)
+
+_VERTEX_COUNT = struct.Struct("<i")
+_COUNT_DTYPE = np.dtype("<i4")
+
+# Face table walk tuning: the first and largest number of faces checked per
+# fixed-stride guess, and faces stepped one by one after a short run.
+_MIN_RUN = 32
+_MAX_PROBE = 8192
+_WALK_STEPS = 256
+
+
+class GeoArrays:
+    """Flat array view of one GEO file."""
+
+    def __init__(self):
+        self.tag = 0
+        self.checksum = 0
+        self.name = b""
+        self.flags = 0
+        self.positions = np.empty((0, 3), dtype=np.float32)
+        self.normals = np.empty((0, 3), dtype=np.float32)
+        self.faces = np.empty(0, dtype=FACE_DTYPE)
+        self.nodes = np.empty(0, dtype=NODE_DTYPE)
+        self.node_offsets = np.zeros(1, dtype=np.int64)
+        self.size = 0  # bytes consumed from the input
+
+    @property
+    def vert_count(self):
+        return len(self.positions)
+
+    @property
+    def face_count(self):
+        return len(self.faces)
+
+    def face_nodes(self, face_index):
+        """Polygon vertices of one face."""
+        offsets = self.node_offsets
+        return self.nodes[offsets[face_index] : offsets[face_index + 1]]
+
+    def node_face_indices(self):
+        """Face index of every entry in nodes."""
+        return np.repeat(
+            np.arange(self.face_count), self.faces["vertex_count"].astype(np.int64)
+        )
+
+
+def decode_names(names, decode):
+    """
+    Decode an 'S' array of fixed-length names, once per distinct value.
+
+    Returns a list of str with one entry per input row.
+    """
+    unique, inverse = np.unique(names, return_inverse=True)
+    decoded = [decode(name) for name in unique.tolist()]
+    return [decoded[i] for i in inverse.ravel().tolist()]
+
+
+def _walk_faces(data, position, first, stop, starts, counts):
+    """Step face by face from position over faces first..stop-1."""
+    unpack = _VERTEX_COUNT.unpack_from
+    last = len(data) - FACE_DTYPE.itemsize
+    for i in range(first, stop):
+        if position > last:
+            raise ValueError(f"GEO face table truncated at face {i}")
+        count = unpack(data, position + 4)[0]
+        if count < 0:
+            raise ValueError(f"GEO face {i} has negative vertex count {count}")
+        starts.append(position)
+        counts.append(count)
+        position += FACE_DTYPE.itemsize + count * NODE_DTYPE.itemsize
+    return position
+
+
+def _face_starts(data, face_count, offset):
+    """
+    Walk the variable-length face table; return start offsets and the end.
+
+    Each face's offset depends on every earlier vertex count, so the walk is
+    sequential. Runs of faces with the same vertex count (common: all-quad
+    or all-triangle stretches) are found in one step by assuming a fixed
+    stride and checking the counts at the predicted offsets; short runs fall
+    back to stepping face by face.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts = []
+    counts = []
+    last = len(data) - FACE_DTYPE.itemsize
+    position = offset
+    probe = _MIN_RUN
+    while len(starts) < face_count:
+        i = len(starts)
+        if position > last:
+            raise ValueError(f"GEO face table truncated at face {i}")
+        count = _VERTEX_COUNT.unpack_from(data, position + 4)[0]
+        if count < 0:
+            raise ValueError(f"GEO face {i} has negative vertex count {count}")
+        stride = FACE_DTYPE.itemsize + count * NODE_DTYPE.itemsize
+        n = min(face_count - i, probe, (last - position) // stride + 1)
+        guess = position + 4 + stride * np.arange(n, dtype=np.int64)
+        mismatch = np.flatnonzero(_gather_records(buf, guess, _COUNT_DTYPE) != count)
+        run = int(mismatch[0]) if len(mismatch) else n
+
+        starts.extend(range(position, position + stride * run, stride))
+        counts.extend([count] * run)
+        position += stride * run
+        if run == n:
+            probe = min(probe * 2, _MAX_PROBE)
+        else:
+            probe = _MIN_RUN
+            if run < _MIN_RUN:
+                stop = min(face_count, i + run + _WALK_STEPS)
+                position = _walk_faces(data, position, i + run, stop, starts, counts)
+    if position > len(data):
+        raise ValueError("GEO face table truncated in the last face")
+    return (
+        np.array(starts, dtype=np.int64),
+        np.array(counts, dtype=np.int64),
+        position,
+    )
+
+
+def _gather_records(buf, starts, dtype):
+    """Copy dtype.itemsize bytes from each start into one structured array."""
+    if len(starts) == 0:
+        return np.empty(0, dtype=dtype)
+    index = starts[:, None] + np.arange(dtype.itemsize)
+    return buf[index].view(dtype).reshape(len(starts))
+
+
+def parse_face_table(data, face_count, offset=0):
+    """
+    Parse face_count face records starting at offset in data.
+
+    Returns (faces, nodes, node_offsets, end) where end is the offset just
+    past the table. Raises ValueError on truncated or malformed input.
+    """
+    buf = np.frombuffer(data, dtype=np.uint8)
+    starts, counts, end = _face_starts(data, face_count, offset)
+
+    node_offsets = np.zeros(face_count + 1, dtype=np.int64)
+    np.cumsum(counts, out=node_offsets[1:])
+
+    # Node k of face i sits at starts[i] + 55 + 16 * (k - node_offsets[i]).
+    local = np.arange(node_offsets[-1], dtype=np.int64)
+    local -= np.repeat(node_offsets[:-1], counts)
+    node_starts = np.repeat(starts + FACE_DTYPE.itemsize, counts)
+    node_starts += local * NODE_DTYPE.itemsize
+
+    faces = _gather_records(buf, starts, FACE_DTYPE)
+    nodes = _gather_records(buf, node_starts, NODE_DTYPE)
+    return faces, nodes, node_offsets, end
+
+
+def parse_geo(data, offset=0):
+    """
+    Parse a complete GEO held in a bytes-like object.
+
+    Returns a GeoArrays. Raises ValueError on truncated or malformed input.
+    """
+    if len(data) < offset + HEADER_DTYPE.itemsize:
+        raise ValueError("GEO header truncated")
+    header = np.frombuffer(data, dtype=HEADER_DTYPE, count=1, offset=offset)[0]
+    vert_count = int(header["vert_count"])
+    face_count = int(header["face_count"])
+    if vert_count < 0 or face_count < 0:
+        raise ValueError(
+            f"GEO header has negative counts ({vert_count} vertices, {face_count} faces)"
+        )
+
+    geo = GeoArrays()
+    geo.tag = int(header["tag"])
+    geo.checksum = int(header["checksum"])
+    geo.name = bytes(header["name"])
+    geo.flags = int(header["flags"])
+
+    position = offset + HEADER_DTYPE.itemsize
+    vector_bytes = vert_count * 12
+    if len(data) < position + 2 * vector_bytes:
+        raise ValueError("GEO vertex data truncated")
+    geo.positions = np.frombuffer(
+        data, dtype="<f4", count=vert_count * 3, offset=position
+    ).reshape(vert_count, 3)
+    position += vector_bytes
+    geo.normals = np.frombuffer(
+        data, dtype="<f4", count=vert_count * 3, offset=position
+    ).reshape(vert_count, 3)
+    position += vector_bytes
+
+    geo.faces, geo.nodes, geo.node_offsets, end = parse_face_table(
+        data, face_count, position
+    )
+    geo.size = end - offset
+    return geo
+
+
+def valid_face_mask(geo):
+    """
+    Return a bool array marking the faces a mesh can be built from.
+
+    Mirrors what bmesh.faces.new rejects: faces with fewer than three
+    vertices, out-of-range or repeated vertex indices, and faces using the
+    same vertex set as an earlier kept face.
+    """
+    counts = geo.faces["vertex_count"].astype(np.int64)
+    vertex_ids = geo.nodes["vertex_index"].astype(np.int64)
+    face_ids = geo.node_face_indices()
+
+    valid = counts >= 3
+    out_of_range = (vertex_ids < 0) | (vertex_ids >= geo.vert_count)
+    valid[face_ids[out_of_range]] = False
+
+    # Sort vertex ids within each face; equal neighbours are repeats.
+    order = np.lexsort((vertex_ids, face_ids))
+    sorted_ids = vertex_ids[order]
+    repeated = (face_ids[1:] == face_ids[:-1]) & (sorted_ids[1:] == sorted_ids[:-1])
+    valid[face_ids[1:][repeated]] = False
+
+    # The sorted ids of face i are its vertex set; among faces of the same
+    # size, keep the first face with each set.
+    offsets = geo.node_offsets
+    for count in np.unique(counts[valid]).tolist():
+        candidates = np.flatnonzero(valid & (counts == count))
+        vertex_sets = sorted_ids[offsets[candidates][:, None] + np.arange(count)]
+        _, first = np.unique(vertex_sets, axis=0, return_index=True)
+        duplicate = np.ones(len(candidates), dtype=bool)
+        duplicate[first] = False
+        valid[candidates[duplicate]] = False
+    return valid
+
+
+def face_planes(positions, loop_vertices, loop_totals, return_areas=False):
+    """
+    Plane of every polygon by Newell's method, as (F, 4) normal xyz, distance.
+
+    positions is (V, 3); loop_vertices holds the vertex index of every
+    polygon corner, polygon by polygon, and loop_totals the corner count of
+    each polygon. The distance is measured at the polygon's centroid.
+    Polygons with fewer than three corners or zero area get normal (0, 0, 1).
+    With return_areas, also returns each polygon's area.
+    """
+    positions = np.asarray(positions, dtype=np.float64)
+    totals = np.asarray(loop_totals, dtype=np.int64)
+    face_count = len(totals)
+    starts = np.zeros(face_count, dtype=np.int64)
+    np.cumsum(totals[:-1], out=starts[1:])
+
+    planes = np.zeros((face_count, 4), dtype=np.float64)
+    planes[:, 2] = 1.0
+    areas = np.zeros(face_count, dtype=np.float64)
+    used = totals > 0
+    if not used.any():
+        return (planes, areas) if return_areas else planes
+
+    points = positions[np.asarray(loop_vertices, dtype=np.int64)]
+    # Each corner's successor, wrapping to the first corner of its polygon.
+    following = np.arange(1, len(points) + 1)
+    following[starts[used] + totals[used] - 1] = starts[used]
+    a = points
+    b = points[following]
+    terms = np.stack(
+        (
+            (a[:, 1] - b[:, 1]) * (a[:, 2] + b[:, 2]),
+            (a[:, 2] - b[:, 2]) * (a[:, 0] + b[:, 0]),
+            (a[:, 0] - b[:, 0]) * (a[:, 1] + b[:, 1]),
+        ),
+        axis=1,
+    )
+    # reduceat needs non-empty segments; skip polygons without corners.
+    normals = np.add.reduceat(terms, starts[used], axis=0)
+    centroids = np.add.reduceat(points, starts[used], axis=0)
+    centroids /= totals[used, None]
+
+    lengths = np.sqrt((normals * normals).sum(axis=1))
+    flat = (lengths > 0.0) & (totals[used] >= 3)
+    normals[flat] /= lengths[flat, None]
+    normals[~flat] = (0.0, 0.0, 1.0)
+
+    planes[used, :3] = normals
+    planes[used, 3] = (normals * centroids).sum(axis=1)
+    areas[used] = np.where(totals[used] >= 3, lengths * 0.5, 0.0)
+    return (planes, areas) if return_areas else planes
+
+
+def plane_deviation(planes, positions, loop_vertices, loop_totals):
+    """Largest distance of any polygon corner from its polygon's plane."""
+    totals = np.asarray(loop_totals, dtype=np.int64)
+    deviation = np.zeros(len(totals), dtype=np.float64)
+    used = totals > 0
+    if not used.any():
+        return deviation
+    points = np.asarray(positions, dtype=np.float64)[
+        np.asarray(loop_vertices, dtype=np.int64)
+    ]
+    face_ids = np.repeat(np.arange(len(totals)), totals)
+    distance = np.abs((points * planes[face_ids, :3]).sum(axis=1) - planes[face_ids, 3])
+    np.maximum.at(deviation, face_ids, distance)
+    return deviation
+
+
+def mesh_loop_arrays(mesh):
+    """
+    Fetch a Blender mesh's corners for face_planes, in GEO coordinates.
+
+    Returns (positions, loop_vertices, loop_totals) with positions swapped
+    from Blender Z-up to GEO Y-up.
+    """
+    positions = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", positions)
+    positions = positions.reshape(-1, 3)[:, [0, 2, 1]]
+    loop_vertices = np.empty(len(mesh.loops), dtype=np.int32)
+    mesh.loops.foreach_get("vertex_index", loop_vertices)
+    loop_totals = np.empty(len(mesh.polygons), dtype=np.int32)
+    mesh.polygons.foreach_get("loop_total", loop_totals)
+    return positions, loop_vertices, loop_totals
+
+
+def read_geo_file(filepath):
+    """Read and parse a .geo file from disk."""
+    with open(filepath, "rb") as f:
+        return parse_geo(f.read())
+
+
+def pack_geo(geo):
+    """
+    Serialize a GeoArrays into GEO file bytes.
+
+    The header, vectors and face table are assembled in one preallocated
+    buffer; face records and their polygon vertices are scattered into it
+    at offsets derived from faces["vertex_count"], which must add up to
+    len(geo.nodes).
+    """
+    counts = geo.faces["vertex_count"].astype(np.int64)
+    if counts.sum() != len(geo.nodes):
+        raise ValueError(
+            f"GEO faces reference {counts.sum()} polygon vertices, got {len(geo.nodes)}"
+        )
+    vert_count = len(geo.positions)
+    face_count = len(geo.faces)
+    table_offset = HEADER_DTYPE.itemsize + 2 * vert_count * 12
+    record_sizes = FACE_DTYPE.itemsize + counts * NODE_DTYPE.itemsize
+
+    buf = np.zeros(table_offset + int(record_sizes.sum()), dtype=np.uint8)
+    header = buf[: HEADER_DTYPE.itemsize].view(HEADER_DTYPE)
+    header["tag"] = geo.tag
+    header["checksum"] = geo.checksum
+    header["name"] = geo.name
+    header["vert_count"] = vert_count
+    header["face_count"] = face_count
+    header["flags"] = geo.flags
+
+    vectors = buf[HEADER_DTYPE.itemsize : table_offset].view("<f4")
+    vectors[: vert_count * 3] = np.asarray(geo.positions).reshape(-1)
+    vectors[vert_count * 3 :] = np.asarray(geo.normals).reshape(-1)
+
+    starts = np.zeros(face_count, dtype=np.int64)
+    np.cumsum(record_sizes[:-1], out=starts[1:])
+    starts += table_offset
+    local = np.arange(len(geo.nodes), dtype=np.int64)
+    local -= np.repeat(np.cumsum(counts) - counts, counts)
+    node_starts = np.repeat(starts + FACE_DTYPE.itemsize, counts)
+    node_starts += local * NODE_DTYPE.itemsize
+
+    faces = np.ascontiguousarray(geo.faces, dtype=FACE_DTYPE).view(np.uint8)
+    nodes = np.ascontiguousarray(geo.nodes, dtype=NODE_DTYPE).view(np.uint8)
+    face_bytes = np.arange(FACE_DTYPE.itemsize)
+    node_bytes = np.arange(NODE_DTYPE.itemsize)
+    buf[starts[:, None] + face_bytes] = faces.reshape(face_count, len(face_bytes))
+    buf[node_starts[:, None] + node_bytes] = nodes.reshape(-1, len(node_bytes))
+    return buf.tobytes()
+
+
+def _parse_records(data):
+    """Per-record struct.unpack parse, as the importer did before; for timing."""
+    position = 36
+    header = struct.unpack("=4si16siii", data[:position])
+    vertices = []
+    for _ in range(header[3]):
+        vertices.append(struct.unpack("=fff", data[position : position + 12]))
+        position += 12
+    normals = []
+    for _ in range(header[3]):
+        normals.append(struct.unpack("=fff", data[position : position + 12]))
+        position += 12
+    faces = []
+    for _ in range(header[4]):
+        face = struct.unpack("=iiBBBffffi3s13sii", data[position : position + 55])
+        position += 55
+        nodes = []
+        for _ in range(face[1]):
+            nodes.append(struct.unpack("iiff", data[position : position + 16]))
+            position += 16
+        faces.append((face, nodes))
+    return vertices, normals, faces
+
+
+def synthetic_geo(vert_count=20000, face_count=20000, degree=4, seed=0):
+    """Build GEO file bytes with random vertices and degree-sided faces."""
+    rng = np.random.default_rng(seed)
+    header = np.zeros(1, dtype=HEADER_DTYPE)
+    header["tag"] = int.from_bytes(b".GEO", "big", signed=True)
+    header["name"] = b"benchmark"
+    header["vert_count"] = vert_count
+    header["face_count"] = face_count
+
+    record = np.dtype([("face", FACE_DTYPE), ("nodes", NODE_DTYPE, (degree,))])
+    records = np.zeros(face_count, dtype=record)
+    records["face"]["index"] = np.arange(face_count)
+    records["face"]["vertex_count"] = degree
+    records["face"]["color"] = rng.integers(0, 256, size=(face_count, 3))
+    records["face"]["plane"] = rng.normal(size=(face_count, 4))
+    records["face"]["shade_type"] = 4
+    records["face"]["texture_type"] = 1
+    records["face"]["texture_name"] = b"bench.map"
+    records["face"]["parent"] = -1
+    records["nodes"]["vertex_index"] = rng.integers(
+        0, vert_count, size=(face_count, degree)
+    )
+    records["nodes"]["normal_index"] = records["nodes"]["vertex_index"]
+    records["nodes"]["uv"] = rng.random(size=(face_count, degree, 2))
+
+    vectors = rng.normal(size=(2, vert_count, 3)).astype("<f4")
+    return header.tobytes() + vectors.tobytes() + records.tobytes()
+
+
+def benchmark_parse(sources=None, repeat=3):
+    """
+    Time the per-record struct parser against parse_geo.
+
+    sources is a list of (label, bytes); a synthetic 20k-face GEO is used
+    when it is empty. Returns {label: {"faces", "nodes", "struct", "numpy"}}
+    with best times in seconds.
+    """
+    if not sources:
+        sources = [("synthetic", synthetic_geo())]
+
+    def best_time(fn, data):
+        best = None
+        for _ in range(max(1, repeat)):
+            start = time.perf_counter()
+            fn(data)
+            elapsed = time.perf_counter() - start
+            best = elapsed if best is None else min(best, elapsed)
+        return best
+
+    results = {}
+    for label, data in sources:
+        geo = parse_geo(data)
+        results[label] = {
+            "faces": geo.face_count,
+            "nodes": len(geo.nodes),
+            "struct": best_time(_parse_records, data),
+            "numpy": best_time(parse_geo, data),
+        }
+    return results
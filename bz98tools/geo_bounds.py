@@ -0,0 +1,78 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+Bounds of GEO meshes for the VDF/SDF collision fields (GEO center, box
+half heights and sphere radius). Coordinates are read with foreach_get
+and reduced in NumPy; results are cached per mesh and reused while its
+vertex positions are unchanged.
+"""
+
+import hashlib
+from collections import namedtuple
+
+import numpy as np
+
+# All vectors are in GEO axes (Blender X, Z, Y). minimum and maximum
+# include the GEO origin, and radius is the largest absolute coordinate,
+# matching what the exporters have always written.
+GeoBounds = namedtuple("GeoBounds", "minimum maximum center half_extents radius")
+
+# mesh name -> (position digest, GeoBounds)
+_bounds_cache = {}
+
+
+def mesh_positions(mesh):
+    """Vertex positions of a Blender mesh as an (N, 3) float32 GEO array."""
+    co = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", co)
+    return co.reshape(-1, 3)[:, [0, 2, 1]]
+
+
+def compute_bounds(positions):
+    """GeoBounds for an (N, 3) array of GEO-space positions."""
+    positions = np.asarray(positions, dtype=np.float64).reshape(-1, 3)
+    if len(positions):
+        minimum = np.minimum(positions.min(axis=0), 0.0)
+        maximum = np.maximum(positions.max(axis=0), 0.0)
+        radius = float(np.abs(positions).max())
+    else:
+        minimum = np.zeros(3)
+        maximum = np.zeros(3)
+        radius = 0.0
+    center = (minimum + maximum) / 2
+    half_extents = np.maximum(np.abs(minimum - center), np.abs(maximum - center))
+    return GeoBounds(minimum, maximum, center, half_extents, radius)
+
+
+def mesh_bounds(mesh):
+    """GeoBounds of a Blender mesh, reused while its positions are unchanged."""
+    positions = mesh_positions(mesh)
+    digest = hashlib.blake2b(positions.tobytes(), digest_size=16).digest()
+    key = getattr(mesh, "name_full", None) or mesh.name
+    cached = _bounds_cache.get(key)
+    if cached is not None and cached[0] == digest:
+        return cached[1]
+    bounds = compute_bounds(positions)
+    _bounds_cache[key] = (digest, bounds)
+    return bounds
+
+
+def apply_collision_bounds(obj):
+    """Fill obj's GEO center, box half heights and sphere radius."""
+    bounds = mesh_bounds(obj.data)
+    geo_pg = obj.GEOPropertyGroup
+    geo_pg.SphereRadius = bounds.radius
+    geo_pg.GeoCenterX, geo_pg.GeoCenterY, geo_pg.GeoCenterZ = bounds.center.tolist()
+    (
+        geo_pg.BoxHalfHeightX,
+        geo_pg.BoxHalfHeightY,
+        geo_pg.BoxHalfHeightZ,
+    ) = bounds.half_extents.tolist()
+    return bounds
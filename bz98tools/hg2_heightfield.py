@@ -0,0 +1,648 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""NumPy heightfield helpers for BZMapIO terrain.
+
+Nothing in here touches ``bpy``; the map operators gather vertex data with
+``foreach_get`` and hand plain arrays to these helpers.
+"""
+
+import os
+
+import numpy as np
+
+# BZ terrain stores heights in decimeters, clamped to 0 - 409.5m.
+HG2_MAX_HEIGHT = 409.5
+
+
+class TerrainHeightfield:
+    """Regular height grid addressed in world X/Y.
+
+    ``heights[row, col]`` is the terrain height at
+    ``(origin_x + col * step_x, origin_y + row * step_y)``.
+    """
+
+    def __init__(self, heights, origin_x, origin_y, step_x, step_y):
+        self.heights = np.ascontiguousarray(heights, dtype=np.float32)
+        self.origin_x = float(origin_x)
+        self.origin_y = float(origin_y)
+        self.step_x = float(step_x)
+        self.step_y = float(step_y)
+        # Grid cell of every source vertex, when built from a mesh.
+        self.vertex_rows = None
+        self.vertex_cols = None
+        self._vertex_index = None
+
+    @property
+    def rows(self):
+        return self.heights.shape[0]
+
+    @property
+    def cols(self):
+        return self.heights.shape[1]
+
+    @classmethod
+    def from_vertex_coords(cls, coords):
+        """Build a heightfield from an (N, 3) array of terrain vertex positions.
+
+        The vertex order of the map mesh does not matter; each vertex is binned
+        into the grid from its X/Y position, so the same code works for the
+        rotated/flipped grids produced by the template generator.
+        """
+        coords = np.asarray(coords, dtype=np.float64).reshape(-1, 3)
+        if len(coords) < 4:
+            raise ValueError("Terrain mesh has too few vertices for a heightfield.")
+
+        xs = coords[:, 0]
+        ys = coords[:, 1]
+        min_x, max_x = xs.min(), xs.max()
+        min_y, max_y = ys.min(), ys.max()
+        tolerance = 0.25 * max(max_x - min_x, max_y - min_y) / np.sqrt(len(coords))
+        cols = _axis_sample_count(xs, tolerance)
+        rows = _axis_sample_count(ys, tolerance)
+        if cols < 2 or rows < 2 or rows * cols != len(coords):
+            raise ValueError(
+                f"Terrain mesh is not a regular grid ({len(coords)} vertices, {cols}x{rows} expected)."
+            )
+
+        step_x = (max_x - min_x) / (cols - 1)
+        step_y = (max_y - min_y) / (rows - 1)
+        col_index = np.rint((xs - min_x) / step_x).astype(np.int64)
+        row_index = np.rint((ys - min_y) / step_y).astype(np.int64)
+
+        heights = np.zeros((rows, cols), dtype=np.float32)
+        heights[row_index, col_index] = coords[:, 2]
+        field = cls(heights, min_x, min_y, step_x, step_y)
+        field.vertex_rows = row_index
+        field.vertex_cols = col_index
+        return field
+
+    def grid_coords(self, xs, ys):
+        """Convert world X/Y to fractional grid column/row coordinates."""
+        cols = (np.asarray(xs, dtype=np.float64) - self.origin_x) / self.step_x
+        rows = (np.asarray(ys, dtype=np.float64) - self.origin_y) / self.step_y
+        return cols, rows
+
+    def sample(self, xs, ys):
+        """Bilinearly sample terrain heights at world X/Y positions.
+
+        Positions outside the map are clamped to the nearest edge, matching
+        how a Z-projected Shrinkwrap lands on the border of the terrain.
+        """
+        cols, rows = self.grid_coords(xs, ys)
+        cols = np.clip(cols, 0.0, self.cols - 1)
+        rows = np.clip(rows, 0.0, self.rows - 1)
+
+        c0 = np.minimum(np.floor(cols).astype(np.int64), self.cols - 2)
+        r0 = np.minimum(np.floor(rows).astype(np.int64), self.rows - 2)
+        fc = cols - c0
+        fr = rows - r0
+
+        h = self.heights
+        top = h[r0, c0] * (1.0 - fc) + h[r0, c0 + 1] * fc
+        bottom = h[r0 + 1, c0] * (1.0 - fc) + h[r0 + 1, c0 + 1] * fc
+        return top * (1.0 - fr) + bottom * fr
+
+    def vertex_indices(self, window):
+        """Mesh vertex index for every grid point of ``window``."""
+        if self.vertex_rows is None:
+            raise ValueError("Heightfield was not built from a mesh.")
+        if self._vertex_index is None:
+            self._vertex_index = np.empty(self.heights.shape, dtype=np.int64)
+            self._vertex_index[self.vertex_rows, self.vertex_cols] = np.arange(
+                len(self.vertex_rows)
+            )
+        return self._vertex_index[window]
+
+
+def _axis_sample_count(values, tolerance):
+    # Count distinct grid lines, treating float32 jitter below the tolerance
+    # as the same line.
+    unique = np.unique(values)
+    return int(np.count_nonzero(np.diff(unique) > tolerance)) + 1
+
+
+def grid_window(field, min_x, min_y, max_x, max_y, pad=0):
+    """Return (row_slice, col_slice) covering a world-space rectangle."""
+    c0, r0 = field.grid_coords(min_x, min_y)
+    c1, r1 = field.grid_coords(max_x, max_y)
+    c0, c1 = sorted((float(c0), float(c1)))
+    r0, r1 = sorted((float(r0), float(r1)))
+    col_start = max(int(np.floor(c0)) - pad, 0)
+    row_start = max(int(np.floor(r0)) - pad, 0)
+    col_stop = min(int(np.ceil(c1)) + pad + 1, field.cols)
+    row_stop = min(int(np.ceil(r1)) + pad + 1, field.rows)
+    if col_start >= col_stop or row_start >= row_stop:
+        return None
+    return slice(row_start, row_stop), slice(col_start, col_stop)
+
+
+def rasterize_lowest_surface(field, triangles, window):
+    """Cast vertical rays through every grid point of ``window``.
+
+    ``triangles`` is a (T, 3, 3) array of world-space triangle corners. The
+    result holds the lowest hit Z per grid point, or NaN where no triangle
+    covers it, which is the surface a Z-projected Shrinkwrap would land on.
+    """
+    row_slice, col_slice = window
+    surface = np.full(
+        (row_slice.stop - row_slice.start, col_slice.stop - col_slice.start),
+        np.nan,
+        dtype=np.float64,
+    )
+    triangles = np.asarray(triangles, dtype=np.float64).reshape(-1, 3, 3)
+    if not len(triangles):
+        return surface
+
+    # Work in fractional grid coordinates relative to the window corner.
+    cols, rows = field.grid_coords(triangles[..., 0], triangles[..., 1])
+    cols = cols - col_slice.start
+    rows = rows - row_slice.start
+    zs = triangles[..., 2]
+
+    height, width = surface.shape
+    lo_c = np.clip(np.ceil(cols.min(axis=1)).astype(np.int64), 0, width)
+    hi_c = np.clip(np.floor(cols.max(axis=1)).astype(np.int64) + 1, 0, width)
+    lo_r = np.clip(np.ceil(rows.min(axis=1)).astype(np.int64), 0, height)
+    hi_r = np.clip(np.floor(rows.max(axis=1)).astype(np.int64) + 1, 0, height)
+
+    for index in np.nonzero((hi_c > lo_c) & (hi_r > lo_r))[0]:
+        ax, bx, cx = cols[index]
+        ay, by, cy = rows[index]
+        denom = (by - cy) * (ax - cx) + (cx - bx) * (ay - cy)
+        if abs(denom) < 1e-12:
+            continue  # Vertical or degenerate triangle; rays graze it.
+        gy, gx = np.mgrid[lo_r[index] : hi_r[index], lo_c[index] : hi_c[index]]
+        w0 = ((by - cy) * (gx - cx) + (cx - bx) * (gy - cy)) / denom
+        w1 = ((cy - ay) * (gx - cx) + (ax - cx) * (gy - cy)) / denom
+        w2 = 1.0 - w0 - w1
+        inside = (w0 >= -1e-9) & (w1 >= -1e-9) & (w2 >= -1e-9)
+        if not inside.any():
+            continue
+        hit = w0 * zs[index, 0] + w1 * zs[index, 1] + w2 * zs[index, 2]
+        block = surface[lo_r[index] : hi_r[index], lo_c[index] : hi_c[index]]
+        block[inside] = np.fmin(block[inside], hit[inside])
+    return surface
+
+
+def stamp_heights(heights, surface, mode="SET"):
+    """Press a rasterized surface into ``heights`` (modified in place).
+
+    ``SET`` takes the surface everywhere it was hit, ``RAISE`` only lifts
+    terrain up to it and ``LOWER`` only digs down to it. Returns the mask of
+    grid points that were touched.
+    """
+    mask = ~np.isnan(surface)
+    if mode == "RAISE":
+        mask &= surface > heights
+    elif mode == "LOWER":
+        mask &= surface < heights
+    heights[mask] = surface[mask]
+    np.clip(heights, 0.0, HG2_MAX_HEIGHT, out=heights)
+    return mask
+
+
+def flatten_heights(heights, mask, target, strength=1.0):
+    """Blend masked grid points toward a single target height."""
+    heights[mask] += (target - heights[mask]) * strength
+    np.clip(heights, 0.0, HG2_MAX_HEIGHT, out=heights)
+    return mask
+
+
+def smooth_heights(full_heights, window, mask, iterations=1, strength=1.0):
+    """Relax masked points of ``window`` toward their 3x3 neighbourhood mean.
+
+    Reads one ring of neighbours outside the window so edges blend with the
+    surrounding terrain; only ``full_heights[window]`` is written.
+    """
+    row_slice, col_slice = window
+    rows, cols = full_heights.shape
+    r0 = max(row_slice.start - 1, 0)
+    c0 = max(col_slice.start - 1, 0)
+    r1 = min(row_slice.stop + 1, rows)
+    c1 = min(col_slice.stop + 1, cols)
+    work = full_heights[r0:r1, c0:c1].astype(np.float64)
+    inner = (
+        slice(row_slice.start - r0, row_slice.stop - r0),
+        slice(col_slice.start - c0, col_slice.stop - c0),
+    )
+    for _ in range(max(int(iterations), 1)):
+        padded = np.pad(work, 1, mode="edge")
+        mean = (
+            padded[:-2, :-2]
+            + padded[:-2, 1:-1]
+            + padded[:-2, 2:]
+            + padded[1:-1, :-2]
+            + padded[1:-1, 1:-1]
+            + padded[1:-1, 2:]
+            + padded[2:, :-2]
+            + padded[2:, 1:-1]
+            + padded[2:, 2:]
+        ) / 9.0
+        region = work[inner]
+        region[mask] += (mean[inner][mask] - region[mask]) * strength
+    full_heights[window] = np.clip(work[inner], 0.0, HG2_MAX_HEIGHT)
+    return mask
+
+
+def value_noise(xs, ys, scale, seed=0):
+    """Smoothly interpolated lattice noise in [-1, 1] at world X/Y positions."""
+    fx = np.asarray(xs, dtype=np.float64) / scale
+    fy = np.asarray(ys, dtype=np.float64) / scale
+    ix = np.floor(fx).astype(np.int64)
+    iy = np.floor(fy).astype(np.int64)
+    tx = fx - ix
+    ty = fy - iy
+    tx = tx * tx * (3.0 - 2.0 * tx)
+    ty = ty * ty * (3.0 - 2.0 * ty)
+
+    n00 = _lattice_hash(ix, iy, seed)
+    n10 = _lattice_hash(ix + 1, iy, seed)
+    n01 = _lattice_hash(ix, iy + 1, seed)
+    n11 = _lattice_hash(ix + 1, iy + 1, seed)
+    top = n00 + (n10 - n00) * tx
+    bottom = n01 + (n11 - n01) * tx
+    return (top + (bottom - top) * ty) * 2.0 - 1.0
+
+
+def noise_heights(field, window, mask, amplitude, scale, seed=0):
+    """Add value noise of the given amplitude (meters) to masked points."""
+    row_slice, col_slice = window
+    heights = field.heights[window]
+    gy, gx = np.mgrid[row_slice, col_slice]
+    xs = field.origin_x + gx * field.step_x
+    ys = field.origin_y + gy * field.step_y
+    heights[mask] += value_noise(xs[mask], ys[mask], scale, seed) * amplitude
+    np.clip(heights, 0.0, HG2_MAX_HEIGHT, out=heights)
+    return mask
+
+
+def _lattice_hash(ix, iy, seed):
+    # Integer hash of lattice coordinates, mapped to [0, 1).
+    h = (
+        ix.astype(np.uint32) * np.uint32(374761393)
+        + iy.astype(np.uint32) * np.uint32(668265263)
+        + np.uint32((int(seed) * 2246822519) & 0xFFFFFFFF)
+    )
+    h = (h ^ (h >> np.uint32(13))) * np.uint32(1274126177)
+    h = h ^ (h >> np.uint32(16))
+    return h.astype(np.float64) / 4294967296.0
+
+
+# ----------------------------------------------------------
+#  Preview LOD
+# ----------------------------------------------------------
+
+
+def block_average(heights, factor):
+    """Downsample a grid by averaging ``factor`` x ``factor`` blocks."""
+    rows, cols = heights.shape
+    if rows % factor or cols % factor:
+        raise ValueError(f"Grid {cols}x{rows} does not divide by {factor}.")
+    blocks = np.asarray(heights, dtype=np.float64).reshape(
+        rows // factor, factor, cols // factor, factor
+    )
+    return blocks.mean(axis=(1, 3)).astype(np.float32)
+
+
+def zone_count(field, zone_length=256):
+    """Number of zone rows and columns covered by the heightfield grid."""
+    return (
+        max(int(np.ceil(field.rows / zone_length)), 1),
+        max(int(np.ceil(field.cols / zone_length)), 1),
+    )
+
+
+def preview_zone_mesh(field, averaged, factor, zone_row, zone_col, zone_length=256):
+    """Vertices and quads for one zone of a block-averaged preview.
+
+    Each zone carries one extra row and column from its neighbour so the
+    separate preview zones meet without gaps. Vertices sit at the centre of
+    the block they average.
+    """
+    cells = max(zone_length // factor, 1)
+    row_start = zone_row * cells
+    col_start = zone_col * cells
+    row_stop = min(row_start + cells + 1, averaged.shape[0])
+    col_stop = min(col_start + cells + 1, averaged.shape[1])
+    block = averaged[row_start:row_stop, col_start:col_stop]
+    rows, cols = block.shape
+
+    offset = (factor - 1) * 0.5
+    gy, gx = np.mgrid[row_start:row_stop, col_start:col_stop]
+    coords = np.empty((rows * cols, 3), dtype=np.float32)
+    coords[:, 0] = (field.origin_x + (gx * factor + offset) * field.step_x).ravel()
+    coords[:, 1] = (field.origin_y + (gy * factor + offset) * field.step_y).ravel()
+    coords[:, 2] = block.ravel()
+
+    index = np.arange(rows * cols).reshape(rows, cols)
+    faces = np.stack(
+        [
+            index[:-1, :-1].ravel(),
+            index[:-1, 1:].ravel(),
+            index[1:, 1:].ravel(),
+            index[1:, :-1].ravel(),
+        ],
+        axis=1,
+    )
+    return coords, faces
+
+
+def zone_window(field, zone_row, zone_col, zone_length=256):
+    """(row_slice, col_slice) of one zone's grid points.
+
+    Like ``preview_zone_mesh``, the window carries one extra row and column
+    from the neighbouring zone so its border vertices line up with them.
+    """
+    r0 = zone_row * zone_length
+    c0 = zone_col * zone_length
+    return (
+        slice(r0, min(r0 + zone_length + 1, field.rows)),
+        slice(c0, min(c0 + zone_length + 1, field.cols)),
+    )
+
+
+# ----------------------------------------------------------
+#  HG2 file layout
+# ----------------------------------------------------------
+
+HG2_ZONE_METERS = 1280
+HG2_HEIGHT_MASK = 0x1FFF
+
+
+def zones_to_grid(zone_heights, map_width, map_depth, zone_bits=8):
+    """Reorder HG2 zone-major heights into a (depth, width) row-major grid."""
+    zone_length = 2**zone_bits
+    zones = np.asarray(zone_heights).reshape(
+        map_depth, map_width, zone_length, zone_length
+    )
+    return zones.transpose(0, 2, 1, 3).reshape(
+        map_depth * zone_length, map_width * zone_length
+    )
+
+
+def grid_to_zones(grid, map_width, map_depth, zone_bits=8):
+    """Inverse of ``zones_to_grid``; returns a flat zone-major array."""
+    zone_length = 2**zone_bits
+    zones = np.asarray(grid).reshape(map_depth, zone_length, map_width, zone_length)
+    return zones.transpose(0, 2, 1, 3).ravel()
+
+
+def read_hg2(filepath):
+    """Read an .hg2 file into a header dict and a (depth, width) uint16 grid.
+
+    Heights are in decimeters with the unused flag bits cleared.
+    """
+    with open(filepath, "rb") as stream:
+        data = stream.read()
+    structure_version, zone_bits, map_width, map_depth = np.frombuffer(
+        data, dtype="<u2", count=4
+    ).tolist()
+    map_version = int(np.frombuffer(data, dtype="<u4", count=1, offset=8)[0])
+    vcount = 2 ** (2 * zone_bits) * map_width * map_depth
+    heights = np.frombuffer(data, dtype="<u2", count=vcount, offset=12)
+    header = {
+        "structure_version": structure_version,
+        "zone_bits": zone_bits,
+        "map_width": map_width,
+        "map_depth": map_depth,
+        "map_version": map_version,
+    }
+    grid = zones_to_grid(heights & HG2_HEIGHT_MASK, map_width, map_depth, zone_bits)
+    return header, grid
+
+
+def write_hg2(
+    filepath,
+    grid,
+    map_width,
+    map_depth,
+    zone_bits=8,
+    structure_version=1,
+    map_version=10,
+):
+    """Write a (depth, width) grid of decimeter heights as an .hg2 file."""
+    header = (
+        np.array(
+            [structure_version, zone_bits, map_width, map_depth], dtype="<u2"
+        ).tobytes()
+        + np.array([map_version], dtype="<u4").tobytes()
+    )
+    heights = grid_to_zones(
+        np.asarray(grid, dtype=np.uint16) & HG2_HEIGHT_MASK,
+        map_width,
+        map_depth,
+        zone_bits,
+    ).astype("<u2")
+    with open(filepath, "wb") as stream:
+        stream.write(header)
+        stream.write(heights.tobytes())
+
+
+def meters_to_hg2(heights):
+    """Clamp meter heights to the HG2 range and quantize to decimeters."""
+    return np.rint(np.clip(heights, 0.0, HG2_MAX_HEIGHT) * 10.0).astype(np.uint16)
+
+
+def write_trn(filepath, map_width, map_depth, material_name="", template_path=""):
+    """Write a TRN matching a generated map.
+
+    With ``template_path`` every line is copied and only the size entries
+    are rewritten, the same way map export updates an existing TRN.
+    """
+    width = HG2_ZONE_METERS * map_width
+    depth = HG2_ZONE_METERS * map_depth
+    if template_path:
+        with open(template_path, "r", encoding="utf-8", errors="ignore") as handle:
+            lines = handle.readlines()
+        for index, line in enumerate(lines):
+            key = line.split("=", 1)[0].strip().lower()
+            if key == "width":
+                lines[index] = f"Width={width}\n"
+            elif key == "depth":
+                lines[index] = f"Depth={depth}\n"
+            elif key == "materialname" and material_name:
+                lines[index] = f"MaterialName={material_name}\n"
+    else:
+        lines = [
+            "[Size]\n",
+            "Height=0\n",
+            "MinX=0\n",
+            "MinZ=0\n",
+            f"Width={width}\n",
+            f"Depth={depth}\n",
+        ]
+        if material_name:
+            lines += ["[Atlases]\n", f"MaterialName={material_name}\n"]
+    with open(filepath, "w", encoding="utf-8") as handle:
+        handle.writelines(lines)
+
+
+# ----------------------------------------------------------
+#  Procedural generation
+# ----------------------------------------------------------
+
+
+# Eight evenly spaced unit gradients for Perlin lattice corners.
+_GRADIENTS = np.stack(
+    [np.cos(np.arange(8) * np.pi / 4.0), np.sin(np.arange(8) * np.pi / 4.0)], axis=1
+)
+
+
+def perlin_noise(xs, ys, scale, seed=0):
+    """2D gradient (Perlin) noise in roughly [-1, 1] at world X/Y positions."""
+    fx = np.asarray(xs, dtype=np.float64) / scale
+    fy = np.asarray(ys, dtype=np.float64) / scale
+    ix = np.floor(fx).astype(np.int64)
+    iy = np.floor(fy).astype(np.int64)
+    tx = fx - ix
+    ty = fy - iy
+    u = tx * tx * tx * (tx * (tx * 6.0 - 15.0) + 10.0)
+    v = ty * ty * ty * (ty * (ty * 6.0 - 15.0) + 10.0)
+
+    def corner(cx, cy, dx, dy):
+        index = (_lattice_hash(cx, cy, seed) * len(_GRADIENTS)).astype(np.int64)
+        gradient = _GRADIENTS[index]
+        return gradient[..., 0] * dx + gradient[..., 1] * dy
+
+    n00 = corner(ix, iy, tx, ty)
+    n10 = corner(ix + 1, iy, tx - 1.0, ty)
+    n01 = corner(ix, iy + 1, tx, ty - 1.0)
+    n11 = corner(ix + 1, iy + 1, tx - 1.0, ty - 1.0)
+    top = n00 + (n10 - n00) * u
+    bottom = n01 + (n11 - n01) * u
+    return (top + (bottom - top) * v) * np.sqrt(2.0)
+
+
+NOISE_FUNCTIONS = {
+    "VALUE": value_noise,
+    "PERLIN": perlin_noise,
+}
+
+
+def fractal_noise(
+    xs,
+    ys,
+    scale,
+    octaves=5,
+    persistence=0.5,
+    lacunarity=2.0,
+    seed=0,
+    noise_type="PERLIN",
+):
+    """Layered noise normalized back to roughly [-1, 1]."""
+    noise = NOISE_FUNCTIONS[noise_type]
+    total = np.zeros(np.shape(xs), dtype=np.float64)
+    amplitude = 1.0
+    norm = 0.0
+    for octave in range(max(int(octaves), 1)):
+        total += noise(xs, ys, scale, seed + octave * 1013) * amplitude
+        norm += amplitude
+        amplitude *= persistence
+        scale /= lacunarity
+    return total / norm
+
+
+def thermal_erosion(heights, iterations=10, talus=4.0, rate=0.5):
+    """Slump material down slopes steeper than ``talus`` meters per cell.
+
+    Each pass moves ``rate`` of the excess from every cell to its lower
+    4-neighbours in proportion to their drop, all cells at once.
+    """
+    heights = np.asarray(heights, dtype=np.float64)
+    rows, cols = heights.shape
+    offsets = ((-1, 0), (1, 0), (0, -1), (0, 1))
+    for _ in range(int(iterations)):
+        padded = np.pad(heights, 1, mode="edge")
+        drops = [
+            heights - padded[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols]
+            for dr, dc in offsets
+        ]
+        steep = [np.where(drop > talus, drop, 0.0) for drop in drops]
+        total = sum(steep)
+        largest = np.maximum.reduce(drops)
+        moved = np.where(largest > talus, (largest - talus) * rate * 0.5, 0.0)
+        share = np.divide(moved, total, out=np.zeros_like(total), where=total > 0)
+
+        gained = np.zeros((rows + 2, cols + 2), dtype=np.float64)
+        for (dr, dc), drop in zip(offsets, steep):
+            gained[1 + dr : 1 + dr + rows, 1 + dc : 1 + dc + cols] += drop * share
+        heights = heights - moved + gained[1:-1, 1:-1]
+    return heights
+
+
+def generate_heightfield(
+    map_width=2,
+    map_depth=2,
+    seed=0,
+    noise_type="PERLIN",
+    scale=900.0,
+    octaves=6,
+    persistence=0.5,
+    lacunarity=2.0,
+    min_height=20.0,
+    max_height=180.0,
+    erosion_iterations=20,
+    talus=4.0,
+    zone_bits=8,
+):
+    """Generate a (depth, width) grid of heights in meters.
+
+    Noise is evaluated one zone tile at a time so memory stays bounded on
+    5120x5120 maps; erosion and clamping then run over the whole grid.
+    """
+    zone_length = 2**zone_bits
+    spacing = HG2_ZONE_METERS / zone_length
+    grid = np.empty((map_depth * zone_length, map_width * zone_length))
+    local = np.arange(zone_length, dtype=np.float64)
+    for zone_z in range(map_depth):
+        for zone_x in range(map_width):
+            rows = slice(zone_z * zone_length, (zone_z + 1) * zone_length)
+            cols = slice(zone_x * zone_length, (zone_x + 1) * zone_length)
+            xs = (zone_x * zone_length + local) * spacing
+            zs = (zone_z * zone_length + local) * spacing
+            gx, gz = np.meshgrid(xs, zs)
+            grid[rows, cols] = fractal_noise(
+                gx, gz, scale, octaves, persistence, lacunarity, seed, noise_type
+            )
+
+    grid = min_height + (np.clip(grid, -1.0, 1.0) * 0.5 + 0.5) * (
+        max_height - min_height
+    )
+    if erosion_iterations > 0:
+        grid = thermal_erosion(grid, erosion_iterations, talus)
+    return np.clip(grid, 0.0, HG2_MAX_HEIGHT).astype(np.float32)
+
+
+def generate_hg2(
+    filepath,
+    map_width=2,
+    map_depth=2,
+    material_name="",
+    template_trn="",
+    **generator_options,
+):
+    """Generate a new map and write ``filepath`` (.hg2) plus a matching .trn.
+
+    ``generator_options`` are passed to ``generate_heightfield``. Returns the
+    generated grid in meters.
+    """
+    if not (1 <= map_width <= 4 and 1 <= map_depth <= 4):
+        raise ValueError("Map width and depth must be between 1 and 4 zones.")
+    zone_bits = generator_options.get("zone_bits", 8)
+    grid = generate_heightfield(map_width, map_depth, **generator_options)
+    write_hg2(filepath, meters_to_hg2(grid), map_width, map_depth, zone_bits)
+    write_trn(
+        os.path.splitext(filepath)[0] + ".trn",
+        map_width,
+        map_depth,
+        material_name,
+        template_trn,
+    )
+    return grid
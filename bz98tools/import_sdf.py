@@ -12,12 +12,17 @@ import importlib
 import os
 import bmesh
 import mathutils
+import numpy as np
 
 # For testing purposes. Always set to False if not running in script editor.
+from . import anim_keys
+from . import bwd2_index
 from . import sdf_classes
 from . import import_geo
 
 # Reload it just in case something changed!
+importlib.reload(anim_keys)
+importlib.reload(bwd2_index)
 importlib.reload(sdf_classes)
 importlib.reload(import_geo)
 
@@ -75,12 +80,8 @@ def load(
     ImportMapTextures=False,
     MapTextureDirectory="",
     MapTextureZFS="",
+    PackMapTextures=False,
 ):
-    EXIT = (
-        sdf_classes.EXITSection()
-    )  # We going to be using this class to read through exit sections.
-    GEOList = []
-    SDFHeader = sdf_classes.SDFHeader()
     SDFC = sdf_classes.SDFCHeader()
     SGEO = sdf_classes.SGEOHeader()
     ANIM = sdf_classes.ANIMHeader()
@@ -99,19 +100,20 @@ def load(
     with open(filepath, mode="rb") as file:  # b is important -> binary
         # Read the file we opened.
         fileContent = file.read()
-        position = 0
         scene = context.scene
         if hasattr(scene, "bz_import_diagnostics"):
             scene.bz_import_diagnostics.clear()
 
-        # Read the VDF header information.
-        position = SDFHeader.Read(fileContent, position)
+        # Index the chunks once; sections are read from their recorded offsets.
+        index = bwd2_index.BWD2Index(fileContent)
+        sdfc_chunk = index.find("SDFC")
+        sgeo_chunk = index.find("SGEO")
         # If we don't see some basic matches, we know something is wrong.
-        if SDFHeader.BWDHeader != b"BWD2" or SDFHeader.REVHeader != b"REV\0":
+        if not index.is_bwd2() or sdfc_chunk is None or sgeo_chunk is None:
             raise Exception("This file is not a SDF file or is corrupted!")
 
         # Read SDFC header.
-        position = SDFC.Read(fileContent, position)
+        SDFC.Read(fileContent, sdfc_chunk.offset)
         _add_import_diagnostic(
             scene,
             "INFO",
@@ -121,7 +123,7 @@ def load(
         )
 
         # Read SGEO header.
-        position = SGEO.Read(fileContent, position)
+        SGEO.Read(fileContent, sgeo_chunk.offset)
         _add_import_diagnostic(
             scene,
             "INFO",
@@ -130,37 +132,23 @@ def load(
             f"{SGEO.geocount} GEO slots per LOD band across 6 SDF bands.",
         )
 
-        for LOD in range(6):
-            for i in range(SGEO.geocount):
-                GEO = sdf_classes.GEOData()
-                position = GEO.Read(fileContent, position)
-                GEOList.append(GEO)
-        import struct
+        # All GEO slots (6 LOD-bands × geocount) as one structured array;
+        # only the non-NULL ones are turned into GEOData below.
+        geo_table = index.geo_table()
+        live_slots = np.argwhere(~bwd2_index.null_slots(geo_table)).tolist()
 
-        sectionname = struct.unpack("4s", fileContent[position : position + 4])
-        if sectionname[0] == b"ANIM":
+        anim = index.anim()
+        if anim is not None:
             anim_found = True
-            position = ANIM.Read(fileContent, position)
-            for i in range(ANIM.elementscount):
-                Element = sdf_classes.ANIMElement()
-                position = Element.Read(fileContent, position)
-                ANIMelements.append(Element)
-            for i in range(ANIM.orientationscount):
-                Orientation = sdf_classes.ANIMOrientation()
-                position = Orientation.Read(fileContent, position)
-                ANIMorientations.update({Orientation.name: Orientation})
-            for i in range(ANIM.rotationcount):
-                Rotation = sdf_classes.ANIMRotation()
-                position = Rotation.Read(fileContent, position)
-                ANIMrotations.append(Rotation)
-            for i in range(ANIM.translation2count):
-                Translation = sdf_classes.ANIMTranslation2()
-                position = Translation.Read(fileContent, position)
-                ANIMtranslations2.append(Translation)
-            for i in range(ANIM.positioncount):
-                Position = sdf_classes.ANIMPosition()
-                position = Position.Read(fileContent, position)
-                ANIMpositions.append(Position)
+            ANIM.Read(fileContent, index.find("ANIM").offset)
+            ANIMelements = anim.elements.tolist()
+            ANIMorientations = {
+                bwd2_index.decode_name(orientation["name"]): orientation
+                for orientation in anim.orientations
+            }
+            ANIMrotations = anim.rotations
+            ANIMtranslations2 = anim.scales
+            ANIMpositions = anim.positions
             _add_import_diagnostic(
                 scene,
                 "INFO",
@@ -180,7 +168,6 @@ def load(
                     "Translation2",
                     "This file uses the niche Translation2 position track.",
                 )
-            position = EXIT.Read(fileContent, position)
 
         if anim_found:
             scene.SDFVDFPropertyGroup.UseAdvancedAnimHeader = True
@@ -201,11 +188,11 @@ def load(
 
         # Load all the geos we now know about.
         OBJList = {}
-        currentlod = 0
-        currentgeo = 0
         skipped_slots = 0
         skipped_samples = []
-        for GEO in GEOList:
+        for currentlod, currentgeo in live_slots:
+            GEO = sdf_classes.GEOData()
+            GEO.ReadRecord(geo_table[currentlod, currentgeo])
             if _is_valid_sdf_geo_slot(GEO):
                 geofilename = os.path.dirname(filepath) + "/" + GEO.name + ".geo"
 
@@ -229,6 +216,7 @@ def load(
                         map_base_dir=os.path.dirname(filepath),
                         MapTextureDirectory=MapTextureDirectory,
                         MapTextureZFS=MapTextureZFS,
+                        PackMapTextures=PackMapTextures,
                     )
                 except Exception as exc:
                     _add_import_diagnostic(
@@ -275,10 +263,6 @@ def load(
                         skipped_samples.append(
                             f"{_diagnostic_name(GEO.name)} / type {getattr(GEO, 'type', '')}"
                         )
-            currentgeo = currentgeo + 1
-            if currentgeo == SGEO.geocount:
-                currentgeo = 0
-                currentlod = currentlod + 1
 
         if skipped_slots:
             _add_import_diagnostic(
@@ -377,18 +361,15 @@ def load(
         scene.AnimationCollection.clear()
         if ImportAnimations:
             # Take our animation elements and load them into the scene.
-            for element in ANIMelements:
+            for index, geo_mask, start, length, loop, speed in ANIMelements:
                 item = scene.AnimationCollection.add()
-                item.Index = element.index
-                item.Start = element.start
-                item.Length = element.length
-                item.Loop = element.loop
-                item.Speed = element.speed
+                item.Index = index
+                item.Start = start
+                item.Length = length
+                item.Loop = loop
+                item.Speed = speed
                 item.UseCustomUnknownGeoMask = True
-                try:
-                    item.UnknownGeoMask = tuple(int(v) for v in element.unknowngeoflag)
-                except Exception:
-                    item.UnknownGeoMask = (0,) * 32
+                item.UnknownGeoMask = tuple(geo_mask)
 
             EndFrame = 0
 
@@ -397,60 +378,16 @@ def load(
                 geoname = Model.geo.name
                 if geoname in ANIMorientations:
                     modelanim = ANIMorientations[geoname]
-                    # Check for rotation animation data..
-                    if modelanim.rotationcount > 0:
-                        for index in range(
-                            modelanim.rotationindex,
-                            modelanim.rotationindex + modelanim.rotationcount,
-                        ):
-                            RotQuaternion = mathutils.Quaternion(
-                                (
-                                    ANIMrotations[index].translate[0],
-                                    ANIMrotations[index].translate[1],
-                                    ANIMrotations[index].translate[3],
-                                    ANIMrotations[index].translate[2],
-                                )
-                            )
-                            RotEuler = RotQuaternion.to_euler("XYZ")
-                            Model.object.rotation_mode = "XYZ"
-                            Model.object.rotation_euler = RotEuler
-                            Model.object.keyframe_insert(
-                                "rotation_euler", frame=ANIMrotations[index].frame
-                            )
-                            if ANIMrotations[index].frame > EndFrame:
-                                EndFrame = ANIMrotations[index].frame
-                    # Check for position animation data.
-                    if modelanim.positioncount > 0:
-                        for index in range(
-                            modelanim.positionindex,
-                            modelanim.positionindex + modelanim.positioncount,
-                        ):
-                            Model.object.location = (
-                                ANIMpositions[index].translate[0],
-                                ANIMpositions[index].translate[2],
-                                ANIMpositions[index].translate[1],
-                            )
-                            Model.object.keyframe_insert(
-                                data_path="location", frame=ANIMpositions[index].frame
-                            )
-                            if ANIMpositions[index].frame > EndFrame:
-                                EndFrame = ANIMpositions[index].frame
-
-                    if modelanim.translation2count > 0:
-                        for index in range(
-                            modelanim.translation2index,
-                            modelanim.translation2index + modelanim.translation2count,
-                        ):
-                            Model.object.scale = (
-                                ANIMtranslations2[index].translate[0],
-                                ANIMtranslations2[index].translate[2],
-                                ANIMtranslations2[index].translate[1],
-                            )
-                            Model.object.keyframe_insert(
-                                data_path="scale", frame=ANIMtranslations2[index].frame
-                            )
-                            if ANIMtranslations2[index].frame > EndFrame:
-                                EndFrame = ANIMtranslations2[index].frame
+                    EndFrame = max(
+                        EndFrame,
+                        anim_keys.key_orientation(
+                            Model.object,
+                            modelanim,
+                            ANIMrotations,
+                            ANIMtranslations2,
+                            ANIMpositions,
+                        ),
+                    )
 
             # Set the animation to the first frame.
             scene.frame_set(0)
@@ -12,11 +12,16 @@ import importlib
 import os
 import bmesh
 import mathutils
+import numpy as np
 
+from . import anim_keys
+from . import bwd2_index
 from . import vdf_classes
 from . import import_geo
 
 # Reload it just in case something changed!
+importlib.reload(anim_keys)
+importlib.reload(bwd2_index)
 importlib.reload(vdf_classes)
 importlib.reload(import_geo)
 
@@ -54,12 +59,8 @@ def load(
     ImportMapTextures=False,
     MapTextureDirectory="",
     MapTextureZFS="",
+    PackMapTextures=False,
 ):
-    EXIT = (
-        vdf_classes.EXITSection()
-    )  # We are going to be using this class to read through exit sections.
-    GEOList = []
-    VDFHeader = vdf_classes.VDFHeader()
     VDFC = vdf_classes.VDFCHeader()
     VGEO = vdf_classes.VGEOHeader()
     ANIM = vdf_classes.ANIMHeader()
@@ -79,21 +80,21 @@ def load(
     with open(filepath, mode="rb") as file:  # b is important -> binary
         # Read the file we opened.
         fileContent = file.read()
-        position = 0
         scene = context.scene
         target_collection = _get_target_collection(context)
         if hasattr(scene, "bz_import_diagnostics"):
             scene.bz_import_diagnostics.clear()
 
-        # Read the VDF header information.
-        position = VDFHeader.Read(fileContent, position)
+        # Index the chunks once; sections are read from their recorded offsets.
+        index = bwd2_index.BWD2Index(fileContent)
+        vdfc_chunk = index.find("VDFC")
+        vgeo_chunk = index.find("VGEO")
         # If we don't see some basic matches, we know something is wrong.
-        if VDFHeader.BWDHeader != b"BWD2" or VDFHeader.REVHeader != b"REV\0":
+        if not index.is_bwd2() or vdfc_chunk is None or vgeo_chunk is None:
             raise Exception("This file is not a VDF file or is corrupted!")
 
         # Read VDFC header.
-        position = VDFC.Read(fileContent, position)
-        position = EXIT.Read(fileContent, position)
+        VDFC.Read(fileContent, vdfc_chunk.offset)
         _add_import_diagnostic(
             scene,
             "INFO",
@@ -131,7 +132,7 @@ def load(
         scene.SDFVDFPropertyGroup["DragCoefficient"] = VDFC.drag
 
         # Read VGEO header.
-        position = VGEO.Read(fileContent, position)
+        VGEO.Read(fileContent, vgeo_chunk.offset)
         _add_import_diagnostic(
             scene,
             "INFO",
@@ -140,145 +141,81 @@ def load(
             f"{VGEO.geocount} GEO slots per LOD band across 28 VDF bands.",
         )
 
-        # Read all GEO slots (28 LOD-bands × geocount), including NULLs
-        for i in range(28):
-            for j in range(VGEO.geocount):
-                GEO = vdf_classes.GEOData()
-                GEO.Read(fileContent, position)
-                GEOList.append(GEO)
-                position = position + 100
-
-        import struct
+        # All GEO slots (28 LOD-bands × geocount) as one structured array;
+        # only the non-NULL ones are turned into GEOData below.
+        geo_table = index.geo_table()
+        live_slots = np.argwhere(~bwd2_index.null_slots(geo_table)).tolist()
 
-        anim_found = False
+        anim = index.anim()
+        anim_found = anim is not None
         scps_found = False
         scps_data = [0, 0, 0]
 
-        # Safely handle optional ANIM / EXIT / COLP / SCPS sections.
-        # If there are no bytes left after GEOs, there is nothing else to read.
-        if position + 4 > len(fileContent):
-            # No ANIM / EXIT / COLP – fall back to empty collision data.
-            COLP.data = [0.0] * 12
+        # Optional ANIM block (may or may not be present)
+        if anim_found:
+            ANIM.Read(fileContent, index.find("ANIM").offset)
+            ANIMelements = anim.elements.tolist()
+            ANIMorientations = {
+                bwd2_index.decode_name(orientation["name"]): orientation
+                for orientation in anim.orientations
+            }
+            ANIMrotations = anim.rotations
+            ANIMtranslations2 = anim.scales
+            ANIMpositions = anim.positions
             _add_import_diagnostic(
                 scene,
-                "WARNING",
-                "COLP",
-                "collision",
-                "No optional sections were present after VGEO; empty collision helpers were created.",
+                "INFO",
+                "ANIM",
+                ANIM.name,
+                (
+                    f"{ANIM.elementscount} elements, {ANIM.orientationscount} orientations, "
+                    f"{ANIM.rotationcount} rotations, {ANIM.translation2count} Translation2 keys, "
+                    f"{ANIM.positioncount} position keys."
+                ),
             )
-        else:
-            sectionname = struct.unpack("4s", fileContent[position : position + 4])
-
-            # Optional ANIM block (may or may not be present)
-            if sectionname[0] == b"ANIM":
-                anim_found = True
-                position = ANIM.Read(fileContent, position)
-                for i in range(ANIM.elementscount):
-                    Element = vdf_classes.ANIMElement()
-                    position = Element.Read(fileContent, position)
-                    ANIMelements.append(Element)
-                for i in range(ANIM.orientationscount):
-                    Orientation = vdf_classes.ANIMOrientation()
-                    position = Orientation.Read(fileContent, position)
-                    ANIMorientations.update({Orientation.name: Orientation})
-                for i in range(ANIM.rotationcount):
-                    Rotation = vdf_classes.ANIMRotation()
-                    position = Rotation.Read(fileContent, position)
-                    ANIMrotations.append(Rotation)
-                for i in range(ANIM.translation2count):
-                    Translation = vdf_classes.ANIMTranslation2()
-                    position = Translation.Read(fileContent, position)
-                    ANIMtranslations2.append(Translation)
-                for i in range(ANIM.positioncount):
-                    Position = vdf_classes.ANIMPosition()
-                    position = Position.Read(fileContent, position)
-                    ANIMpositions.append(Position)
+            if ANIM.translation2count > 0:
                 _add_import_diagnostic(
                     scene,
                     "INFO",
                     "ANIM",
-                    ANIM.name,
-                    (
-                        f"{ANIM.elementscount} elements, {ANIM.orientationscount} orientations, "
-                        f"{ANIM.rotationcount} rotations, {ANIM.translation2count} Translation2 keys, "
-                        f"{ANIM.positioncount} position keys."
-                    ),
+                    "Translation2",
+                    "This file uses the niche Translation2 position track.",
                 )
-                if ANIM.translation2count > 0:
-                    _add_import_diagnostic(
-                        scene,
-                        "INFO",
-                        "ANIM",
-                        "Translation2",
-                        "This file uses the niche Translation2 position track.",
-                    )
 
-                # EXIT after ANIM, if there is enough data left.
-                if position + EXIT.binlength <= len(fileContent):
-                    position = EXIT.Read(fileContent, position)
-
-            # EXIT after VGEO (and/or ANIM), if it exists.
-            if position + EXIT.binlength <= len(fileContent):
-                position = EXIT.Read(fileContent, position)
-
-            # Only read COLP if we have a full header+body and the header matches.
-            if position + 4 <= len(fileContent):
-                colp_header = struct.unpack("4s", fileContent[position : position + 4])[
-                    0
-                ]
-                if colp_header == b"COLP" and position + COLP.binlength <= len(
-                    fileContent
-                ):
-                    position = COLP.Read(fileContent, position)
-                    _add_import_diagnostic(
-                        scene,
-                        "INFO",
-                        "COLP",
-                        "collision",
-                        "Imported VDF inner/outer collision box values.",
-                    )
-                    if position + EXIT.binlength <= len(fileContent):
-                        next_header = struct.unpack(
-                            "4s", fileContent[position : position + 4]
-                        )[0]
-                        if next_header == b"EXIT":
-                            position = EXIT.Read(fileContent, position)
-
-                    if position + SCPS.binlength <= len(fileContent):
-                        scps_header = struct.unpack(
-                            "4s", fileContent[position : position + 4]
-                        )[0]
-                        if scps_header in (b"SPCS", b"SCPS"):
-                            position = SCPS.Read(fileContent, position)
-                            scps_data = [int(v) for v in SCPS.data]
-                            scps_found = True
-                            _add_import_diagnostic(
-                                scene,
-                                "INFO",
-                                SCPS.headername or "SPCS",
-                                "raw data",
-                                f"SPCS/SCPS raw ints: {scps_data[0]}, {scps_data[1]}, {scps_data[2]}.",
-                            )
-                else:
-                    # No valid COLP – use an empty collision box.
-                    COLP.data = [0.0] * 12
-                    _add_import_diagnostic(
-                        scene,
-                        "WARNING",
-                        "COLP",
-                        "collision",
-                        "No VDF COLP collision box section was found; empty collision helpers were created.",
-                    )
-            else:
-                # Not enough bytes even for a COLP header.
-                COLP.data = [0.0] * 12
+        # Only read COLP if we have a full header+body.
+        colp_chunk = index.find("COLP")
+        if colp_chunk is not None and colp_chunk.length >= COLP.binlength:
+            COLP.Read(fileContent, colp_chunk.offset)
+            _add_import_diagnostic(
+                scene,
+                "INFO",
+                "COLP",
+                "collision",
+                "Imported VDF inner/outer collision box values.",
+            )
+
+            scps_chunk = index.find("SPCS") or index.find("SCPS")
+            if scps_chunk is not None and scps_chunk.length >= SCPS.binlength:
+                SCPS.Read(fileContent, scps_chunk.offset)
+                scps_data = [int(v) for v in SCPS.data]
+                scps_found = True
                 _add_import_diagnostic(
                     scene,
-                    "WARNING",
-                    "COLP",
-                    "collision",
-                    "File ended before a VDF COLP collision box section; empty collision helpers were created.",
+                    "INFO",
+                    SCPS.headername or "SPCS",
+                    "raw data",
+                    f"SPCS/SCPS raw ints: {scps_data[0]}, {scps_data[1]}, {scps_data[2]}.",
                 )
+        else:
+            # No valid COLP – use an empty collision box.
+            COLP.data = [0.0] * 12
+            _add_import_diagnostic(
+                scene,
+                "WARNING",
+                "COLP",
+                "collision",
+                "No VDF COLP collision box section was found; empty collision helpers were created.",
+            )
 
         if anim_found:
             scene.SDFVDFPropertyGroup.UseAdvancedAnimHeader = True
@@ -368,104 +305,95 @@ def load(
         if ImportGEOs:
             # Load all the geos we now know about.
             OBJList = {}
-            currentlod = 0
-            currentgeo = 0
-            for GEO in GEOList:
-                if GEO.name[0:4].lower() != "null":
-                    geofilename = os.path.dirname(filepath) + "/" + GEO.name + ".geo"
-
-                    # Case-insensitive search for GEO file if needed.
-                    if not os.path.exists(geofilename):
-                        for root, dirs, files in os.walk(os.path.dirname(geofilename)):
-                            for afile in files:
-                                if (GEO.name + ".geo").lower() == afile.lower():
-                                    geofilename = os.path.join(
-                                        os.path.dirname(geofilename), afile.lower()
-                                    )
-                                    break
-
-                    newobj = None
-
-                    # Load mesh GEO if file exists.
-                    if os.path.exists(geofilename):
-                        try:
-                            newobj = import_geo.geoload(
-                                context,
-                                geofilename,
-                                PreserveFaceColors=PreserveFaceColors,
-                                ImportMapTextures=ImportMapTextures,
-                                map_base_dir=os.path.dirname(filepath),
-                                MapTextureDirectory=MapTextureDirectory,
-                                MapTextureZFS=MapTextureZFS,
-                            )
-                        except Exception as e:
-                            print(
-                                f"[BZ VDF Import] Failed to load GEO '{GEO.name}': {e}"
-                            )
-
-                    # Spinner helpers often have no .geo file by design.
-                    if newobj is None and GEO.type == 15:
-                        newobj = bpy.data.objects.new(GEO.name, None)
-                        newobj.empty_display_type = "ARROWS"
-                        newobj.empty_display_size = 0.25
-                        target_collection.objects.link(newobj)
-
-                    if newobj is not None:
-                        geolod = currentlod
-                        if currentlod == 0:
-                            geolod = 1
-                        elif currentlod == 4:
-                            geolod = 2
-                        elif currentlod == 8:
-                            geolod = 3
-                        else:
-                            geolod = 1
-
-                        newobj.GEOPropertyGroup["GEOType"] = GEO.type
-                        newobj.GEOPropertyGroup["GEOFlags"] = GEO.geoflags
-                        newobj.GEOPropertyGroup["GeoCenterX"] = GEO.geocenter[0]
-                        newobj.GEOPropertyGroup["GeoCenterY"] = GEO.geocenter[1]
-                        newobj.GEOPropertyGroup["GeoCenterZ"] = GEO.geocenter[2]
-                        newobj.GEOPropertyGroup["SphereRadius"] = GEO.sphereradius
-                        newobj.GEOPropertyGroup["BoxHalfHeightX"] = GEO.boxhalfheight[0]
-                        newobj.GEOPropertyGroup["BoxHalfHeightY"] = GEO.boxhalfheight[1]
-                        newobj.GEOPropertyGroup["BoxHalfHeightZ"] = GEO.boxhalfheight[2]
-                        try:
-                            newobj.GEOPropertyGroup.RawVDFMatrix = tuple(
-                                float(v) for v in GEO.matrix
-                            )
-                        except Exception:
-                            pass
-
-                        if GEO.type == 15:
-                            x, y, z = GEO.matrix[0], GEO.matrix[1], GEO.matrix[2]
-                            magnitude = (x * x + y * y + z * z) ** 0.5
-                            if magnitude > 1e-8:
-                                axis = (x / magnitude, y / magnitude, z / magnitude)
-                                speed = magnitude
-                            else:
-                                axis = (1.0, 0.0, 0.0)
-                                speed = 0.0
-
-                            newobj.GEOPropertyGroup.IsSpinnerHelper = True
-                            newobj.GEOPropertyGroup.SpinnerAxis = axis
-                            newobj.GEOPropertyGroup.SpinnerSpeed = speed
-                            newobj.GEOPropertyGroup.GenerateCollision = False
-
-                            if GEO.parent.lower() != "world":
-                                newobj.GEOPropertyGroup.SpinnerTarget = (
-                                    GEO.parent.lower()
+            for currentlod, currentgeo in live_slots:
+                GEO = vdf_classes.GEOData()
+                GEO.ReadRecord(geo_table[currentlod, currentgeo])
+                geofilename = os.path.dirname(filepath) + "/" + GEO.name + ".geo"
+
+                # Case-insensitive search for GEO file if needed.
+                if not os.path.exists(geofilename):
+                    for root, dirs, files in os.walk(os.path.dirname(geofilename)):
+                        for afile in files:
+                            if (GEO.name + ".geo").lower() == afile.lower():
+                                geofilename = os.path.join(
+                                    os.path.dirname(geofilename), afile.lower()
                                 )
+                                break
+
+                newobj = None
+
+                # Load mesh GEO if file exists.
+                if os.path.exists(geofilename):
+                    try:
+                        newobj = import_geo.geoload(
+                            context,
+                            geofilename,
+                            PreserveFaceColors=PreserveFaceColors,
+                            ImportMapTextures=ImportMapTextures,
+                            map_base_dir=os.path.dirname(filepath),
+                            MapTextureDirectory=MapTextureDirectory,
+                            MapTextureZFS=MapTextureZFS,
+                            PackMapTextures=PackMapTextures,
+                        )
+                    except Exception as e:
+                        print(f"[BZ VDF Import] Failed to load GEO '{GEO.name}': {e}")
+
+                # Spinner helpers often have no .geo file by design.
+                if newobj is None and GEO.type == 15:
+                    newobj = bpy.data.objects.new(GEO.name, None)
+                    newobj.empty_display_type = "ARROWS"
+                    newobj.empty_display_size = 0.25
+                    target_collection.objects.link(newobj)
+
+                if newobj is not None:
+                    geolod = currentlod
+                    if currentlod == 0:
+                        geolod = 1
+                    elif currentlod == 4:
+                        geolod = 2
+                    elif currentlod == 8:
+                        geolod = 3
+                    else:
+                        geolod = 1
+
+                    newobj.GEOPropertyGroup["GEOType"] = GEO.type
+                    newobj.GEOPropertyGroup["GEOFlags"] = GEO.geoflags
+                    newobj.GEOPropertyGroup["GeoCenterX"] = GEO.geocenter[0]
+                    newobj.GEOPropertyGroup["GeoCenterY"] = GEO.geocenter[1]
+                    newobj.GEOPropertyGroup["GeoCenterZ"] = GEO.geocenter[2]
+                    newobj.GEOPropertyGroup["SphereRadius"] = GEO.sphereradius
+                    newobj.GEOPropertyGroup["BoxHalfHeightX"] = GEO.boxhalfheight[0]
+                    newobj.GEOPropertyGroup["BoxHalfHeightY"] = GEO.boxhalfheight[1]
+                    newobj.GEOPropertyGroup["BoxHalfHeightZ"] = GEO.boxhalfheight[2]
+                    try:
+                        newobj.GEOPropertyGroup.RawVDFMatrix = tuple(
+                            float(v) for v in GEO.matrix
+                        )
+                    except Exception:
+                        pass
+
+                    if GEO.type == 15:
+                        x, y, z = GEO.matrix[0], GEO.matrix[1], GEO.matrix[2]
+                        magnitude = (x * x + y * y + z * z) ** 0.5
+                        if magnitude > 1e-8:
+                            axis = (x / magnitude, y / magnitude, z / magnitude)
+                            speed = magnitude
+                        else:
+                            axis = (1.0, 0.0, 0.0)
+                            speed = 0.0
+
+                        newobj.GEOPropertyGroup.IsSpinnerHelper = True
+                        newobj.GEOPropertyGroup.SpinnerAxis = axis
+                        newobj.GEOPropertyGroup.SpinnerSpeed = speed
+                        newobj.GEOPropertyGroup.GenerateCollision = False
 
-                        blenobj = vdf_classes.BlenderObject(newobj, GEO)
-                        blenobj.obj_index = currentgeo
-                        blenobj.obj_lod = geolod
-                        OBJList.update({GEO.name.lower(): blenobj})
+                        if GEO.parent.lower() != "world":
+                            newobj.GEOPropertyGroup.SpinnerTarget = GEO.parent.lower()
 
-                currentgeo = currentgeo + 1
-                if currentgeo == VGEO.geocount:
-                    currentgeo = 0
-                    currentlod = currentlod + 1
+                    blenobj = vdf_classes.BlenderObject(newobj, GEO)
+                    blenobj.obj_index = currentgeo
+                    blenobj.obj_lod = geolod
+                    OBJList.update({GEO.name.lower(): blenobj})
 
             # ------------------------------------------------------------------
             # Parent GEO objects according to GEO.parent
@@ -578,77 +506,31 @@ def load(
         # ------------------------------------------------------------------
         scene.AnimationCollection.clear()
         if ImportGEOs and ImportAnimations:
-            for element in ANIMelements:
+            for index, geo_mask, start, length, loop, speed in ANIMelements:
                 item = scene.AnimationCollection.add()
-                item.Index = element.index
-                item.Start = element.start
-                item.Length = element.length
-                item.Loop = element.loop
-                item.Speed = element.speed
+                item.Index = index
+                item.Start = start
+                item.Length = length
+                item.Loop = loop
+                item.Speed = speed
                 item.UseCustomUnknownGeoMask = True
-                try:
-                    item.UnknownGeoMask = tuple(int(v) for v in element.unknowngeoflag)
-                except Exception:
-                    item.UnknownGeoMask = (0,) * 32
+                item.UnknownGeoMask = tuple(geo_mask)
 
             EndFrame = 0
             for Model in OBJList.values():
                 geoname = Model.geo.name
                 if geoname in ANIMorientations:
                     modelanim = ANIMorientations[geoname]
-                    if modelanim.rotationcount > 0:
-                        for index in range(
-                            modelanim.rotationindex,
-                            modelanim.rotationindex + modelanim.rotationcount,
-                        ):
-                            RotQuaternion = mathutils.Quaternion(
-                                (
-                                    ANIMrotations[index].translate[0],
-                                    ANIMrotations[index].translate[1],
-                                    ANIMrotations[index].translate[3],
-                                    ANIMrotations[index].translate[2],
-                                )
-                            )
-                            RotEuler = RotQuaternion.to_euler("XYZ")
-                            Model.object.rotation_mode = "XYZ"
-                            Model.object.rotation_euler = RotEuler
-                            Model.object.keyframe_insert(
-                                "rotation_euler", frame=ANIMrotations[index].frame
-                            )
-                            if ANIMrotations[index].frame > EndFrame:
-                                EndFrame = ANIMrotations[index].frame
-
-                    if modelanim.positioncount > 0:
-                        for index in range(
-                            modelanim.positionindex,
-                            modelanim.positionindex + modelanim.positioncount,
-                        ):
-                            Model.object.location = (
-                                ANIMpositions[index].translate[0],
-                                ANIMpositions[index].translate[2],
-                                ANIMpositions[index].translate[1],
-                            )
-                            Model.object.keyframe_insert(
-                                data_path="location", frame=ANIMpositions[index].frame
-                            )
-                            if ANIMpositions[index].frame > EndFrame:
-                                EndFrame = ANIMpositions[index].frame
-
-                    if modelanim.translation2count > 0:
-                        for index in range(
-                            modelanim.translation2index,
-                            modelanim.translation2index + modelanim.translation2count,
-                        ):
-                            Model.object.scale = (
-                                ANIMtranslations2[index].translate[0],
-                                ANIMtranslations2[index].translate[2],
-                                ANIMtranslations2[index].translate[1],
-                            )
-                            Model.object.keyframe_insert(
-                                data_path="scale", frame=ANIMtranslations2[index].frame
-                            )
-                            if ANIMtranslations2[index].frame > EndFrame:
-                                EndFrame = ANIMtranslations2[index].frame
+                    EndFrame = max(
+                        EndFrame,
+                        anim_keys.key_orientation(
+                            Model.object,
+                            modelanim,
+                            ANIMrotations,
+                            ANIMtranslations2,
+                            ANIMpositions,
+                        ),
+                    )
 
             scene.frame_set(0)
             scene.frame_start = 0
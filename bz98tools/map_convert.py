@@ -0,0 +1,497 @@
+from typing import Any
+
+# Battlezone 98R Blender ToolKit
+# Copyright (C) 2024–2025 “GrizzlyOne95” and contributors
+#
+# This file is part of BZ98R Blender ToolKit, which is distributed
+# under the terms of the GNU General Public License v3.0.
+# See the LICENSE file or <https://www.gnu.org/licenses/>.
+
+"""
+Bulk .map -> PNG/DDS conversion for stock asset libraries, and PNG -> .map
+encoding for new legacy textures.
+
+Outputs land where the GEO importer looks for them: next to each .map for
+folders, and in the per-archive import texture cache for ZFS archives. This
+module does not import bpy, so conversions run in worker processes.
+"""
+
+import hashlib
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+from . import bzmap_codec
+from . import dds_codec
+from . import bzact_palettes
+from .bzmap import BZMap, BZMapFormat
+from .bzmap_serializer import BZMapSerializer
+from .bzact_serializer import BZActSerializer
+from .bwd2_writer import write_atomic
+
+OUTPUT_FORMATS = ("png", "dds")
+SKIP_MODES = ("mtime", "hash", "none")
+
+# Per-output-folder record of source hashes for skip="hash"
+MANIFEST_NAME = ".bz_map_convert.json"
+
+# .map pixel formats by name, for encode_images and its CLI
+MAP_FORMATS = {name: fmt for fmt, name in bzmap_codec.FORMAT_NAMES.items()}
+
+
+def import_texture_cache_dir(zfs_path):
+    """Folder that the GEO importer extracts stock ZFS textures into."""
+    archive_name = os.path.splitext(os.path.basename(zfs_path))[0] or "archive"
+    archive_hash = hashlib.sha1(os.path.abspath(zfs_path).encode("utf-8")).hexdigest()[
+        :8
+    ]
+    return os.path.join(
+        os.path.dirname(__file__),
+        "_cache",
+        "import_textures",
+        f"{archive_name}_{archive_hash}",
+    )
+
+
+def _file_sha1(path):
+    digest = hashlib.sha1()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _output_path(map_path, source_root, out_dir, output_format):
+    stem = os.path.splitext(map_path)[0] + "." + output_format
+    if not out_dir:
+        return stem
+    return os.path.join(out_dir, os.path.relpath(stem, source_root))
+
+
+def convert_map_file(
+    map_path,
+    out_path,
+    output_format="png",
+    palette=None,
+    level=1,
+    dds_format="RGBA",
+    mipmaps=False,
+):
+    """
+    Convert one .map file. Returns (pixel_count, bytes_read).
+
+    Raises ValueError / OSError on unreadable or undecodable input.
+    """
+    bzmap = BZMap()
+    with open(map_path, "rb") as f:
+        BZMapSerializer().deserialize(f, bzmap)
+
+    if bzmap.pixel_format == BZMapFormat.INDEXED and palette is None:
+        raise ValueError("INDEXED map needs an ACT palette")
+    rgba = bzmap_codec.decode_bzmap(bzmap, palette=palette)
+    height, width = rgba.shape[:2]
+
+    if output_format == "png":
+        if not bzmap_codec.has_alpha(bzmap.pixel_format):
+            rgba = rgba[:, :, :3]
+        data = bzmap_codec.encode_png(rgba, level)
+    elif output_format == "dds":
+        data = dds_codec.encode_dds(rgba, dds_format=dds_format, mipmaps=mipmaps)
+    else:
+        raise ValueError(f"Unknown output format '{output_format}'")
+
+    write_atomic(out_path, data)
+    return width * height, 8 + bzmap.get_byte_count()
+
+
+def _convert_job(job):
+    map_path, out_path, output_format, palette, options = job
+    try:
+        pixels, nbytes = convert_map_file(
+            map_path, out_path, output_format, palette, **options
+        )
+        return map_path, pixels, nbytes, None
+    except (OSError, ValueError, EOFError) as exc:
+        return map_path, 0, 0, str(exc) or type(exc).__name__
+
+
+def _collect_maps(sources):
+    """
+    Yield (map_path, source_root) for every .map under the given folders,
+    files and ZFS archives. Archives are extracted into the import cache.
+    """
+    for source in sources:
+        source = os.path.abspath(os.fspath(source))
+        ext = os.path.splitext(source)[1].lower()
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".map"):
+                        yield os.path.join(root, name), source
+        elif ext == ".map" and os.path.isfile(source):
+            yield source, os.path.dirname(source)
+        elif ext == ".zfs" and os.path.isfile(source):
+            yield from _extract_zfs_maps(source)
+        else:
+            print(f"[BZ MAP] Skipping unknown source '{source}'.")
+
+
+def _extract_zfs_maps(zfs_path):
+    from .zfs_reader import ZFSReader
+
+    cache_dir = import_texture_cache_dir(zfs_path)
+    reader = ZFSReader(zfs_path)
+    try:
+        reader.open()
+        for name in sorted(reader.list_files(), key=str.lower):
+            if not name.lower().endswith(".map"):
+                continue
+            target = os.path.join(cache_dir, name)
+            if not os.path.exists(target):
+                target = reader.extract(name, cache_dir)
+            if target:
+                yield target, cache_dir
+    except Exception as exc:
+        print(f"[BZ MAP] Failed to read ZFS '{zfs_path}': {exc}")
+    finally:
+        reader.close()
+
+
+def _load_manifest(folder, cache):
+    manifest = cache.get(folder)
+    if manifest is None:
+        try:
+            with open(os.path.join(folder, MANIFEST_NAME), "r") as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        cache[folder] = manifest
+    return manifest
+
+
+def _save_manifests(cache):
+    for folder, manifest in cache.items():
+        try:
+            with open(os.path.join(folder, MANIFEST_NAME), "w") as f:
+                json.dump(manifest, f, indent=1, sort_keys=True)
+        except OSError as exc:
+            print(f"[BZ MAP] Failed to write manifest in '{folder}': {exc}")
+
+
+def convert_maps(
+    sources,
+    output_format="png",
+    out_dir=None,
+    act_path=None,
+    skip="mtime",
+    workers=None,
+    compress_level=1,
+    dds_format="RGBA",
+    mipmaps=False,
+):
+    """
+    Convert every .map under sources (folders, .map files or .zfs archives).
+
+    skip="mtime" keeps outputs newer than their .map, skip="hash" keeps
+    outputs whose source hash matches the folder manifest, skip="none"
+    always converts. dds_format and mipmaps apply to DDS output (see
+    dds_codec). Returns a summary dict and prints a throughput line.
+    """
+    if output_format not in OUTPUT_FORMATS:
+        raise ValueError(f"output_format must be one of {OUTPUT_FORMATS}")
+    if skip not in SKIP_MODES:
+        raise ValueError(f"skip must be one of {SKIP_MODES}")
+
+    start = time.perf_counter()
+    options = {"level": compress_level, "dds_format": dds_format, "mipmaps": mipmaps}
+    manifests = {}
+    hashes = {}
+    jobs = []
+    skipped = 0
+
+    for map_path, source_root in _collect_maps(sources):
+        out_path = _output_path(map_path, source_root, out_dir, output_format)
+        if skip == "mtime":
+            try:
+                if os.path.getmtime(out_path) >= os.path.getmtime(map_path):
+                    skipped += 1
+                    continue
+            except OSError:
+                pass
+        elif skip == "hash":
+            digest = _file_sha1(map_path)
+            manifest = _load_manifest(os.path.dirname(out_path), manifests)
+            key = os.path.basename(out_path)
+            if manifest.get(key) == digest and os.path.exists(out_path):
+                skipped += 1
+                continue
+            hashes[map_path] = (manifest, key, digest)
+        palette = bzact_palettes.resolve_palette(act_path, os.path.dirname(map_path))
+        jobs.append((map_path, out_path, output_format, palette, options))
+
+    converted = 0
+    failed = []
+    pixel_total = 0
+    byte_total = 0
+    pool = None
+    if workers != 1 and len(jobs) > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_convert_job, jobs, chunksize=4)
+    else:
+        results = map(_convert_job, jobs)
+    try:
+        for map_path, pixels, nbytes, error in results:
+            if error:
+                failed.append((map_path, error))
+                continue
+            converted += 1
+            pixel_total += pixels
+            byte_total += nbytes
+            if map_path in hashes:
+                manifest, key, digest = hashes[map_path]
+                manifest[key] = digest
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    if manifests:
+        _save_manifests(manifests)
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "converted": converted,
+        "skipped": skipped,
+        "failed": failed,
+        "pixels": pixel_total,
+        "bytes": byte_total,
+        "seconds": elapsed,
+    }
+    rate = pixel_total / max(elapsed, 1e-9) / 1e6
+    print(
+        f"[BZ MAP] Converted {converted}, skipped {skipped}, failed {len(failed)} "
+        f"in {elapsed:.2f}s ({rate:.1f} Mpx/s, "
+        f"{byte_total / max(elapsed, 1e-9) / (1 << 20):.1f} MB/s)"
+    )
+    for map_path, error in failed:
+        print(f"[BZ MAP]   {map_path}: {error}")
+    return summary
+
+
+def _read_png(image_path):
+    with open(image_path, "rb") as f:
+        return bzmap_codec.decode_png(f.read())
+
+
+def encode_image_file(image_path, out_path, pixel_format, palette=None):
+    """
+    Encode one PNG as a .map file. Returns (pixel_count, bytes_written).
+
+    INDEXED output maps each pixel to the nearest palette colour.
+    Raises ValueError / OSError on unreadable input.
+    """
+    rgba = _read_png(image_path)
+    bzmap = bzmap_codec.encode_bzmap(rgba, pixel_format, palette)
+    stream = io.BytesIO()
+    BZMapSerializer().serialize(stream, bzmap)
+    data = stream.getvalue()
+    write_atomic(out_path, data)
+    return rgba.shape[0] * rgba.shape[1], len(data)
+
+
+def _encode_job(job):
+    image_path, out_path, pixel_format, palette = job
+    try:
+        pixels, nbytes = encode_image_file(image_path, out_path, pixel_format, palette)
+        return image_path, pixels, nbytes, None
+    except (OSError, ValueError) as exc:
+        return image_path, 0, 0, str(exc) or type(exc).__name__
+
+
+def _collect_images(sources):
+    """Yield (png_path, source_root) for every .png under the given sources."""
+    for source in sources:
+        source = os.path.abspath(os.fspath(source))
+        if os.path.isdir(source):
+            for root, dirs, files in os.walk(source):
+                dirs.sort()
+                for name in sorted(files):
+                    if name.lower().endswith(".png"):
+                        yield os.path.join(root, name), source
+        elif source.lower().endswith(".png") and os.path.isfile(source):
+            yield source, os.path.dirname(source)
+        else:
+            print(f"[BZ MAP] Skipping unknown source '{source}'.")
+
+
+def encode_images(
+    sources,
+    pixel_format="XRGB8888",
+    out_dir=None,
+    act_path=None,
+    new_act=None,
+    skip="mtime",
+    workers=None,
+):
+    """
+    Encode every .png under sources as a .map in pixel_format.
+
+    INDEXED output uses act_path (or the ACT found next to each image) as
+    the target palette. With new_act, a shared 256-colour palette is built
+    from all inputs by median cut and saved to that path first; every input
+    is then re-encoded, since existing outputs index the old palette. skip
+    is "mtime" or "none". Returns a summary dict like convert_maps.
+    """
+    if isinstance(pixel_format, str):
+        pixel_format = MAP_FORMATS[pixel_format.upper()]
+    if skip not in ("mtime", "none"):
+        raise ValueError("skip must be 'mtime' or 'none'")
+    rebuild_palette = pixel_format == BZMapFormat.INDEXED and bool(new_act)
+    if rebuild_palette:
+        skip = "none"
+
+    start = time.perf_counter()
+    images = []
+    skipped = 0
+    for image_path, source_root in _collect_images(sources):
+        out_path = _output_path(image_path, source_root, out_dir, "map")
+        if skip == "mtime":
+            try:
+                if os.path.getmtime(out_path) >= os.path.getmtime(image_path):
+                    skipped += 1
+                    continue
+            except OSError:
+                pass
+        images.append((image_path, out_path))
+
+    shared_palette = None
+    if rebuild_palette and images:
+        rgb_list = [_read_png(image_path)[..., :3] for image_path, _ in images]
+        colors = bzmap_codec.median_cut_palette(rgb_list)
+        with open(new_act, "wb") as f:
+            BZActSerializer().serialize(f, colors)
+        print(f"[BZ MAP] Wrote median-cut palette '{new_act}'.")
+        shared_palette = bzact_palettes.load_act_palette(new_act)
+
+    jobs = []
+    for image_path, out_path in images:
+        palette = None
+        if pixel_format == BZMapFormat.INDEXED:
+            palette = shared_palette or bzact_palettes.resolve_palette(
+                act_path, os.path.dirname(image_path)
+            )
+        jobs.append((image_path, out_path, pixel_format, palette))
+
+    encoded = 0
+    failed = []
+    pixel_total = 0
+    byte_total = 0
+    pool = None
+    if workers != 1 and len(jobs) > 1:
+        pool = ProcessPoolExecutor(max_workers=workers)
+        results = pool.map(_encode_job, jobs, chunksize=4)
+    else:
+        results = map(_encode_job, jobs)
+    try:
+        for image_path, pixels, nbytes, error in results:
+            if error:
+                failed.append((image_path, error))
+                continue
+            encoded += 1
+            pixel_total += pixels
+            byte_total += nbytes
+    finally:
+        if pool is not None:
+            pool.shutdown()
+
+    elapsed = time.perf_counter() - start
+    summary = {
+        "converted": encoded,
+        "skipped": skipped,
+        "failed": failed,
+        "pixels": pixel_total,
+        "bytes": byte_total,
+        "seconds": elapsed,
+    }
+    rate = pixel_total / max(elapsed, 1e-9) / 1e6
+    print(
+        f"[BZ MAP] Encoded {encoded}, skipped {skipped}, failed {len(failed)} "
+        f"in {elapsed:.2f}s ({rate:.1f} Mpx/s)"
+    )
+    for image_path, error in failed:
+        print(f"[BZ MAP]   {image_path}: {error}")
+    return summary
+
+
+def encode_main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Encode PNG images as Battlezone .map textures."
+    )
+    parser.add_argument("sources", nargs="+", help="Folders or .png files")
+    parser.add_argument(
+        "--format", choices=tuple(MAP_FORMATS), default="XRGB8888", type=str.upper
+    )
+    parser.add_argument(
+        "--out-dir", help="Mirror outputs under this folder instead of in place"
+    )
+    parser.add_argument("--act", help="Target ACT palette for INDEXED output")
+    parser.add_argument(
+        "--new-act",
+        help="Build a shared median-cut ACT from the inputs, save it here and "
+        "use it for INDEXED output (re-encodes every input, ignoring --skip)",
+    )
+    parser.add_argument("--skip", choices=("mtime", "none"), default="mtime")
+    parser.add_argument("--workers", type=int, default=None)
+    args = parser.parse_args(argv)
+
+    summary = encode_images(
+        args.sources,
+        pixel_format=args.format,
+        out_dir=args.out_dir,
+        act_path=args.act,
+        new_act=args.new_act,
+        skip=args.skip,
+        workers=args.workers,
+    )
+    return 1 if summary["failed"] else 0
+
+
+def main(argv=None):
+    import argparse
+
+    parser = argparse.ArgumentParser(
+        description="Convert Battlezone .map textures to PNG or DDS."
+    )
+    parser.add_argument(
+        "sources", nargs="+", help="Folders, .map files or .zfs archives"
+    )
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, default="png")
+    parser.add_argument(
+        "--out-dir", help="Mirror outputs under this folder instead of in place"
+    )
+    parser.add_argument("--act", help="ACT palette for INDEXED maps")
+    parser.add_argument("--skip", choices=SKIP_MODES, default="mtime")
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--compress-level", type=int, default=1)
+    parser.add_argument(
+        "--dds-format", choices=dds_codec.DDS_FORMATS, default="RGBA", type=str.upper
+    )
+    parser.add_argument("--mipmaps", action="store_true")
+    args = parser.parse_args(argv)
+
+    summary = convert_maps(
+        args.sources,
+        output_format=args.format,
+        out_dir=args.out_dir,
+        act_path=args.act,
+        skip=args.skip,
+        workers=args.workers,
+        compress_level=args.compress_level,
+        dds_format=args.dds_format,
+        mipmaps=args.mipmaps,
+    )
+    return 1 if summary["failed"] else 0
@@ -38,10 +38,19 @@ import string
 import time
 import functools
 from mathutils import Matrix
-from bpy_extras.io_utils import ImportHelper
-from bpy.props import StringProperty, BoolProperty, EnumProperty, PointerProperty
+from bpy_extras.io_utils import ImportHelper, ExportHelper
+from bpy.props import (
+    StringProperty,
+    BoolProperty,
+    EnumProperty,
+    FloatProperty,
+    IntProperty,
+    PointerProperty,
+)
 from bpy.types import Operator, Panel, PropertyGroup
+from bpy.app.handlers import persistent
 import os
+import hashlib
 
 import struct
 import csv
@@ -49,6 +58,11 @@ import sys
 from pathlib import Path
 import re
 
+import numpy as np
+
+from . import hg2_heightfield
+from .hg2_heightfield import TerrainHeightfield
+
 ADDON_DIR = Path(__file__).resolve().parent
 MAP_TEMPLATE_PATH = ADDON_DIR / "map_assets" / "BZMapIO.blend"
 VARIANT_LABELS = "ABCDEFGHIJK"
@@ -191,6 +205,47 @@ def _ensure_custom_world_material(material_name, texture_path):
     return material
 
 
+def _build_atlas_table(csv_rows):
+    """Index atlas rows by tile code (e.g. ``00SA``) with float32 UV rects.
+
+    ``rects`` holds the x, y, width and height columns of each row; the
+    first row wins when a CSV repeats a tile code.
+    """
+    codes = np.array([row[0][2:6].upper() for row in csv_rows], dtype="<U4")
+    rects = np.zeros((len(csv_rows), 4), dtype=np.float32)
+    for row_index, row in enumerate(csv_rows):
+        try:
+            rects[row_index] = [float(value) for value in row[1:5]]
+        except (TypeError, ValueError):
+            pass
+    index = {}
+    for row_index, code in enumerate(codes.tolist()):
+        index.setdefault(code, row_index)
+    return {"codes": codes, "rects": rects, "index": index}
+
+
+def _atlas_tile_index(atlas, tile_code, fallback_code=""):
+    index = atlas["index"]
+    found = index.get(tile_code.upper())
+    if found is None:
+        found = index.get(fallback_code.upper(), 0)
+    return found
+
+
+# Parsed custom worlds keyed by (folder, material name), revalidated against
+# the folder's file mtimes so repeated paints never re-read the CSV.
+_custom_world_cache = {}
+
+
+def _custom_world_folder_signature(world_folder):
+    try:
+        with os.scandir(world_folder) as entries:
+            stats = [(entry.name, entry.stat()) for entry in entries if entry.is_file()]
+    except OSError:
+        return None
+    return tuple(sorted((name, stat.st_mtime_ns, stat.st_size) for name, stat in stats))
+
+
 def _load_custom_world_definition(world_folder, preferred_material_name=""):
     world_folder = os.path.abspath(world_folder or "")
     if not os.path.isdir(world_folder):
@@ -198,6 +253,18 @@ def _load_custom_world_definition(world_folder, preferred_material_name=""):
             "Choose a folder containing a custom world .trn and atlas files."
         )
 
+    cache_key = (os.path.normcase(world_folder), preferred_material_name.lower())
+    signature = _custom_world_folder_signature(world_folder)
+    cached = _custom_world_cache.get(cache_key)
+    if cached is not None and signature is not None and cached[0] == signature:
+        return cached[1]
+
+    definition = _parse_custom_world_definition(world_folder, preferred_material_name)
+    _custom_world_cache[cache_key] = (signature, definition)
+    return definition
+
+
+def _parse_custom_world_definition(world_folder, preferred_material_name=""):
     material_name = (preferred_material_name or "").strip()
     if not material_name:
         trn_path = _find_first_matching_file(world_folder, ".trn")
@@ -234,6 +301,7 @@ def _load_custom_world_definition(world_folder, preferred_material_name=""):
         "material_path": material_path,
         "texture_path": texture_path,
         "csv_data": csv_data,
+        "atlas": _build_atlas_table(csv_data),
     }
 
 
@@ -268,6 +336,303 @@ def _loop_multi_select_compat(ring=False):
     return bpy.ops.mesh.loop_multi_select(ring=ring)
 
 
+def _find_user_terrain():
+    # User maps always contain ".hg2_" in their name; the last match wins,
+    # same as the operator loops below.
+    terrain = None
+    for ob in bpy.data.objects:
+        if ".hg2_" in ob.name.lower() and ob.type == "MESH":
+            terrain = ob
+    return terrain
+
+
+def _terrain_local_coords(terrain):
+    mesh = terrain.data
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    return coords
+
+
+def _terrain_heightfield(terrain, coords=None):
+    if coords is None:
+        coords = _terrain_local_coords(terrain)
+    world = np.array(terrain.matrix_world, dtype=np.float64)
+    coords = coords.reshape(-1, 3) @ world[:3, :3].T + world[:3, 3]
+    return TerrainHeightfield.from_vertex_coords(coords)
+
+
+# Sculpt heightfields keyed by terrain name, revalidated against the mesh,
+# the terrain transform and a hash of the vertex coordinates so repeated
+# sculpts never rebuild the grid. Cleared whenever a .blend file loads.
+_terrain_heightfield_cache = {}
+
+
+def _terrain_signature(terrain, coords):
+    matrix = tuple(value for row in terrain.matrix_world for value in row)
+    digest = hashlib.blake2b(coords.tobytes(), digest_size=16).digest()
+    return (terrain.data.name, matrix, digest)
+
+
+def _cached_terrain_heightfield(terrain):
+    coords = _terrain_local_coords(terrain)
+    signature = _terrain_signature(terrain, coords)
+    cached = _terrain_heightfield_cache.get(terrain.name)
+    if cached is not None and cached[0] == signature:
+        return cached[1]
+
+    heightfield = _terrain_heightfield(terrain, coords)
+    _terrain_heightfield_cache[terrain.name] = (signature, heightfield)
+    return heightfield
+
+
+@persistent
+def _clear_terrain_heightfield_cache(_dummy):
+    _terrain_heightfield_cache.clear()
+
+
+def _object_world_triangles(obj, depsgraph):
+    eval_obj = obj.evaluated_get(depsgraph)
+    mesh = eval_obj.to_mesh()
+    try:
+        mesh.calc_loop_triangles()
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        tris = np.empty(len(mesh.loop_triangles) * 3, dtype=np.int64)
+        mesh.loop_triangles.foreach_get("vertices", tris)
+    finally:
+        eval_obj.to_mesh_clear()
+    world = np.array(obj.matrix_world, dtype=np.float64)
+    coords = coords.reshape(-1, 3) @ world[:3, :3].T + world[:3, 3]
+    return coords[tris.reshape(-1, 3)]
+
+
+def _write_terrain_heights(terrain, heightfield, window, mask):
+    """Push edited heightfield values back to just the touched vertices."""
+    indices = heightfield.vertex_indices(window)[mask]
+    if not len(indices):
+        return 0
+    coords = _terrain_local_coords(terrain)
+    local = coords.reshape(-1, 3)
+    world = np.array(terrain.matrix_world, dtype=np.float64)
+    rotation = world[:3, :3]
+    points = local[indices] @ rotation.T + world[:3, 3]
+    points[:, 2] = heightfield.heights[window][mask]
+    local[indices] = (points - world[:3, 3]) @ np.linalg.inv(rotation).T
+
+    mesh = terrain.data
+    mesh.vertices.foreach_set("co", coords)
+    mesh.update()
+    cached = _terrain_heightfield_cache.get(terrain.name)
+    if cached is not None and cached[1] is heightfield:
+        _terrain_heightfield_cache[terrain.name] = (
+            _terrain_signature(terrain, coords),
+            heightfield,
+        )
+    return len(indices)
+
+
+TERRAIN_PREVIEW_COLLECTION = "TERRAIN_PREVIEW"
+
+
+def _terrain_preview_collection(create=False):
+    collection = bpy.data.collections.get(TERRAIN_PREVIEW_COLLECTION)
+    if collection is None and create:
+        collection = bpy.data.collections.new(TERRAIN_PREVIEW_COLLECTION)
+        bpy.context.scene.collection.children.link(collection)
+    return collection
+
+
+def _terrain_preview_factor():
+    collection = _terrain_preview_collection()
+    if collection is None or not collection.objects:
+        return 0
+    return int(collection.get("bz_preview_factor", 0))
+
+
+def _open_terrain_zones():
+    """Full-resolution zone objects currently opened for sculpting."""
+    collection = _terrain_preview_collection()
+    if collection is None:
+        return []
+    return [obj for obj in collection.objects if obj.get("bz_open_zone")]
+
+
+def _open_zone_world_coords(obj):
+    mesh = obj.data
+    coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+    mesh.vertices.foreach_get("co", coords)
+    world = np.array(obj.matrix_world, dtype=np.float64)
+    return coords.reshape(-1, 3) @ world[:3, :3].T + world[:3, 3]
+
+
+def _apply_open_terrain_zones(terrain):
+    """Copy the heights sculpted on open zone objects back onto the terrain.
+
+    Returns the number of terrain vertices written.
+    """
+    zones = _open_terrain_zones()
+    if not zones:
+        return 0
+    heightfield = _cached_terrain_heightfield(terrain)
+    count = 0
+    for obj in zones:
+        window = hg2_heightfield.zone_window(
+            heightfield, obj["bz_zone_row"], obj["bz_zone_col"]
+        )
+        heights = heightfield.heights[window]
+        coords = _open_zone_world_coords(obj)
+        if len(coords) != heights.size:
+            raise ValueError(
+                f"{obj.name} no longer matches the terrain grid "
+                f"({len(coords)} vertices, {heights.size} expected)."
+            )
+        heights[...] = coords[:, 2].reshape(heights.shape)
+        count += _write_terrain_heights(
+            terrain, heightfield, window, np.ones(heights.shape, dtype=bool)
+        )
+    return count
+
+
+def _sync_open_terrain_zones(heightfield):
+    """Refresh open zone objects after the terrain heights changed."""
+    for obj in _open_terrain_zones():
+        window = hg2_heightfield.zone_window(
+            heightfield, obj["bz_zone_row"], obj["bz_zone_col"]
+        )
+        mesh = obj.data
+        coords = np.empty(len(mesh.vertices) * 3, dtype=np.float32)
+        mesh.vertices.foreach_get("co", coords)
+        coords = coords.reshape(-1, 3)
+        heights = heightfield.heights[window].ravel()
+        if len(coords) != len(heights):
+            continue
+        world = np.array(obj.matrix_world, dtype=np.float64)
+        points = coords @ world[:3, :3].T + world[:3, 3]
+        points[:, 2] = heights
+        coords[...] = (points - world[:3, 3]) @ np.linalg.inv(world[:3, :3]).T
+        mesh.vertices.foreach_set("co", coords.ravel())
+        mesh.update()
+
+
+def _remove_terrain_preview(terrain=None):
+    """Delete the preview zones and bring back the full-resolution terrain.
+
+    Heights sculpted on open zones are written back to the terrain first.
+    Returns the preview factor that was active, or 0 when there was none.
+    """
+    factor = _terrain_preview_factor()
+    terrain = terrain or _find_user_terrain()
+    if terrain is not None and factor:
+        _apply_open_terrain_zones(terrain)
+
+    collection = _terrain_preview_collection()
+    if collection is not None:
+        for obj in list(collection.objects):
+            mesh = obj.data
+            bpy.data.objects.remove(obj, do_unlink=True)
+            if mesh is not None and mesh.users == 0:
+                bpy.data.meshes.remove(mesh)
+
+    if terrain is not None and factor:
+        terrain.hide_set(False)
+        terrain.hide_viewport = False
+    return factor
+
+
+def _build_terrain_preview(terrain, factor, open_zones=()):
+    """Replace the terrain in the viewport with block-averaged preview zones.
+
+    Zones listed in ``open_zones`` get their own full-resolution mesh cut
+    from the terrain grid; everything else is drawn from the lightweight
+    previews. The real terrain stays hidden until the preview is removed.
+    """
+    _remove_terrain_preview(terrain)
+    heightfield = _cached_terrain_heightfield(terrain)
+    averaged = hg2_heightfield.block_average(heightfield.heights, factor)
+
+    collection = _terrain_preview_collection(create=True)
+    collection["bz_preview_factor"] = factor
+    zone_rows, zone_cols = hg2_heightfield.zone_count(heightfield)
+    open_zones = set(open_zones)
+    for zone_row in range(zone_rows):
+        for zone_col in range(zone_cols):
+            if (zone_row, zone_col) in open_zones:
+                coords, faces = hg2_heightfield.preview_zone_mesh(
+                    heightfield, heightfield.heights, 1, zone_row, zone_col
+                )
+                name = f"BZTerrainZone_{zone_row}_{zone_col}"
+            else:
+                coords, faces = hg2_heightfield.preview_zone_mesh(
+                    heightfield, averaged, factor, zone_row, zone_col
+                )
+                name = f"BZTerrainPreview_{zone_row}_{zone_col}"
+            mesh = bpy.data.meshes.new(name)
+            mesh.from_pydata(coords.tolist(), [], faces.tolist())
+            mesh.update()
+            obj = bpy.data.objects.new(name, mesh)
+            obj["bz_zone_row"] = zone_row
+            obj["bz_zone_col"] = zone_col
+            if (zone_row, zone_col) in open_zones:
+                obj["bz_open_zone"] = True
+            for material in terrain.data.materials:
+                mesh.materials.append(material)
+            collection.objects.link(obj)
+
+    terrain.hide_set(True)
+    return zone_rows * zone_cols - len(open_zones)
+
+
+def _map_object_collections_objects():
+    objects = []
+    for collection in bpy.data.collections:
+        if collection.name in {"GAMEOBJECTS", "PATHS"}:
+            objects.extend(collection.all_objects)
+    return objects
+
+
+def _object_hierarchy_depth(obj):
+    depth = 0
+    parent = obj.parent
+    while parent is not None:
+        depth += 1
+        parent = parent.parent
+    return depth
+
+
+def _conform_objects_to_terrain(objects, heightfield, remove_constraints=True):
+    """Drop object origins onto the terrain in one batch.
+
+    Heights for every object are sampled together, then parents are placed
+    before children so chained path points keep their world X/Y.
+    """
+    objects = sorted(set(objects), key=_object_hierarchy_depth)
+    if not objects:
+        return 0
+
+    positions = np.array(
+        [obj.matrix_world.translation[:2] for obj in objects], dtype=np.float64
+    )
+    heights = heightfield.sample(positions[:, 0], positions[:, 1])
+
+    placed = {}
+    for obj, height in zip(objects, heights):
+        world = obj.matrix_world.copy()
+        world.translation.z = float(height)
+        if remove_constraints:
+            for constraint in [c for c in obj.constraints if c.type == "SHRINKWRAP"]:
+                obj.constraints.remove(constraint)
+        parent = obj.parent
+        if parent is None:
+            obj.matrix_world = world
+        else:
+            parent_world = placed.get(parent.name, parent.matrix_world)
+            obj.matrix_basis = (
+                parent_world @ obj.matrix_parent_inverse
+            ).inverted() @ world
+        placed[obj.name] = world
+    return len(objects)
+
+
 ######################################################################################################
 ######################################################################################################
 #####  IMPORT ########################################################################################
@@ -673,419 +1038,444 @@ class bzmapimport(Operator, ImportHelper):
                     "String.005"
                 ].string = TextureName
 
-        # Read BZN file data.
-        try:
-            f = open(context.scene.BZMapFile.lower().replace(".hg2", ".bzn"), "r")
-            BZNData = f.readlines()
-
-            # If user has import objects enabled, also import the objects from the BZN file.
-            ImportBZNCheckbox = context.scene.BZMapIO_Toggles.ImportBZN
-            if ImportBZNCheckbox == True:
-
-                # GET HEADER INFORMATION
-                HeaderInfo = []
-                for x in range(0, len(BZNData)):
-                    if BZNData[x] == "[GameObject]\n":
-                        GameObjectIndex = x
-                        break
-                    else:
-                        HeaderInfo.append(BZNData[x])
-                # COLLECT GAME OBJECTS
-                GameObjects = []
-                for x in range(GameObjectIndex, len(BZNData)):
-                    if BZNData[x] == "[AiMission]\n":
-                        AiIndex = x
-                        break
-                    else:
-                        GameObjects.append(BZNData[x])
-                # COLLECT PATH POINT DATA
-                AiPathData = []
-                for x in range(AiIndex, len(BZNData)):
-                    AiPathData.append(BZNData[x])
-
-                # Set active collection to GAMEOBJECTS.
-                layer_collection = bpy.context.view_layer.layer_collection.children[
-                    "GAMEOBJECTS"
-                ]
-                bpy.context.view_layer.active_layer_collection = layer_collection
-
-                # Get all the objects within BZ_Unit_Models collection. Needed to apply 3d models to placed objects.
-                BZ_Unit_Models = []
-                for collection in bpy.data.collections:
-                    if collection.name == "BZ_Unit_Models":
-                        for obj in collection.all_objects:
-                            BZ_Unit_Models.append(obj)
-
-                # Create object for every [GAMEOBJECT] detected in list.
-                for x in range(0, len(GameObjects)):
-                    if GameObjects[x][:12] == "[GameObject]":
-                        UseCustomModel = 0
-                        # Try to locate an object within BZ_Unit_Models collection.
-                        for y in range(0, len(BZ_Unit_Models)):
-                            if (
-                                BZ_Unit_Models[y].name.lower()
-                                in GameObjects[x + 2].lower()
-                            ):
-                                UseCustomModel = 1
+        # Read BZN file data. Freshly generated maps have no BZN yet; there are
+        # no objects to import.
+        bzn_path = context.scene.BZMapFile.lower().replace(".hg2", ".bzn")
+        if os.path.exists(bzn_path):
+            try:
+                f = open(bzn_path, "r")
+                BZNData = f.readlines()
+
+                # If user has import objects enabled, also import the objects from the BZN file.
+                ImportBZNCheckbox = context.scene.BZMapIO_Toggles.ImportBZN
+                LiveShrinkwrap = context.scene.BZMapIO_Toggles.LiveShrinkwrap
+                if ImportBZNCheckbox == True:
+
+                    # GET HEADER INFORMATION
+                    HeaderInfo = []
+                    for x in range(0, len(BZNData)):
+                        if BZNData[x] == "[GameObject]\n":
+                            GameObjectIndex = x
+                            break
+                        else:
+                            HeaderInfo.append(BZNData[x])
+                    # COLLECT GAME OBJECTS
+                    GameObjects = []
+                    for x in range(GameObjectIndex, len(BZNData)):
+                        if BZNData[x] == "[AiMission]\n":
+                            AiIndex = x
+                            break
+                        else:
+                            GameObjects.append(BZNData[x])
+                    # COLLECT PATH POINT DATA
+                    AiPathData = []
+                    for x in range(AiIndex, len(BZNData)):
+                        AiPathData.append(BZNData[x])
+
+                    # Set active collection to GAMEOBJECTS.
+                    layer_collection = bpy.context.view_layer.layer_collection.children[
+                        "GAMEOBJECTS"
+                    ]
+                    bpy.context.view_layer.active_layer_collection = layer_collection
+
+                    # Get all the objects within BZ_Unit_Models collection. Needed to apply 3d models to placed objects.
+                    BZ_Unit_Models = []
+                    for collection in bpy.data.collections:
+                        if collection.name == "BZ_Unit_Models":
+                            for obj in collection.all_objects:
+                                BZ_Unit_Models.append(obj)
+
+                    # Create object for every [GAMEOBJECT] detected in list.
+                    for x in range(0, len(GameObjects)):
+                        if GameObjects[x][:12] == "[GameObject]":
+                            UseCustomModel = 0
+                            # Try to locate an object within BZ_Unit_Models collection.
+                            for y in range(0, len(BZ_Unit_Models)):
+                                if (
+                                    BZ_Unit_Models[y].name.lower()
+                                    in GameObjects[x + 2].lower()
+                                ):
+                                    UseCustomModel = 1
 
-                                # Select and duplicate the model.
-                                bpy.ops.object.select_all(action="DESELECT")
-                                bpy.context.view_layer.objects.active = BZ_Unit_Models[
-                                    y
-                                ]
-                                bpy.data.objects[BZ_Unit_Models[y].name].select_set(
-                                    True
-                                )
+                                    # Select and duplicate the model.
+                                    bpy.ops.object.select_all(action="DESELECT")
+                                    bpy.context.view_layer.objects.active = (
+                                        BZ_Unit_Models[y]
+                                    )
+                                    bpy.data.objects[BZ_Unit_Models[y].name].select_set(
+                                        True
+                                    )
 
-                                # Update the shrinkwrap modifier to use the user's map.
-                                bpy.context.object.constraints["Shrinkwrap"].target = (
-                                    bpy.data.objects[UserMap.name]
-                                )
+                                    # Update the shrinkwrap modifier to use the user's map.
+                                    bpy.context.object.constraints[
+                                        "Shrinkwrap"
+                                    ].target = bpy.data.objects[UserMap.name]
 
-                                bpy.ops.object.duplicate_move(
-                                    OBJECT_OT_duplicate={
-                                        "linked": False,
-                                        "mode": "TRANSLATION",
-                                    },
-                                    TRANSFORM_OT_translate={
-                                        "value": (0, 0, 0),
-                                        "orient_type": "GLOBAL",
-                                        "orient_matrix": (
-                                            (1, 0, 0),
-                                            (0, 1, 0),
-                                            (0, 0, 1),
-                                        ),
-                                        "orient_matrix_type": "GLOBAL",
-                                        "constraint_axis": (False, False, False),
-                                        "mirror": False,
-                                        "use_proportional_edit": False,
-                                        "proportional_edit_falloff": "SMOOTH",
-                                        "proportional_size": 1,
-                                        "use_proportional_connected": False,
-                                        "use_proportional_projected": False,
-                                        "snap": False,
-                                        "snap_elements": {
-                                            "VERTEX",
-                                            "FACE",
-                                            "FACE_NEAREST",
+                                    bpy.ops.object.duplicate_move(
+                                        OBJECT_OT_duplicate={
+                                            "linked": False,
+                                            "mode": "TRANSLATION",
                                         },
-                                        "use_snap_project": True,
-                                        "snap_target": "CENTER",
-                                        "use_snap_self": True,
-                                        "use_snap_edit": True,
-                                        "use_snap_nonedit": True,
-                                        "use_snap_selectable": False,
-                                        "snap_point": (0, 0, 0),
-                                        "snap_align": False,
-                                        "snap_normal": (0, 0, 0),
-                                        "gpencil_strokes": False,
-                                        "cursor_transform": False,
-                                        "texture_space": False,
-                                        "remove_on_cancel": False,
-                                        "view2d_edge_pan": False,
-                                        "release_confirm": False,
-                                        "use_accurate": False,
-                                        "use_automerge_and_split": False,
-                                    },
-                                )
-                                bpy.ops.object.move_to_collection(collection_index=2)
-
-                                # We discard any existing data the template object has attached to it.
-                                # ... this is only utilized in any meaningful capacity when the user is PLACING objects.
-
-                                # Because blender is dumb we have to collect the list before
-                                # deleting stuff from it... don't ask why. *sigh*
-                                KeyList = []
-                                for key, value in bpy.context.object.data.items():
-                                    KeyList.append(key)
-                                    pass
-
-                                for x in range(0, len(KeyList)):
-                                    del bpy.context.object.data[KeyList[x]]
+                                        TRANSFORM_OT_translate={
+                                            "value": (0, 0, 0),
+                                            "orient_type": "GLOBAL",
+                                            "orient_matrix": (
+                                                (1, 0, 0),
+                                                (0, 1, 0),
+                                                (0, 0, 1),
+                                            ),
+                                            "orient_matrix_type": "GLOBAL",
+                                            "constraint_axis": (False, False, False),
+                                            "mirror": False,
+                                            "use_proportional_edit": False,
+                                            "proportional_edit_falloff": "SMOOTH",
+                                            "proportional_size": 1,
+                                            "use_proportional_connected": False,
+                                            "use_proportional_projected": False,
+                                            "snap": False,
+                                            "snap_elements": {
+                                                "VERTEX",
+                                                "FACE",
+                                                "FACE_NEAREST",
+                                            },
+                                            "use_snap_project": True,
+                                            "snap_target": "CENTER",
+                                            "use_snap_self": True,
+                                            "use_snap_edit": True,
+                                            "use_snap_nonedit": True,
+                                            "use_snap_selectable": False,
+                                            "snap_point": (0, 0, 0),
+                                            "snap_align": False,
+                                            "snap_normal": (0, 0, 0),
+                                            "gpencil_strokes": False,
+                                            "cursor_transform": False,
+                                            "texture_space": False,
+                                            "remove_on_cancel": False,
+                                            "view2d_edge_pan": False,
+                                            "release_confirm": False,
+                                            "use_accurate": False,
+                                            "use_automerge_and_split": False,
+                                        },
+                                    )
+                                    bpy.ops.object.move_to_collection(
+                                        collection_index=2
+                                    )
 
-                                break
+                                    # We discard any existing data the template object has attached to it.
+                                    # ... this is only utilized in any meaningful capacity when the user is PLACING objects.
 
-                        if UseCustomModel == 0:
-                            bpy.ops.mesh.primitive_cube_add(
-                                size=2,
-                                enter_editmode=False,
-                                align="WORLD",
-                                location=(0, 0, 0),
-                                scale=(5, 5, 5),
-                            )
+                                    # Because blender is dumb we have to collect the list before
+                                    # deleting stuff from it... don't ask why. *sigh*
+                                    KeyList = []
+                                    for key, value in bpy.context.object.data.items():
+                                        KeyList.append(key)
+                                        pass
 
-                    # This is where data is written into the custom properties of each GAMEOBJECT.
-                    bpy.context.object.data[str(x)] = GameObjects[x]
-
-                    # Use label for object name
-                    if "label = " in GameObjects[x]:
-                        bpy.context.object.name = GameObjects[x][8:].replace("\n", "")
-
-                    # Position the object, this data is just above euler properties in the data.
-                    if "seqno [1]" in GameObjects[x]:
-                        bpy.context.object.location[0] = (
-                            float(GameObjects[x + 8])
-                        ) - float(MinZ)
-                        bpy.context.object.location[1] = (
-                            float(GameObjects[x + 4]) * -1
-                        ) - float(MinX)
-                        bpy.context.object.location[2] = (
-                            float(GameObjects[x + 6])
-                        ) - float(MinHeight)
-
-                    # Rotate the object.
-                    if "transform [1]" in GameObjects[x]:
-                        m = [
-                            (
-                                float(GameObjects[x + 2]),
-                                float(GameObjects[x + 4]),
-                                float(GameObjects[x + 6]),
-                                1,
-                            ),
-                            (
-                                float(GameObjects[x + 8]),
-                                float(GameObjects[x + 10]),
-                                float(GameObjects[x + 12]),
-                                0,
-                            ),
-                            (
-                                float(GameObjects[x + 14]),
-                                float(GameObjects[x + 16]),
-                                float(GameObjects[x + 18]),
-                                0,
-                            ),
-                            (0, 0, 0, 1),
-                        ]
-                        objrot = Matrix(m)
-
-                        # Matrix is constructed, now apply it!
-                        bpy.context.object.rotation_euler[0] = objrot.to_euler()[0]
-                        bpy.context.object.rotation_euler[2] = (
-                            objrot.to_euler()[1] + 1.5708
-                        )  # offset by 90 degrees
-                        bpy.context.object.rotation_euler[1] = (
-                            objrot.to_euler()[2] * -1
-                        )  # Y axis is inverse in BZ
-
-                # Set active collection to PATHS.
-                layer_collection = bpy.context.view_layer.layer_collection.children[
-                    "PATHS"
-                ]
-                bpy.context.view_layer.active_layer_collection = layer_collection
-                # Create 1 object for every [AiPath] detected in list.
+                                    for x in range(0, len(KeyList)):
+                                        del bpy.context.object.data[KeyList[x]]
 
-                def MakeAiPathPoint(
-                    PathPointScale, NameShowFlag, ObjectFlag, ObjectName
-                ):
-                    # Generate first point. This is often used to spawn custom stuff or respawning items.
-                    bpy.ops.mesh.primitive_cube_add(
-                        size=2,
-                        enter_editmode=False,
-                        align="WORLD",
-                        location=(0, 0, 0),
-                        scale=(PathPointScale, PathPointScale, PathPointScale),
-                    )
-                    bpy.context.object.name = ObjectName
+                                    break
 
-                    UserPathObject = bpy.context.view_layer.objects.active
-                    bpy.context.object.display_type = "BOUNDS"
-                    if NameShowFlag == 1:
-                        bpy.context.object.show_name = True
-                    bpy.context.object.show_in_front = True
-
-                    # If flag is set, determine whether or not the object can be represented with a model.
-                    if ObjectFlag == True:
-                        # Get all the objects within BZ_Unit_Models collection. Needed to apply 3d models to placed objects.
-                        BZ_Unit_Models = []
-                        for collection in bpy.data.collections:
-                            if collection.name == "BZ_Unit_Models":
-                                for obj in collection.all_objects:
-                                    BZ_Unit_Models.append(obj)
-
-                        # Try to locate an object within BZ_Unit_Models collection.
-                        for q in range(0, len(BZ_Unit_Models)):
-                            if (
-                                BZ_Unit_Models[q].name.lower()
-                                in UserPathObject.name.lower()
-                            ):
-                                # If a model is found, duplicate the mesh and join it with the path point.
-                                bpy.ops.object.select_all(action="DESELECT")
-                                bpy.data.objects[BZ_Unit_Models[q].name].select_set(
-                                    True
-                                )
-                                bpy.context.view_layer.objects.active = BZ_Unit_Models[
-                                    q
-                                ]
-                                bpy.ops.object.duplicate_move(
-                                    OBJECT_OT_duplicate={
-                                        "linked": False,
-                                        "mode": "TRANSLATION",
-                                    },
-                                    TRANSFORM_OT_translate={
-                                        "value": (0, 0, 0),
-                                        "orient_type": "GLOBAL",
-                                        "orient_matrix": (
-                                            (1, 0, 0),
-                                            (0, 1, 0),
-                                            (0, 0, 1),
-                                        ),
-                                        "orient_matrix_type": "GLOBAL",
-                                        "constraint_axis": (False, False, False),
-                                        "mirror": False,
-                                        "use_proportional_edit": False,
-                                        "proportional_edit_falloff": "SMOOTH",
-                                        "proportional_size": 1,
-                                        "use_proportional_connected": False,
-                                        "use_proportional_projected": False,
-                                        "snap": False,
-                                        "snap_elements": {
-                                            "VERTEX",
-                                            "FACE",
-                                            "FACE_NEAREST",
-                                        },
-                                        "use_snap_project": True,
-                                        "snap_target": "CENTER",
-                                        "use_snap_self": True,
-                                        "use_snap_edit": True,
-                                        "use_snap_nonedit": True,
-                                        "use_snap_selectable": False,
-                                        "snap_point": (0, 0, 0),
-                                        "snap_align": False,
-                                        "snap_normal": (0, 0, 0),
-                                        "gpencil_strokes": False,
-                                        "cursor_transform": False,
-                                        "texture_space": False,
-                                        "remove_on_cancel": False,
-                                        "view2d_edge_pan": False,
-                                        "release_confirm": False,
-                                        "use_accurate": False,
-                                        "use_automerge_and_split": False,
-                                    },
+                            if UseCustomModel == 0:
+                                bpy.ops.mesh.primitive_cube_add(
+                                    size=2,
+                                    enter_editmode=False,
+                                    align="WORLD",
+                                    location=(0, 0, 0),
+                                    scale=(5, 5, 5),
                                 )
-                                bpy.context.view_layer.objects.active = UserPathObject
-                                bpy.data.objects[UserPathObject.name].select_set(True)
-                                bpy.ops.object.join()
-                                bpy.context.object.display_type = "WIRE"
-                                bpy.context.object.show_in_front = False
 
-                                # Move the object into the AI path point collection.
-                                break
-
-                for x in range(0, len(AiPathData)):
-                    if AiPathData[x] == "[AiPath]\n":
+                        # This is where data is written into the custom properties of each GAMEOBJECT.
+                        bpy.context.object.data[str(x)] = GameObjects[x]
 
-                        # For whatever reason, there can be path points which don't exist anywhere
-                        # in the map and are created without labels. Ignore these.
-                        if "label = " in AiPathData[x + 4]:
-                            bpy.ops.object.select_all(action="DESELECT")
-                            MakeAiPathPoint(
-                                5, 1, True, AiPathData[x + 4][8:].replace("\n", "")
+                        # Use label for object name
+                        if "label = " in GameObjects[x]:
+                            bpy.context.object.name = GameObjects[x][8:].replace(
+                                "\n", ""
                             )
 
-                            ParentPathPoint = bpy.context.object
-
-                            # Position the path
-                            bpy.context.object.location[1] = (
-                                float(AiPathData[x + 9])
-                            ) * -1 - float(MinX)
+                        # Position the object, this data is just above euler properties in the data.
+                        if "seqno [1]" in GameObjects[x]:
                             bpy.context.object.location[0] = (
-                                float(AiPathData[x + 11])
+                                float(GameObjects[x + 8])
                             ) - float(MinZ)
+                            bpy.context.object.location[1] = (
+                                float(GameObjects[x + 4]) * -1
+                            ) - float(MinX)
+                            bpy.context.object.location[2] = (
+                                float(GameObjects[x + 6])
+                            ) - float(MinHeight)
+
+                        # Rotate the object.
+                        if "transform [1]" in GameObjects[x]:
+                            m = [
+                                (
+                                    float(GameObjects[x + 2]),
+                                    float(GameObjects[x + 4]),
+                                    float(GameObjects[x + 6]),
+                                    1,
+                                ),
+                                (
+                                    float(GameObjects[x + 8]),
+                                    float(GameObjects[x + 10]),
+                                    float(GameObjects[x + 12]),
+                                    0,
+                                ),
+                                (
+                                    float(GameObjects[x + 14]),
+                                    float(GameObjects[x + 16]),
+                                    float(GameObjects[x + 18]),
+                                    0,
+                                ),
+                                (0, 0, 0, 1),
+                            ]
+                            objrot = Matrix(m)
+
+                            # Matrix is constructed, now apply it!
+                            bpy.context.object.rotation_euler[0] = objrot.to_euler()[0]
+                            bpy.context.object.rotation_euler[2] = (
+                                objrot.to_euler()[1] + 1.5708
+                            )  # offset by 90 degrees
+                            bpy.context.object.rotation_euler[1] = (
+                                objrot.to_euler()[2] * -1
+                            )  # Y axis is inverse in BZ
+
+                    # Set active collection to PATHS.
+                    layer_collection = bpy.context.view_layer.layer_collection.children[
+                        "PATHS"
+                    ]
+                    bpy.context.view_layer.active_layer_collection = layer_collection
+                    # Create 1 object for every [AiPath] detected in list.
 
-                            # Shrinkwrap path to terrain mesh.
-                            bpy.ops.object.constraint_add(type="SHRINKWRAP")
-                            bpy.context.object.constraints[
-                                "Shrinkwrap"
-                            ].shrinkwrap_type = "PROJECT"
-                            bpy.context.object.constraints[
-                                "Shrinkwrap"
-                            ].project_axis = "POS_Z"
-                            bpy.context.object.constraints["Shrinkwrap"].target = (
-                                bpy.data.objects[UserMap.name]
-                            )
-                            bpy.context.object.constraints[
-                                "Shrinkwrap"
-                            ].project_axis_space = "WORLD"
-                            bpy.context.object.constraints[
-                                "Shrinkwrap"
-                            ].use_project_opposite = True
-
-                            # Get number of points.
-                            IncrementPoint = 0
-                            for y in range(1, int(AiPathData[x + 6])):
-
-                                PrevAiPathPoint = bpy.context.object
+                    def MakeAiPathPoint(
+                        PathPointScale, NameShowFlag, ObjectFlag, ObjectName
+                    ):
+                        # Generate first point. This is often used to spawn custom stuff or respawning items.
+                        bpy.ops.mesh.primitive_cube_add(
+                            size=2,
+                            enter_editmode=False,
+                            align="WORLD",
+                            location=(0, 0, 0),
+                            scale=(PathPointScale, PathPointScale, PathPointScale),
+                        )
+                        bpy.context.object.name = ObjectName
+
+                        UserPathObject = bpy.context.view_layer.objects.active
+                        bpy.context.object.display_type = "BOUNDS"
+                        if NameShowFlag == 1:
+                            bpy.context.object.show_name = True
+                        bpy.context.object.show_in_front = True
+
+                        # If flag is set, determine whether or not the object can be represented with a model.
+                        if ObjectFlag == True:
+                            # Get all the objects within BZ_Unit_Models collection. Needed to apply 3d models to placed objects.
+                            BZ_Unit_Models = []
+                            for collection in bpy.data.collections:
+                                if collection.name == "BZ_Unit_Models":
+                                    for obj in collection.all_objects:
+                                        BZ_Unit_Models.append(obj)
+
+                            # Try to locate an object within BZ_Unit_Models collection.
+                            for q in range(0, len(BZ_Unit_Models)):
+                                if (
+                                    BZ_Unit_Models[q].name.lower()
+                                    in UserPathObject.name.lower()
+                                ):
+                                    # If a model is found, duplicate the mesh and join it with the path point.
+                                    bpy.ops.object.select_all(action="DESELECT")
+                                    bpy.data.objects[BZ_Unit_Models[q].name].select_set(
+                                        True
+                                    )
+                                    bpy.context.view_layer.objects.active = (
+                                        BZ_Unit_Models[q]
+                                    )
+                                    bpy.ops.object.duplicate_move(
+                                        OBJECT_OT_duplicate={
+                                            "linked": False,
+                                            "mode": "TRANSLATION",
+                                        },
+                                        TRANSFORM_OT_translate={
+                                            "value": (0, 0, 0),
+                                            "orient_type": "GLOBAL",
+                                            "orient_matrix": (
+                                                (1, 0, 0),
+                                                (0, 1, 0),
+                                                (0, 0, 1),
+                                            ),
+                                            "orient_matrix_type": "GLOBAL",
+                                            "constraint_axis": (False, False, False),
+                                            "mirror": False,
+                                            "use_proportional_edit": False,
+                                            "proportional_edit_falloff": "SMOOTH",
+                                            "proportional_size": 1,
+                                            "use_proportional_connected": False,
+                                            "use_proportional_projected": False,
+                                            "snap": False,
+                                            "snap_elements": {
+                                                "VERTEX",
+                                                "FACE",
+                                                "FACE_NEAREST",
+                                            },
+                                            "use_snap_project": True,
+                                            "snap_target": "CENTER",
+                                            "use_snap_self": True,
+                                            "use_snap_edit": True,
+                                            "use_snap_nonedit": True,
+                                            "use_snap_selectable": False,
+                                            "snap_point": (0, 0, 0),
+                                            "snap_align": False,
+                                            "snap_normal": (0, 0, 0),
+                                            "gpencil_strokes": False,
+                                            "cursor_transform": False,
+                                            "texture_space": False,
+                                            "remove_on_cancel": False,
+                                            "view2d_edge_pan": False,
+                                            "release_confirm": False,
+                                            "use_accurate": False,
+                                            "use_automerge_and_split": False,
+                                        },
+                                    )
+                                    bpy.context.view_layer.objects.active = (
+                                        UserPathObject
+                                    )
+                                    bpy.data.objects[UserPathObject.name].select_set(
+                                        True
+                                    )
+                                    bpy.ops.object.join()
+                                    bpy.context.object.display_type = "WIRE"
+                                    bpy.context.object.show_in_front = False
+
+                                    # Move the object into the AI path point collection.
+                                    break
+
+                    for x in range(0, len(AiPathData)):
+                        if AiPathData[x] == "[AiPath]\n":
+
+                            # For whatever reason, there can be path points which don't exist anywhere
+                            # in the map and are created without labels. Ignore these.
+                            if "label = " in AiPathData[x + 4]:
+                                bpy.ops.object.select_all(action="DESELECT")
                                 MakeAiPathPoint(
-                                    3, 0, False, AiPathData[x + 4][8:].replace("\n", "")
+                                    5, 1, True, AiPathData[x + 4][8:].replace("\n", "")
                                 )
 
-                                # Shrinkwrap path to terrain mesh.
-                                bpy.ops.object.constraint_add(type="SHRINKWRAP")
-                                bpy.context.object.constraints[
-                                    "Shrinkwrap"
-                                ].shrinkwrap_type = "PROJECT"
-                                bpy.context.object.constraints[
-                                    "Shrinkwrap"
-                                ].project_axis = "POS_Z"
-                                bpy.context.object.constraints["Shrinkwrap"].target = (
-                                    bpy.data.objects[UserMap.name]
-                                )
-                                bpy.context.object.constraints[
-                                    "Shrinkwrap"
-                                ].project_axis_space = "WORLD"
-                                bpy.context.object.constraints[
-                                    "Shrinkwrap"
-                                ].use_project_opposite = True
-
-                                # Path point name
-                                bpy.context.object.name = (
-                                    AiPathData[x + 4][8:].replace("\n", "")
-                                    + "_pathpoint"
-                                )
+                                ParentPathPoint = bpy.context.object
 
                                 # Position the path
                                 bpy.context.object.location[1] = (
-                                    float(AiPathData[x + 13 + IncrementPoint])
+                                    float(AiPathData[x + 9])
                                 ) * -1 - float(MinX)
                                 bpy.context.object.location[0] = (
-                                    float(AiPathData[x + 15 + IncrementPoint])
+                                    float(AiPathData[x + 11])
                                 ) - float(MinZ)
-                                IncrementPoint += 4
-
-                                if y == 1:
-                                    # These are child points, parent them to the first-created point.
-                                    bpy.context.object.parent = ParentPathPoint
-                                    bpy.context.object.matrix_parent_inverse = (
-                                        ParentPathPoint.matrix_world.inverted()
-                                    )  # account for parent space.
-                                else:
-                                    bpy.context.object.parent = PrevAiPathPoint
-                                    bpy.context.object.matrix_parent_inverse = (
-                                        PrevAiPathPoint.matrix_world.inverted()
-                                    )  # account for parent space.
 
-                # All of the shrinkwrap constraints on every object need to be re-assigned since the map was deleted/recreated.
-                for ob in bpy.data.objects:
-                    try:
-                        ob.constraints["Shrinkwrap"].target = bpy.data.objects[
-                            UserMap.name
-                        ]
-                    except KeyError:
-                        pass
+                                # Shrinkwrap path to terrain mesh.
+                                if LiveShrinkwrap:
+                                    bpy.ops.object.constraint_add(type="SHRINKWRAP")
+                                    bpy.context.object.constraints[
+                                        "Shrinkwrap"
+                                    ].shrinkwrap_type = "PROJECT"
+                                    bpy.context.object.constraints[
+                                        "Shrinkwrap"
+                                    ].project_axis = "POS_Z"
+                                    bpy.context.object.constraints[
+                                        "Shrinkwrap"
+                                    ].target = bpy.data.objects[UserMap.name]
+                                    bpy.context.object.constraints[
+                                        "Shrinkwrap"
+                                    ].project_axis_space = "WORLD"
+                                    bpy.context.object.constraints[
+                                        "Shrinkwrap"
+                                    ].use_project_opposite = True
+
+                                # Get number of points.
+                                IncrementPoint = 0
+                                for y in range(1, int(AiPathData[x + 6])):
+
+                                    PrevAiPathPoint = bpy.context.object
+                                    MakeAiPathPoint(
+                                        3,
+                                        0,
+                                        False,
+                                        AiPathData[x + 4][8:].replace("\n", ""),
+                                    )
 
-            # Move BZ_Unit_Models out of user's view.
-            for collection in bpy.data.collections:
-                if collection.name == "BZ_Unit_Models":
-                    for obj in collection.all_objects:
-                        obj.location[0] = 0
-                        obj.location[1] = 5000
-                        obj.location[2] = 0
+                                    # Shrinkwrap path to terrain mesh.
+                                    if LiveShrinkwrap:
+                                        bpy.ops.object.constraint_add(type="SHRINKWRAP")
+                                        bpy.context.object.constraints[
+                                            "Shrinkwrap"
+                                        ].shrinkwrap_type = "PROJECT"
+                                        bpy.context.object.constraints[
+                                            "Shrinkwrap"
+                                        ].project_axis = "POS_Z"
+                                        bpy.context.object.constraints[
+                                            "Shrinkwrap"
+                                        ].target = bpy.data.objects[UserMap.name]
+                                        bpy.context.object.constraints[
+                                            "Shrinkwrap"
+                                        ].project_axis_space = "WORLD"
+                                        bpy.context.object.constraints[
+                                            "Shrinkwrap"
+                                        ].use_project_opposite = True
+
+                                    # Path point name
+                                    bpy.context.object.name = (
+                                        AiPathData[x + 4][8:].replace("\n", "")
+                                        + "_pathpoint"
+                                    )
 
-        except UnicodeDecodeError:
-            self.report(
-                {"WARNING"},
-                "BZMapIO:  BZN file is binary and cannot be read. Re-save it using the game's asciisave launch argument.",
-            )
+                                    # Position the path
+                                    bpy.context.object.location[1] = (
+                                        float(AiPathData[x + 13 + IncrementPoint])
+                                    ) * -1 - float(MinX)
+                                    bpy.context.object.location[0] = (
+                                        float(AiPathData[x + 15 + IncrementPoint])
+                                    ) - float(MinZ)
+                                    IncrementPoint += 4
+
+                                    if y == 1:
+                                        # These are child points, parent them to the first-created point.
+                                        bpy.context.object.parent = ParentPathPoint
+                                        bpy.context.object.matrix_parent_inverse = (
+                                            ParentPathPoint.matrix_world.inverted()
+                                        )  # account for parent space.
+                                    else:
+                                        bpy.context.object.parent = PrevAiPathPoint
+                                        bpy.context.object.matrix_parent_inverse = (
+                                            PrevAiPathPoint.matrix_world.inverted()
+                                        )  # account for parent space.
+
+                    # Without live constraints, drop every imported object onto the terrain in one pass instead.
+                    if not LiveShrinkwrap:
+                        bpy.context.view_layer.update()
+                        _conform_objects_to_terrain(
+                            _map_object_collections_objects(),
+                            _terrain_heightfield(UserMap),
+                        )
+
+                    # All of the shrinkwrap constraints on every object need to be re-assigned since the map was deleted/recreated.
+                    for ob in bpy.data.objects:
+                        try:
+                            ob.constraints["Shrinkwrap"].target = bpy.data.objects[
+                                UserMap.name
+                            ]
+                        except KeyError:
+                            pass
+
+                # Move BZ_Unit_Models out of user's view.
+                for collection in bpy.data.collections:
+                    if collection.name == "BZ_Unit_Models":
+                        for obj in collection.all_objects:
+                            obj.location[0] = 0
+                            obj.location[1] = 5000
+                            obj.location[2] = 0
+
+            except UnicodeDecodeError:
+                self.report(
+                    {"WARNING"},
+                    "BZMapIO:  BZN file is binary and cannot be read. Re-save it using the game's asciisave launch argument.",
+                )
 
         # Remove the tile selector interface if it is present. Textures must be re-loaded.
 
@@ -1126,6 +1516,9 @@ class bzmapexport(bpy.types.Operator):
 
     def execute(self, context):
 
+        # Export reads the full resolution terrain; swap the preview out for now.
+        PreviewFactor = _remove_terrain_preview()
+
         # Make sure user is in layout workspace and in object mode.
         bpy.context.window.workspace = bpy.data.workspaces["Layout"]
         bpy.ops.object.mode_set(mode="OBJECT")
@@ -1968,6 +2361,9 @@ class bzmapexport(bpy.types.Operator):
                 + " & objects Saved/Updated",
             )
 
+        if PreviewFactor:
+            _build_terrain_preview(_find_user_terrain(), PreviewFactor)
+
         return {"FINISHED"}
 
 
@@ -2527,12 +2923,36 @@ class bzgosculpt(bpy.types.Operator):
             if bpy.context.active_object.mode != "OBJECT":
                 bpy.ops.object.mode_set(mode="OBJECT")
 
+            # With a terrain preview active, only the selected preview zones
+            # are opened at full resolution for sculpting.
+            PreviewFactor = _terrain_preview_factor()
+            SculptZones = []
+            if PreviewFactor:
+                OpenZones = {
+                    (ob["bz_zone_row"], ob["bz_zone_col"])
+                    for ob in bpy.context.selected_objects
+                    if "bz_zone_row" in ob and "bz_zone_col" in ob
+                }
+                if OpenZones:
+                    _build_terrain_preview(
+                        _find_user_terrain(), PreviewFactor, OpenZones
+                    )
+                SculptZones = _open_terrain_zones()
+                if not SculptZones:
+                    _remove_terrain_preview()
+
             bpy.ops.object.select_all(action="DESELECT")
-            # Get user's current working map using string match of "HG2"
-            for ob in bpy.data.objects:
-                if ".hg2_" in ob.name.lower():
-                    bpy.context.view_layer.objects.active = ob
-                    bpy.data.objects[ob.name].select_set(True)
+            if SculptZones:
+                # Sculpt the opened zone meshes; the real terrain stays hidden.
+                for ob in SculptZones:
+                    ob.select_set(True)
+                bpy.context.view_layer.objects.active = SculptZones[0]
+            else:
+                # Get user's current working map using string match of "HG2"
+                for ob in bpy.data.objects:
+                    if ".hg2_" in ob.name.lower():
+                        bpy.context.view_layer.objects.active = ob
+                        bpy.data.objects[ob.name].select_set(True)
             bpy.context.window.workspace = bpy.data.workspaces["Sculpting"]
 
         return {"FINISHED"}
@@ -2548,6 +2968,8 @@ class bzgopaint(bpy.types.Operator):
         bpy.context.window.workspace = bpy.data.workspaces["Layout"]
 
         if bpy.context.active_object.mode == "OBJECT":
+            # Tile painting covers the whole map, so leave the preview first.
+            _remove_terrain_preview()
             bpy.ops.object.select_all(action="DESELECT")
             # Get user's current working map using string match of "HG2"
             for ob in bpy.data.objects:
@@ -2607,6 +3029,283 @@ class bzpaintshrinkwrap(bpy.types.Operator):
         return {"FINISHED"}
 
 
+class BZMAPIO_OT_conform_objects(Operator):
+    bl_idname = "bzmapio.conform_objects"
+    bl_label = "Conform to Terrain"
+    bl_description = "Snap map objects and path points onto the terrain surface in one batch, without live Shrinkwrap constraints"
+    bl_options = {"REGISTER", "UNDO"}
+
+    scope: Any = EnumProperty(
+        name="Objects",
+        items=(
+            ("SELECTED", "Selected", "Conform the selected map objects"),
+            ("ALL", "All", "Conform everything in GAMEOBJECTS and PATHS"),
+        ),
+        default="SELECTED",
+    )
+
+    remove_constraints: Any = BoolProperty(
+        name="Remove Shrinkwrap Constraints",
+        description="Strip live Shrinkwrap constraints from conformed objects so they no longer slow down viewport updates",
+        default=True,
+    )
+
+    def execute(self, context):
+        terrain = _find_user_terrain()
+        if terrain is None:
+            self.report({"ERROR"}, "BZMapIO: No .hg2 terrain found in the scene.")
+            return {"CANCELLED"}
+
+        if self.scope == "ALL":
+            objects = _map_object_collections_objects()
+        else:
+            objects = list(context.selected_objects)
+        objects = [
+            obj for obj in objects if obj != terrain and "bz_zone_row" not in obj
+        ]
+        if not objects:
+            self.report({"WARNING"}, "BZMapIO: No objects to conform.")
+            return {"CANCELLED"}
+
+        try:
+            _apply_open_terrain_zones(terrain)
+            heightfield = _terrain_heightfield(terrain)
+        except ValueError as exc:
+            self.report({"ERROR"}, f"BZMapIO: {exc}")
+            return {"CANCELLED"}
+
+        count = _conform_objects_to_terrain(
+            objects, heightfield, remove_constraints=self.remove_constraints
+        )
+        self.report({"INFO"}, f"BZMapIO: Conformed {count} objects to the terrain.")
+        return {"FINISHED"}
+
+
+class BZMAPIO_OT_terrain_sculpt(Operator):
+    bl_idname = "bzmapio.terrain_sculpt"
+    bl_label = "Heightfield Sculpt"
+    bl_description = "Edit the terrain heightfield under the selected objects directly, without Shrinkwrap modifiers"
+    bl_options = {"REGISTER", "UNDO"}
+
+    mode: Any = EnumProperty(
+        name="Mode",
+        items=(
+            (
+                "STAMP",
+                "Stamp",
+                "Press the lowest surface of the selected objects into the terrain",
+            ),
+            (
+                "FLATTEN",
+                "Flatten",
+                "Level the terrain under the selected objects to its average height",
+            ),
+            ("SMOOTH", "Smooth", "Relax the terrain under the selected objects"),
+            (
+                "NOISE",
+                "Noise",
+                "Add value noise to the terrain under the selected objects",
+            ),
+        ),
+        default="STAMP",
+    )
+
+    stamp_mode: Any = EnumProperty(
+        name="Stamp",
+        items=(
+            ("SET", "Set", "Terrain takes the object surface everywhere it is covered"),
+            ("RAISE", "Raise Only", "Only lift terrain up to the object surface"),
+            ("LOWER", "Lower Only", "Only dig terrain down to the object surface"),
+        ),
+        default="SET",
+    )
+
+    strength: Any = FloatProperty(
+        name="Strength", default=1.0, min=0.0, max=1.0, subtype="FACTOR"
+    )
+
+    iterations: Any = IntProperty(name="Iterations", default=4, min=1, max=64)
+
+    amplitude: Any = FloatProperty(
+        name="Amplitude", default=5.0, min=0.0, soft_max=100.0, unit="LENGTH"
+    )
+
+    noise_scale: Any = FloatProperty(
+        name="Noise Scale", default=40.0, min=1.0, soft_max=1000.0, unit="LENGTH"
+    )
+
+    seed: Any = IntProperty(name="Seed", default=0)
+
+    def draw(self, context):
+        layout = self.layout
+        layout.prop(self, "mode")
+        if self.mode == "STAMP":
+            layout.prop(self, "stamp_mode")
+        else:
+            layout.prop(self, "strength")
+        if self.mode == "SMOOTH":
+            layout.prop(self, "iterations")
+        if self.mode == "NOISE":
+            layout.prop(self, "amplitude")
+            layout.prop(self, "noise_scale")
+            layout.prop(self, "seed")
+
+    def execute(self, context):
+        if context.mode != "OBJECT":
+            self.report({"WARNING"}, "BZMapIO: This tool only operates in OBJECT mode.")
+            return {"CANCELLED"}
+
+        terrain = _find_user_terrain()
+        if terrain is None:
+            self.report({"ERROR"}, "BZMapIO: No .hg2 terrain found in the scene.")
+            return {"CANCELLED"}
+
+        depsgraph = context.evaluated_depsgraph_get()
+        triangles = [
+            _object_world_triangles(obj, depsgraph)
+            for obj in context.selected_objects
+            if obj != terrain and obj.type == "MESH" and "bz_zone_row" not in obj
+        ]
+        triangles = [tris for tris in triangles if len(tris)]
+        if not triangles:
+            self.report(
+                {"WARNING"},
+                "BZMapIO: Select one or more mesh objects over the terrain.",
+            )
+            return {"CANCELLED"}
+        triangles = np.concatenate(triangles)
+
+        try:
+            _apply_open_terrain_zones(terrain)
+            heightfield = _cached_terrain_heightfield(terrain)
+        except ValueError as exc:
+            self.report({"ERROR"}, f"BZMapIO: {exc}")
+            return {"CANCELLED"}
+
+        low = triangles.reshape(-1, 3).min(axis=0)
+        high = triangles.reshape(-1, 3).max(axis=0)
+        window = hg2_heightfield.grid_window(
+            heightfield, low[0], low[1], high[0], high[1], pad=1
+        )
+        if window is None:
+            self.report({"WARNING"}, "BZMapIO: Selected objects are outside the map.")
+            return {"CANCELLED"}
+
+        surface = hg2_heightfield.rasterize_lowest_surface(
+            heightfield, triangles, window
+        )
+        footprint = ~np.isnan(surface)
+        heights = heightfield.heights[window]
+        if self.mode == "STAMP":
+            mask = hg2_heightfield.stamp_heights(heights, surface, self.stamp_mode)
+        elif self.mode == "FLATTEN":
+            target = float(heights[footprint].mean()) if footprint.any() else 0.0
+            mask = hg2_heightfield.flatten_heights(
+                heights, footprint, target, self.strength
+            )
+        elif self.mode == "SMOOTH":
+            mask = hg2_heightfield.smooth_heights(
+                heightfield.heights,
+                window,
+                footprint,
+                self.iterations,
+                self.strength,
+            )
+        else:
+            mask = hg2_heightfield.noise_heights(
+                heightfield,
+                window,
+                footprint,
+                self.amplitude * self.strength,
+                self.noise_scale,
+                self.seed,
+            )
+
+        count = _write_terrain_heights(terrain, heightfield, window, mask)
+        _sync_open_terrain_zones(heightfield)
+        self.report({"INFO"}, f"BZMapIO: Updated {count} terrain vertices.")
+        return {"FINISHED"}
+
+
+class BZMAPIO_OT_terrain_preview(Operator):
+    bl_idname = "bzmapio.terrain_preview"
+    bl_label = "Terrain Preview"
+    bl_description = "Swap the terrain for a block-averaged low resolution preview, opening full resolution only for the zones being sculpted"
+    bl_options = {"REGISTER", "UNDO"}
+
+    action: Any = EnumProperty(
+        name="Action",
+        items=(
+            (
+                "BUILD",
+                "Build Preview",
+                "Show the whole map as a low resolution preview",
+            ),
+            (
+                "OPEN_ZONES",
+                "Open Selected Zones",
+                "Switch the selected preview zones to full resolution for sculpting",
+            ),
+            ("FULL", "Full Resolution", "Remove the preview and show the full terrain"),
+        ),
+        default="BUILD",
+    )
+
+    factor: Any = EnumProperty(
+        name="Resolution",
+        items=(
+            ("4", "1/4", "Average 4x4 height samples per preview vertex"),
+            ("8", "1/8", "Average 8x8 height samples per preview vertex"),
+        ),
+        default="4",
+    )
+
+    def execute(self, context):
+        terrain = _find_user_terrain()
+        if terrain is None:
+            self.report({"ERROR"}, "BZMapIO: No .hg2 terrain found in the scene.")
+            return {"CANCELLED"}
+        if context.mode != "OBJECT":
+            bpy.ops.object.mode_set(mode="OBJECT")
+
+        if self.action == "FULL":
+            _remove_terrain_preview(terrain)
+            self.report({"INFO"}, "BZMapIO: Showing full resolution terrain.")
+            return {"FINISHED"}
+
+        factor = int(self.factor)
+        open_zones = ()
+        if self.action == "OPEN_ZONES":
+            factor = _terrain_preview_factor() or factor
+            open_zones = {
+                (obj["bz_zone_row"], obj["bz_zone_col"])
+                for obj in context.selected_objects
+                if "bz_zone_row" in obj and "bz_zone_col" in obj
+            }
+            if not open_zones:
+                self.report({"WARNING"}, "BZMapIO: Select one or more preview zones.")
+                return {"CANCELLED"}
+
+        started = time.perf_counter()
+        try:
+            count = _build_terrain_preview(terrain, factor, open_zones)
+        except ValueError as exc:
+            self.report({"ERROR"}, f"BZMapIO: {exc}")
+            return {"CANCELLED"}
+
+        if open_zones:
+            bpy.ops.object.select_all(action="DESELECT")
+            zones = _open_terrain_zones()
+            for obj in zones:
+                obj.select_set(True)
+            context.view_layer.objects.active = zones[0] if zones else None
+        self.report(
+            {"INFO"},
+            f"BZMapIO: Built {count} preview zones at 1/{factor} resolution in {time.perf_counter() - started:.2f}s.",
+        )
+        return {"FINISHED"}
+
+
 # The SIZE UP and SIZE DOWN buttons increase the map's size by increments of 1280
 # Minimum size is 1280, maximum size is 5120.
 class bzbutton_mapsizeup(bpy.types.Operator):
@@ -2616,6 +3315,9 @@ class bzbutton_mapsizeup(bpy.types.Operator):
 
     def execute(self, context):
 
+        # Resizing rebuilds the terrain, so any preview zones are discarded.
+        _remove_terrain_preview()
+
         # Get user's current working map using string match of "HG2"
         for ob in bpy.data.objects:
             if ".hg2_" in ob.name.lower():
@@ -2939,6 +3641,9 @@ class bzbutton_mapsizedn(bpy.types.Operator):
 
     def execute(self, context):
 
+        # Resizing rebuilds the terrain, so any preview zones are discarded.
+        _remove_terrain_preview()
+
         # Make sure user is in layout workspace and in object mode.
         bpy.context.window.workspace = bpy.data.workspaces["Layout"]
 
@@ -3689,6 +4394,7 @@ class bzbutton_loadtextures(bpy.types.Operator):
                         ["VE44SA0.MAP", "0.00", "0.75", "0.25", "0.25"],
                     ]
 
+                AtlasTable = None
                 CustomAtlas = _scene_custom_world_definition(context.scene)
                 if CustomAtlas is not None:
                     active_material = (CSVFile or "").strip().lower()
@@ -3696,6 +4402,7 @@ class bzbutton_loadtextures(bpy.types.Operator):
                     if active_material == custom_material or CSVData is None:
                         CSVMaterial = CustomAtlas["material_name"]
                         CSVData = CustomAtlas["csv_data"]
+                        AtlasTable = CustomAtlas["atlas"]
                         _ensure_custom_world_material(
                             CSVMaterial, CustomAtlas["texture_path"]
                         )
@@ -3706,6 +4413,8 @@ class bzbutton_loadtextures(bpy.types.Operator):
                         "BZMapIO: Unknown terrain atlas. Import a custom world or use a stock world atlas.",
                     )
                     return {"CANCELLED"}
+                if AtlasTable is None:
+                    AtlasTable = _build_atlas_table(CSVData)
 
                 # STEP 3) Move every polygon's UV on TextureTiles to match user's map.
 
@@ -3795,27 +4504,11 @@ class bzbutton_loadtextures(bpy.types.Operator):
                     TileSelectAlt = (
                         TileBase + TileTransition + TileType + VariantTable[0]
                     )
-                    FoundTile = 0
-
-                    for k in range(0, len(CSVData)):
-                        if CSVData[k][0][2:6].lower() == TileSelect.lower():
-                            TileSelect = CSVData[k]
-                            FoundTile = 1
-                            break
-
-                    # For whatever reason, it is possible to have tiles tagged as variants without actually being variants.
-                    # Try match without variant.
-                    if FoundTile == 0:
-                        for k in range(0, len(CSVData)):
-                            if CSVData[k][0][2:6].lower() == TileSelectAlt.lower():
-                                TileSelect = CSVData[k]
-                                FoundTile = 1
-                                break
-
-                    # If all else fails, we apply the default first tile in place and give up.
-                    if FoundTile == 0:
-                        TileSelect = CSVData[0]
-                        FoundTile = 1
+                    # For whatever reason, it is possible to have tiles tagged as variants without actually being variants,
+                    # so the lookup falls back to the tile without variant, then to the first tile in the atlas.
+                    TileIndex = _atlas_tile_index(AtlasTable, TileSelect, TileSelectAlt)
+                    TileRect = AtlasTable["rects"][TileIndex]
+                    FoundTile = 1
 
                     # Position and Rotate the tile to correspond with texture tileset.
                     # Sorry about the mess, it was easier to just program each possible mirror/rotation into the mix
@@ -3823,7 +4516,7 @@ class bzbutton_loadtextures(bpy.types.Operator):
                     if FoundTile == 1:
                         bpy.ops.uv.snap_cursor(target="ORIGIN")
                         bpy.ops.transform.resize(
-                            value=(float(TileSelect[3]), float(TileSelect[4]), 1),
+                            value=(float(TileRect[2]), float(TileRect[3]), 1),
                             orient_type="GLOBAL",
                             orient_matrix=((1, 0, 0), (0, 1, 0), (0, 0, 1)),
                             orient_matrix_type="GLOBAL",
@@ -3845,8 +4538,8 @@ class bzbutton_loadtextures(bpy.types.Operator):
                         )
                         bpy.ops.transform.translate(
                             value=(
-                                float(TileSelect[1]),
-                                1 - float(TileSelect[2]) - float(TileSelect[3]),
+                                float(TileRect[0]),
+                                1 - float(TileRect[1]) - float(TileRect[2]),
                                 0,
                             )
                         )
@@ -5899,6 +6592,12 @@ class BZMapIO_Toggles(PropertyGroup):
         default=True,
     )
 
+    LiveShrinkwrap: Any = BoolProperty(
+        name="Live Shrinkwrap on Import",
+        description=" Keep Shrinkwrap constraints on imported objects and path points. When off, they are conformed to the terrain once in bulk, which keeps large maps responsive.",
+        default=False,
+    )
+
     RespawnTime: Any = StringProperty(
         name="", description=" How many seconds before respawn?", default="20"
     )
@@ -5983,6 +6682,139 @@ class BZMAPIO_OT_import_custom_world(Operator):
         return {"FINISHED"}
 
 
+class BZMAPIO_OT_generate_map(Operator, ExportHelper):
+    bl_idname = "bzmapio.generate_map"
+    bl_label = "Generate New Map (.hg2)"
+    bl_description = (
+        "Create a new .hg2 heightfield and matching .trn from layered noise and erosion"
+    )
+
+    filename_ext = ".hg2"
+
+    filter_glob: Any = StringProperty(default="*.hg2", options={"HIDDEN"}, maxlen=255)
+
+    map_width: Any = IntProperty(
+        name="Width (zones)",
+        description="Map width in 1280m zones",
+        default=2,
+        min=1,
+        max=4,
+    )
+    map_depth: Any = IntProperty(
+        name="Depth (zones)",
+        description="Map depth in 1280m zones",
+        default=2,
+        min=1,
+        max=4,
+    )
+    seed: Any = IntProperty(name="Seed", default=0)
+    noise_type: Any = EnumProperty(
+        name="Noise",
+        items=(
+            ("PERLIN", "Perlin", "Gradient noise with rounded hills"),
+            ("VALUE", "Value", "Lattice value noise with blockier features"),
+        ),
+        default="PERLIN",
+    )
+    scale: Any = FloatProperty(
+        name="Feature Size",
+        description="Size of the largest terrain features",
+        default=900.0,
+        min=10.0,
+        soft_max=5120.0,
+        unit="LENGTH",
+    )
+    octaves: Any = IntProperty(name="Octaves", default=6, min=1, max=12)
+    persistence: Any = FloatProperty(
+        name="Roughness",
+        description="Amplitude kept from one octave to the next",
+        default=0.5,
+        min=0.0,
+        max=1.0,
+    )
+    min_height: Any = FloatProperty(
+        name="Min Height",
+        default=20.0,
+        min=0.0,
+        max=409.5,
+        unit="LENGTH",
+    )
+    max_height: Any = FloatProperty(
+        name="Max Height",
+        default=180.0,
+        min=0.0,
+        max=409.5,
+        unit="LENGTH",
+    )
+    erosion_iterations: Any = IntProperty(
+        name="Erosion Passes", default=20, min=0, max=500
+    )
+    talus: Any = FloatProperty(
+        name="Talus",
+        description="Height difference between neighbouring samples above which material slumps",
+        default=4.0,
+        min=0.0,
+        unit="LENGTH",
+    )
+    material_name: Any = StringProperty(
+        name="Material Name",
+        description="Terrain atlas MaterialName written to the .trn",
+        default="",
+    )
+    template_trn: Any = StringProperty(
+        name="Template TRN",
+        description="Optional existing .trn to copy; only its size entries are rewritten",
+        default="",
+        subtype="FILE_PATH",
+    )
+    import_after: Any = BoolProperty(
+        name="Import After Generating",
+        description="Load the new map into the open BZMapIO template scene",
+        default=True,
+    )
+
+    def execute(self, context):
+        started = time.perf_counter()
+        try:
+            hg2_heightfield.generate_hg2(
+                self.filepath,
+                self.map_width,
+                self.map_depth,
+                material_name=self.material_name.strip(),
+                template_trn=(
+                    bpy.path.abspath(self.template_trn) if self.template_trn else ""
+                ),
+                seed=self.seed,
+                noise_type=self.noise_type,
+                scale=self.scale,
+                octaves=self.octaves,
+                persistence=self.persistence,
+                min_height=min(self.min_height, self.max_height),
+                max_height=max(self.min_height, self.max_height),
+                erosion_iterations=self.erosion_iterations,
+                talus=self.talus,
+            )
+        except (OSError, ValueError) as exc:
+            self.report({"ERROR"}, f"BZMapIO: {exc}")
+            return {"CANCELLED"}
+
+        self.report(
+            {"INFO"},
+            f"BZMapIO: Generated {os.path.basename(self.filepath)} "
+            f"({1280 * self.map_width}x{1280 * self.map_depth}) "
+            f"in {time.perf_counter() - started:.2f}s",
+        )
+        if self.import_after:
+            if bpy.data.objects.get("BZMapGenerator") is None:
+                self.report(
+                    {"WARNING"},
+                    "BZMapIO: Open the map template to import the generated map.",
+                )
+            else:
+                bpy.ops.bzmapimport.data(filepath=self.filepath)
+        return {"FINISHED"}
+
+
 ######################################################################################################
 ######################################################################################################
 #####  USER INTERFACE ################################################################################
@@ -6035,6 +6867,22 @@ class BZMAPIO_PT_map_import(Panel):
         row.prop(scene.BZMapIO_Toggles, "ImportBZN")
         row.prop(scene.BZMapIO_Toggles, "ExportBZN")
         file_box.operator("button.bzmapexport", icon="OUTPUT")
+        file_box.operator("bzmapio.generate_map", icon="RNDCURVE")
+
+        preview_box = layout.box()
+        preview_box.label(text="Terrain Preview")
+        row = preview_box.row()
+        op = row.operator("bzmapio.terrain_preview", text="1/4 Preview")
+        op.action = "BUILD"
+        op.factor = "4"
+        op = row.operator("bzmapio.terrain_preview", text="1/8 Preview")
+        op.action = "BUILD"
+        op.factor = "8"
+        row = preview_box.row()
+        row.operator("bzmapio.terrain_preview", text="Open Selected Zones").action = (
+            "OPEN_ZONES"
+        )
+        row.operator("bzmapio.terrain_preview", text="Full Resolution").action = "FULL"
 
         size_box = layout.box()
         size_box.label(text="Terrain Size")
@@ -6076,6 +6924,26 @@ class BZMAPIO_PT_map_object_tools(Panel):
         row.operator("button.bzshrinkwrapbake", icon="MOD_SHRINKWRAP")
         selection_box.operator("button.bztransform", icon="FACESEL")
 
+        conform_box = layout.box()
+        conform_box.label(text="Terrain Conform")
+        row = conform_box.row()
+        op = row.operator(
+            "bzmapio.conform_objects", text="Conform Selected", icon="SNAP_FACE"
+        )
+        op.scope = "SELECTED"
+        op = row.operator("bzmapio.conform_objects", text="Conform All")
+        op.scope = "ALL"
+        conform_box.prop(scene.BZMapIO_Toggles, "LiveShrinkwrap")
+
+        sculpt_box = layout.box()
+        sculpt_box.label(text="Heightfield Sculpt")
+        row = sculpt_box.row()
+        row.operator("bzmapio.terrain_sculpt", text="Stamp").mode = "STAMP"
+        row.operator("bzmapio.terrain_sculpt", text="Flatten").mode = "FLATTEN"
+        row = sculpt_box.row()
+        row.operator("bzmapio.terrain_sculpt", text="Smooth").mode = "SMOOTH"
+        row.operator("bzmapio.terrain_sculpt", text="Noise").mode = "NOISE"
+
         respawn_box = layout.box()
         respawn_box.label(text="Respawning")
         respawn_box.label(text="Multiplayer only.", icon="INFO")
@@ -6135,6 +7003,9 @@ CLASSES = (
     bzshrinkwrapinvert,
     bzshrinkwrapbake,
     bzpaintshrinkwrap,
+    BZMAPIO_OT_conform_objects,
+    BZMAPIO_OT_terrain_sculpt,
+    BZMAPIO_OT_terrain_preview,
     bzgosculpt,
     bzgopaint,
     bzbutton_setrespawning,
@@ -6147,6 +7018,7 @@ CLASSES = (
     bzbutton_exportmat,
     BZMapIO_Toggles,
     BZMAPIO_OT_import_custom_world,
+    BZMAPIO_OT_generate_map,
     BZMAPIO_OT_open_template,
     BZMAPIO_PT_map_import,
     BZMAPIO_PT_map_object_tools,
@@ -6170,9 +7042,14 @@ def register():
     )
     bpy.types.Scene.BZCustomWorldStatus = StringProperty(name="Custom World Status")
     bpy.types.Scene.BZMapIO_Toggles = PointerProperty(type=BZMapIO_Toggles)
+    if _clear_terrain_heightfield_cache not in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.append(_clear_terrain_heightfield_cache)
 
 
 def unregister():
+    if _clear_terrain_heightfield_cache in bpy.app.handlers.load_post:
+        bpy.app.handlers.load_post.remove(_clear_terrain_heightfield_cache)
+    _terrain_heightfield_cache.clear()
     for attr in (
         "BZMapIO_Toggles",
         "BZMapFile",
@@ -77,12 +77,15 @@ def auto_port_bz98_to_ogre(exported_path: str, options: dict | None = None):
     Common options (all file types):
       name, suffix, flat_colors, bounds_mult, act_path, config_path,
       only_once, nowrite, dest_dir
-      skip_unchanged, profile_export
+      skip_unchanged, profile_export, dds_format, dds_mipmaps
 
     VDF-only extras:
       headlights, person_mode, turret_mode, cockpit_mode, skeletalanims_mode,
       scope_mode, scope_type, scope_nation, scope_screen, scope_gun,
       scope_transform, scope_texture, no_pov_rots, stabilize_walker_cockpit
+
+    VDF/SDF extras:
+      texture_atlas
     """
     options = options or {}
     filepath = Path(exported_path)
@@ -133,6 +136,9 @@ def auto_port_bz98_to_ogre(exported_path: str, options: dict | None = None):
     normal_mode = port_models.NormalMode[normal_mode_str]
 
     nowrite = bool(options.get("nowrite", False))
+    dds_format = (options.get("dds_format") or "RGBA").upper()
+    dds_mipmaps = bool(options.get("dds_mipmaps", False))
+    texture_atlas = bool(options.get("texture_atlas", False))
 
     bounds_mult = options.get("bounds_mult")
     if isinstance(bounds_mult, (list, tuple)) and len(bounds_mult) == 3:
@@ -202,6 +208,9 @@ def auto_port_bz98_to_ogre(exported_path: str, options: dict | None = None):
         boundingbox_scale_factors=boundingbox_scale_factors,
         nowrite=nowrite,
         verbose=False,
+        dds_format=dds_format,
+        mipmaps=dds_mipmaps,
+        atlas=texture_atlas,
     )
 
     print(f"[bz98tools] Ogre auto-port: {filepath.name}")
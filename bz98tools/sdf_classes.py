@@ -40,11 +40,9 @@ class SDFHeader:
         self.Unknown = array[4]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         # Same layout as VDFHeader, but with the SDF-specific "Unknown" field value (8).
-        struct.pack_into(self.binstring, buffer, 0, b"BWD2", 8, b"REV", 12, 8)
-        fileHandle.write(buffer)
+        struct.pack_into(self.binstring, buffer, position, b"BWD2", 8, b"REV", 12, 8)
         return self.binlength + position
 
 
@@ -72,13 +70,12 @@ class SDFCHeader:
         self.explosionsound = safe_decode_ascii(array[11])
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         ddr = int(getattr(self, "ddr", getattr(self, "defensive", 0)))
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             b"SDFC",
             self.binlength,
             bytes(self.name, "ascii", errors="ignore"),
@@ -92,7 +89,6 @@ class SDFCHeader:
             bytes(self.explosioneffect, "ascii", errors="ignore"),
             bytes(self.explosionsound, "ascii", errors="ignore"),
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -111,12 +107,10 @@ class SGEOHeader:
         self.geocount = array[2]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         struct.pack_into(
-            self.binstring, buffer, 0, b"SGEO", self.sectionlength, self.geocount
+            self.binstring, buffer, position, b"SGEO", self.sectionlength, self.geocount
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -146,43 +140,33 @@ class GEOData:
         self.time = array[27]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(
-            self.binstring,
-            buffer,
-            0,
-            bytes(self.name, "ascii", errors="ignore"),
-            self.matrix[0],
-            self.matrix[1],
-            self.matrix[2],
-            self.matrix[3],
-            self.matrix[4],
-            self.matrix[5],
-            self.matrix[6],
-            self.matrix[7],
-            self.matrix[8],
-            self.matrix[9],
-            self.matrix[10],
-            self.matrix[11],
-            bytes(self.parent, "ascii", errors="ignore"),
-            self.geocenter[0],
-            self.geocenter[1],
-            self.geocenter[2],
-            self.sphereradius,
-            self.boxhalfheight[0],
-            self.boxhalfheight[1],
-            self.boxhalfheight[2],
-            self.type,
-            self.geoflags,  # packed as int
-            self.ddr,
-            self.x,
-            self.y,
-            self.z,
-            self.time,
-        )
-        fileHandle.write(buffer)
-        return position + self.binlength
+    def ReadRecord(self, record):
+        """Fill from one bwd2_index.SDF_GEO_DTYPE row."""
+        self.name = safe_decode_ascii(record["name"])
+        self.matrix = tuple(record["matrix"].tolist())
+        self.parent = safe_decode_ascii(record["parent"])
+        self.geocenter = tuple(record["center"].tolist())
+        self.sphereradius = float(record["radius"])
+        self.boxhalfheight = tuple(record["half_size"].tolist())
+        self.type = int(record["type"])
+        self.geoflags = int(record["flags"])
+        self.ddr = int(record["ddr"])
+        self.x, self.y, self.z = record["target"].tolist()
+        self.time = float(record["time"])
+
+    def WriteRecord(self, record):
+        """Store into one bwd2_index.SDF_GEO_DTYPE row."""
+        record["name"] = bytes(self.name, "ascii", errors="ignore")
+        record["matrix"] = self.matrix
+        record["parent"] = bytes(self.parent, "ascii", errors="ignore")
+        record["center"] = self.geocenter
+        record["radius"] = self.sphereradius
+        record["half_size"] = self.boxhalfheight
+        record["type"] = self.type
+        record["flags"] = self.geoflags
+        record["ddr"] = self.ddr
+        record["target"] = (self.x, self.y, self.z)
+        record["time"] = self.time
 
 
 class ANIMHeader:
@@ -227,8 +211,7 @@ class ANIMHeader:
         self._reserved = list(array[10:15])
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         r = (
             list(self._reserved)
             if isinstance(self._reserved, (list, tuple))
@@ -239,7 +222,7 @@ class ANIMHeader:
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             b"ANIM",
             int(self.sectionlength),
             bytes(self.name or ".", "ascii", errors="ignore"),
@@ -259,7 +242,6 @@ class ANIMHeader:
             int(r[3]),
             int(r[4]),
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -280,8 +262,7 @@ class ANIMElement:
         self.speed = array[36]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         mask = (
             list(self.unknowngeoflag)
             if isinstance(self.unknowngeoflag, (list, tuple))
@@ -293,7 +274,7 @@ class ANIMElement:
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             self.index,
             *mask,
             self.start,
@@ -301,7 +282,6 @@ class ANIMElement:
             self.loop,
             self.speed
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -326,12 +306,11 @@ class ANIMOrientation:
         self.positioncount = array[31]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             bytes(self.name, "ascii", errors="ignore"),
             0,
             self.matrix1[0],
@@ -365,7 +344,6 @@ class ANIMOrientation:
             self.positionindex,
             self.positioncount,
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -382,12 +360,6 @@ class ANIMRotation:
         self.translate = array[1:5]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, int(self.frame), *self.translate)
-        fileHandle.write(buffer)
-        return position + self.binlength
-
 
 class ANIMTranslation2:
     # Historical toolkit name for the legacy ANIM SCLKEY slot.
@@ -404,12 +376,6 @@ class ANIMTranslation2:
         self.translate = array[1:4]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, int(self.frame), *self.translate)
-        fileHandle.write(buffer)
-        return position + self.binlength
-
 
 class ANIMPosition:
     def __init__(self):
@@ -424,14 +390,7 @@ class ANIMPosition:
         self.translate = array[1:4]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, int(self.frame), *self.translate)
-        fileHandle.write(buffer)
-        return position + self.binlength
-
 
-# Represents the collision information on a structure in its own section.
 class COLPSection:
     def __init__(self):
         self.binstring = "=4sI12f"
@@ -446,12 +405,11 @@ class COLPSection:
         self.data = array[2:14]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             b"COLP",
             56,
             self.data[0],
@@ -467,7 +425,6 @@ class COLPSection:
             self.data[10],
             self.data[11],
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -489,15 +446,20 @@ class SCPSSection:
         self.data = array[2:5]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         d = list(self.data) if isinstance(self.data, (list, tuple)) else [0, 0, 0]
         while len(d) < 3:
             d.append(0)
         struct.pack_into(
-            self.binstring, buffer, 0, b"SCPS", 20, int(d[0]), int(d[1]), int(d[2])
+            self.binstring,
+            buffer,
+            position,
+            b"SCPS",
+            20,
+            int(d[0]),
+            int(d[1]),
+            int(d[2]),
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -517,10 +479,8 @@ class EXITSection:
         self.length = array[1]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, b"EXIT", 8)
-        fileHandle.write(buffer)
+    def Pack(self, buffer, position):
+        struct.pack_into(self.binstring, buffer, position, b"EXIT", 8)
         return position + self.binlength
 
 
@@ -540,6 +500,4 @@ class BlenderObject:
         self.object = object
         self.geo = geodata
         self.parent = geodata.parent
-        self.posanim = {}
-        self.rotanim = {}
-        self.scaleanim = {}
+        self.animkeys = None  # anim_keys.AnimKeys, filled in by the exporter
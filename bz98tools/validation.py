@@ -1,6 +1,10 @@
 from typing import Any
 import os
 
+import numpy as np
+
+from . import geo_arrays
+
 INNER_COLLISION_NAMES = {
     "inner_col",
     "innercol",
@@ -29,6 +33,9 @@ SEVERITY_ORDER = {
     "INFO": 2,
 }
 
+# Largest distance (GEO units) a face corner may sit off the face's plane.
+NONPLANAR_FACE_TOLERANCE = 0.01
+
 LEGACY_ORIENTATION_MESSAGE = (
     "Legacy VDF/SDF/GEO vehicle export expects the nose/front toward Blender +Y. "
     "Direct Redux .mesh export expects Blender -Y; Legacy + Redux auto-port converts the legacy setup."
@@ -762,6 +769,67 @@ def _collect_face_topology_issues(obj, export_modes):
             )
         )
 
+    issues.extend(_collect_face_plane_issues(obj, mesh, export_modes))
+    return issues
+
+
+def _face_sample(indices):
+    sample = ", ".join(str(index) for index in indices[:5])
+    if len(indices) > 5:
+        sample += ", ..."
+    return sample
+
+
+def _collect_face_plane_issues(obj, mesh, export_modes):
+    issues = []
+    if not hasattr(getattr(mesh, "polygons", None), "foreach_get"):
+        return issues
+
+    positions, loop_vertices, loop_totals = geo_arrays.mesh_loop_arrays(mesh)
+    planes, areas = geo_arrays.face_planes(
+        positions, loop_vertices, loop_totals, return_areas=True
+    )
+    polygons = loop_totals >= 3
+
+    degenerate = np.flatnonzero(polygons & (areas <= 1e-12)).tolist()
+    if degenerate:
+        issues.append(
+            _make_issue(
+                "WARNING",
+                "Geometry",
+                obj.name,
+                (
+                    f"{len(degenerate)} face(s) have zero area ({_face_sample(degenerate)}). "
+                    "They have no usable GEO face plane; dissolve or merge them before export."
+                ),
+                export_modes,
+                object_name=obj.name,
+                action="select_object",
+            )
+        )
+
+    deviation = geo_arrays.plane_deviation(
+        planes, positions, loop_vertices, loop_totals
+    )
+    nonplanar = np.flatnonzero(
+        polygons & (areas > 1e-12) & (deviation > NONPLANAR_FACE_TOLERANCE)
+    ).tolist()
+    if nonplanar:
+        issues.append(
+            _make_issue(
+                "INFO",
+                "Geometry",
+                obj.name,
+                (
+                    f"{len(nonplanar)} face(s) are not planar ({_face_sample(nonplanar)}); "
+                    f"corners sit up to {deviation[nonplanar].max():.3f} off the face plane. "
+                    "Legacy GEO faces store one plane each; triangulate them if they render or collide oddly."
+                ),
+                export_modes,
+                object_name=obj.name,
+                action="select_object",
+            )
+        )
     return issues
 
 
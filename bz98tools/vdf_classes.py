@@ -40,10 +40,8 @@ class VDFHeader:
         self.Unknown = array[4]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, b"BWD2", 8, b"REV", 12, 7)
-        fileHandle.write(buffer)
+    def Pack(self, buffer, position):
+        struct.pack_into(self.binstring, buffer, position, b"BWD2", 8, b"REV", 12, 7)
         return self.binlength + position
 
 
@@ -72,12 +70,11 @@ class VDFCHeader:
         self.null = array[13]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             b"VDFC",
             self.binlength,
             bytes(self.name, "ascii"),
@@ -93,7 +90,6 @@ class VDFCHeader:
             self.drag,
             0,
         )
-        fileHandle.write(buffer)
         return self.binlength + position
 
 
@@ -111,12 +107,10 @@ class VGEOHeader:
         self.geocount = array[2]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         struct.pack_into(
-            self.binstring, buffer, 0, b"VGEO", self.sectionlength, self.geocount
+            self.binstring, buffer, position, b"VGEO", self.sectionlength, self.geocount
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -140,23 +134,27 @@ class GEOData:
         self.geoflags = array[22]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(
-            self.binstring,
-            buffer,
-            0,
-            bytes(self.name, "ascii", errors="ignore"),
-            *self.matrix,
-            bytes(self.parent, "ascii", errors="ignore"),
-            *self.geocenter,
-            self.sphereradius,
-            *self.boxhalfheight,
-            self.type,
-            self.geoflags
-        )
-        fileHandle.write(buffer)
-        return position + self.binlength
+    def ReadRecord(self, record):
+        """Fill from one bwd2_index.VDF_GEO_DTYPE row."""
+        self.name = safe_decode_ascii(record["name"])
+        self.matrix = tuple(record["matrix"].tolist())
+        self.parent = safe_decode_ascii(record["parent"])
+        self.geocenter = tuple(record["center"].tolist())
+        self.sphereradius = float(record["radius"])
+        self.boxhalfheight = tuple(record["half_size"].tolist())
+        self.type = int(record["type"])
+        self.geoflags = int(record["flags"])
+
+    def WriteRecord(self, record):
+        """Store into one bwd2_index.VDF_GEO_DTYPE row."""
+        record["name"] = bytes(self.name, "ascii", errors="ignore")
+        record["matrix"] = self.matrix
+        record["parent"] = bytes(self.parent, "ascii", errors="ignore")
+        record["center"] = self.geocenter
+        record["radius"] = self.sphereradius
+        record["half_size"] = self.boxhalfheight
+        record["type"] = self.type
+        record["flags"] = self.geoflags
 
 
 class ANIMHeader:
@@ -192,8 +190,7 @@ class ANIMHeader:
         self._reserved = [array[10], array[11], array[12], array[13], array[14]]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         r = (
             list(self._reserved)
             if isinstance(self._reserved, (list, tuple))
@@ -204,7 +201,7 @@ class ANIMHeader:
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             b"ANIM",
             self.sectionlength,
             bytes((self.name or "."), "ascii", errors="ignore"),
@@ -221,7 +218,6 @@ class ANIMHeader:
             int(r[3]),
             int(r[4]),
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -242,8 +238,7 @@ class ANIMElement:
         self.speed = array[36]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         mask = (
             list(self.unknowngeoflag)
             if isinstance(self.unknowngeoflag, (list, tuple))
@@ -255,7 +250,7 @@ class ANIMElement:
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             self.index,
             *mask,
             self.start,
@@ -263,7 +258,6 @@ class ANIMElement:
             self.loop,
             self.speed
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -288,12 +282,11 @@ class ANIMOrientation:
         self.positioncount = array[31]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             bytes(self.name, "ascii", errors="ignore"),
             0,
             *self.matrix1,
@@ -305,7 +298,6 @@ class ANIMOrientation:
             self.positionindex,
             self.positioncount
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -322,12 +314,6 @@ class ANIMRotation:
         self.translate = array[1:5]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, int(self.frame), *self.translate)
-        fileHandle.write(buffer)
-        return position + self.binlength
-
 
 class ANIMTranslation2:
     # Historical toolkit name for the legacy ANIM SCLKEY slot.
@@ -344,12 +330,6 @@ class ANIMTranslation2:
         self.translate = array[1:4]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, int(self.frame), *self.translate)
-        fileHandle.write(buffer)
-        return position + self.binlength
-
 
 class ANIMPosition:
     def __init__(self):
@@ -364,12 +344,6 @@ class ANIMPosition:
         self.translate = array[1:4]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, int(self.frame), *self.translate)
-        fileHandle.write(buffer)
-        return position + self.binlength
-
 
 class COLPSection:
     def __init__(self):
@@ -402,12 +376,12 @@ class COLPSection:
         self.data = array[2:14]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         import struct
 
-        struct.pack_into(self.binstring, buffer, 0, b"COLP", self.binlength, *self.data)
-        fileHandle.write(buffer)
+        struct.pack_into(
+            self.binstring, buffer, position, b"COLP", self.binlength, *self.data
+        )
         return position + self.binlength
 
 
@@ -428,22 +402,20 @@ class SCPSSection:
         self.data = array[2:5]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
+    def Pack(self, buffer, position):
         d = list(self.data) if isinstance(self.data, (list, tuple)) else [0, 0, 0]
         while len(d) < 3:
             d.append(0)
         struct.pack_into(
             self.binstring,
             buffer,
-            0,
+            position,
             b"SPCS",
             self.binlength,
             int(d[0]),
             int(d[1]),
             int(d[2]),
         )
-        fileHandle.write(buffer)
         return position + self.binlength
 
 
@@ -460,10 +432,8 @@ class EXITSection:
         self.length = array[1]
         return position + self.binlength
 
-    def Write(self, fileHandle, position):
-        buffer = bytearray(self.binlength)
-        struct.pack_into(self.binstring, buffer, 0, b"EXIT", 8)
-        fileHandle.write(buffer)
+    def Pack(self, buffer, position):
+        struct.pack_into(self.binstring, buffer, position, b"EXIT", 8)
         return position + self.binlength
 
 
@@ -480,6 +450,4 @@ class BlenderObject:
         self.object = object
         self.geo = geodata
         self.parent = geodata.parent
-        self.posanim = {}
-        self.rotanim = {}
-        self.scaleanim = {}
+        self.animkeys = None  # anim_keys.AnimKeys, filled in by the exporter
@@ -0,0 +1,137 @@
+"""
+Measure .map pixel decoding throughput for every BZMapFormat, and DDS
+encode time and size for each DDS format.
+
+Typical usage from Blender:
+
+    blender --background --python scripts/benchmark_bzmap_codec.py -- \
+        --width 1024 --height 1024 --repeat 5
+
+Prints megapixels per second for RGBA8 output (porter / DDS path) and
+float32 output (Blender Image.pixels path), then the size and encode time
+of uncompressed, BC1 and BC3 DDS files relative to the uncompressed path.
+When run inside Blender it also times filling a bpy image for every .map
+format, with a Python float list versus Image.pixels.foreach_set.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import importlib.util
+import sys
+import time
+from pathlib import Path
+from typing import Sequence
+
+
+def _parse_args(argv: Sequence[str]) -> argparse.Namespace:
+    if "--" in argv:
+        argv = argv[list(argv).index("--") + 1 :]
+    else:
+        argv = list(argv[1:])
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--width", type=int, default=1024)
+    parser.add_argument("--height", type=int, default=1024)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument(
+        "--image-size",
+        type=int,
+        default=512,
+        help="Square size for the Blender image benchmark",
+    )
+    parser.add_argument(
+        "--repo-root",
+        default=str(Path(__file__).resolve().parents[1]),
+        help="Toolkit repository root (folder that contains bz98tools)",
+    )
+    return parser.parse_args(argv)
+
+
+def _best_time(fn, repeat):
+    best = None
+    for _ in range(max(1, repeat)):
+        start = time.perf_counter()
+        fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def _benchmark_images(bzmap_codec, size, repeat):
+    """Time filling a Blender image from each .map format two ways."""
+    import bpy
+    import numpy as np
+
+    bzmap = importlib.import_module("bz98tools.bzmap")
+    rng = np.random.default_rng(0)
+    palette = rng.integers(0, 256, size=(256, 3), dtype=np.uint8)
+    img = bpy.data.images.new("bz_benchmark", width=size, height=size, alpha=True)
+
+    print()
+    print(f"Blender image fill {size}x{size}, best of {repeat}:")
+    print(f"{'format':<10} {'list ms':>10} {'foreach ms':>11} {'speedup':>8}")
+    try:
+        for pixel_format, name in bzmap_codec.FORMAT_NAMES.items():
+            row_bytes = size * bzmap.BZMapFormat.bpp[pixel_format]
+            buffer = rng.integers(0, 256, size=row_bytes * size, dtype=np.uint8)
+            buffer = buffer.tobytes()
+
+            def fill_list():
+                rgba = bzmap_codec.decode_pixels(
+                    buffer, pixel_format, size, size, row_bytes, palette, True
+                )
+                img.pixels[:] = rgba[::-1].ravel().tolist()
+
+            def fill_foreach():
+                rgba = bzmap_codec.decode_pixels(
+                    buffer, pixel_format, size, size, row_bytes, palette, True
+                )
+                img.pixels.foreach_set(bzmap_codec.blender_pixels(rgba))
+
+            list_time = _best_time(fill_list, repeat)
+            foreach_time = _best_time(fill_foreach, repeat)
+            print(
+                f"{name:<10} {list_time * 1000:>10.1f} {foreach_time * 1000:>11.1f} "
+                f"{list_time / max(foreach_time, 1e-9):>7.1f}x"
+            )
+    finally:
+        bpy.data.images.remove(img)
+
+
+def main(argv: Sequence[str]) -> int:
+    args = _parse_args(argv)
+    repo_root = str(Path(args.repo_root).expanduser().resolve())
+    if repo_root not in sys.path:
+        sys.path.insert(0, repo_root)
+
+    bzmap_codec = importlib.import_module("bz98tools.bzmap_codec")
+    results = bzmap_codec.benchmark_decoders(args.width, args.height, args.repeat)
+
+    print(f"Decoding {args.width}x{args.height}, best of {args.repeat}:")
+    print(f"{'format':<10} {'RGBA8 Mpx/s':>12} {'float Mpx/s':>12}")
+    for name, timings in results.items():
+        print(f"{name:<10} {timings['rgba8']:>12.1f} {timings['float']:>12.1f}")
+
+    dds_codec = importlib.import_module("bz98tools.dds_codec")
+    results = dds_codec.benchmark_dds(args.width, args.height, args.repeat)
+    baseline = results[("RGBA", False)]["bytes"]
+
+    print()
+    print(f"DDS encode {args.width}x{args.height}, best of {args.repeat}:")
+    print(f"{'format':<10} {'mips':<5} {'KiB':>10} {'size':>7} {'ms':>9}")
+    for (dds_format, mipmaps), entry in results.items():
+        print(
+            f"{dds_format:<10} {'yes' if mipmaps else 'no':<5} "
+            f"{entry['bytes'] / 1024:>10.0f} {entry['bytes'] / baseline:>6.0%} "
+            f"{entry['seconds'] * 1000:>9.1f}"
+        )
+
+    if importlib.util.find_spec("bpy") is not None:
+        _benchmark_images(bzmap_codec, args.image_size, args.repeat)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,71 @@
+"""
+Compare the per-record struct GEO parser with the NumPy reader.
+
+Typical usage with any Python that has NumPy:
+
+    python scripts/benchmark_geo_reader.py "C:\\BZ98R\\stock" --largest 10
+
+Folders are searched recursively for `.geo` files and the largest ones are
+timed; with no inputs a synthetic 20k-face GEO is used. Prints faces,
+polygon vertices, best struct and NumPy parse times, and the speedup.
+"""
+
+from __future__ import annotations
+
+import argparse
+import importlib
+import sys
+from pathlib import Path
+
+from convert_maps import REPO_ROOT, _bootstrap_toolkit
+
+_bootstrap_toolkit(REPO_ROOT)
+
+
+def _collect_geos(inputs):
+    paths = []
+    for item in inputs:
+        path = Path(item).expanduser()
+        if path.is_dir():
+            paths.extend(p for p in path.rglob("*") if p.suffix.lower() == ".geo")
+        elif path.is_file():
+            paths.append(path)
+        else:
+            print(f"Skipping missing input {path}")
+    return paths
+
+
+def main(argv) -> int:
+    if "--" in argv:
+        argv = argv[list(argv).index("--") + 1 :]
+    else:
+        argv = list(argv[1:])
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("inputs", nargs="*", help=".geo files or folders")
+    parser.add_argument("--largest", type=int, default=10)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args(argv)
+
+    geo_arrays = importlib.import_module("bz98tools.geo_arrays")
+
+    paths = sorted(_collect_geos(args.inputs), key=lambda p: p.stat().st_size)
+    sources = [(p.name, p.read_bytes()) for p in paths[-max(1, args.largest) :]]
+    results = geo_arrays.benchmark_parse(sources, args.repeat)
+
+    print(f"GEO parse, best of {args.repeat}:")
+    print(
+        f"{'file':<16} {'faces':>7} {'nodes':>8} {'struct ms':>10} "
+        f"{'numpy ms':>9} {'speedup':>8}"
+    )
+    for label, entry in results.items():
+        print(
+            f"{label:<16} {entry['faces']:>7} {entry['nodes']:>8} "
+            f"{entry['struct'] * 1000:>10.2f} {entry['numpy'] * 1000:>9.2f} "
+            f"{entry['struct'] / max(entry['numpy'], 1e-9):>7.1f}x"
+        )
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
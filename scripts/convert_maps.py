@@ -0,0 +1,58 @@
+"""
+Pre-convert Battlezone `.map` textures to PNG (or DDS) in bulk.
+
+Typical usage with any Python that has NumPy:
+
+    python scripts/convert_maps.py "C:\\BZ98R\\stock" --workers 8
+    python scripts/convert_maps.py "C:\\BZ98R\\bzone.zfs" --skip hash
+
+Folder inputs are converted next to each `.map` (or mirrored under
+`--out-dir`); ZFS archives are extracted into the GEO importer's texture
+cache first, so later imports pick up the PNGs instead of decoding again.
+"""
+
+from __future__ import annotations
+
+import importlib
+import importlib.machinery
+import importlib.util
+import sys
+from pathlib import Path
+
+REPO_ROOT = Path(__file__).resolve().parents[1]
+
+
+def _bootstrap_toolkit(repo_root: Path):
+    """
+    Import bz98tools without its Blender add-on registration when bpy is
+    not available. Runs at import time so process-pool workers, which
+    re-import this script, see the same package layout.
+    """
+    repo_root_text = str(repo_root)
+    if repo_root_text not in sys.path:
+        sys.path.insert(0, repo_root_text)
+    if "bz98tools" in sys.modules:
+        return
+    if importlib.util.find_spec("bpy") is not None:
+        return
+
+    spec = importlib.machinery.ModuleSpec("bz98tools", None, is_package=True)
+    package = importlib.util.module_from_spec(spec)
+    package.__path__ = [str(repo_root / "bz98tools")]
+    sys.modules["bz98tools"] = package
+
+
+_bootstrap_toolkit(REPO_ROOT)
+
+
+def main(argv) -> int:
+    if "--" in argv:
+        argv = argv[list(argv).index("--") + 1 :]
+    else:
+        argv = list(argv[1:])
+    map_convert = importlib.import_module("bz98tools.map_convert")
+    return map_convert.main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))
@@ -0,0 +1,35 @@
+"""
+Encode PNG images as Battlezone `.map` textures in bulk.
+
+Typical usage with any Python that has NumPy:
+
+    python scripts/encode_maps.py "C:\\mymod\\textures" --format ARGB4444
+    python scripts/encode_maps.py textures --format INDEXED --act moon.act
+    python scripts/encode_maps.py textures --format INDEXED --new-act mod.act
+
+Each `.map` is written next to its PNG (or mirrored under `--out-dir`).
+INDEXED output maps colours to the nearest entry of an existing ACT, or
+of a shared palette built from all inputs with `--new-act`.
+"""
+
+from __future__ import annotations
+
+import importlib
+import sys
+
+from convert_maps import REPO_ROOT, _bootstrap_toolkit
+
+_bootstrap_toolkit(REPO_ROOT)
+
+
+def main(argv) -> int:
+    if "--" in argv:
+        argv = argv[list(argv).index("--") + 1 :]
+    else:
+        argv = list(argv[1:])
+    map_convert = importlib.import_module("bz98tools.map_convert")
+    return map_convert.encode_main(argv)
+
+
+if __name__ == "__main__":
+    sys.exit(main(sys.argv))